@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Mede o impacto da gravação de vídeo na duração dos passos.
+Executa os mesmos cenários com o gravador desligado (VIDEO_ATIVO=false) e ligado em cada
+FPS pedido, intercalando as configurações a cada rodada, e compara a duração de cada passo
+(result.duration do JSON do Behave, sem os hooks). O canal 'dedicado' captura pelo DevTools
+no Chrome/Edge (fora da fila de comandos do chromedriver) e, nos demais navegadores, por uma
+conexão HTTP própria que ainda divide com os passos a fila de comandos do driver da sessão:
+nesse caso a sobrecarga cresce com o FPS.
+
+Uso:
+    python benchmark_video.py features/portal --repeticoes 3
+    python benchmark_video.py features/portal --fps 5 15 30 --canais dedicado driver
+    python benchmark_video.py --tags @portal -- --no-capture
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from recursos.utils.executor_behave import montar_comando_behave
+from recursos.utils.gerenciador_configuracao import GerenciadorDeConfiguracao
+from recursos.utils.perfilador_fases import calcular_percentil
+
+
+STATUS_MEDIDOS = ('passed',)
+
+
+def montar_configuracoes(lista_fps, canais):
+    """
+    Monta as configurações comparadas: gravador desligado + uma por FPS e canal
+
+    Args:
+        lista_fps: FPS testados com o gravador ligado
+        canais: 'dedicado' (VIDEO_CANAL_DEDICADO=true: DevTools ou HTTP próprio) e/ou 'driver' (false)
+
+    Returns:
+        Lista de dicts {'nome', 'ambiente'}
+    """
+    configuracoes = [{'nome': 'sem_video', 'ambiente': {'VIDEO_ATIVO': 'false'}}]
+    for fps in lista_fps:
+        for canal in canais:
+            configuracoes.append({
+                'nome': f'video_{fps}fps_{canal}',
+                'ambiente': {
+                    'VIDEO_ATIVO': 'true',
+                    'VIDEO_FPS': str(fps),
+                    'VIDEO_CANAL_DEDICADO': 'true' if canal == 'dedicado' else 'false'
+                }
+            })
+    return configuracoes
+
+
+def executar_behave(configuracao_execucao, arquivo_resultados, arquivo_log, argumentos_behave):
+    """
+    Executa o Behave com as variáveis de ambiente da configuração
+
+    Args:
+        configuracao_execucao: Dict {'nome', 'ambiente'}
+        arquivo_resultados: Path do JSON de resultados
+        arquivo_log: Path da saída do Behave
+        argumentos_behave: Caminhos e argumentos repassados ao Behave
+
+    Returns:
+        Tupla (código de saída, duração em segundos)
+    """
+    ambiente = os.environ.copy()
+    ambiente.update(configuracao_execucao['ambiente'])
+    ambiente['PYTHONIOENCODING'] = 'utf-8'
+
+    # Sem os formatadores do behave.ini: o benchmark não sobrescreve o reports/results.json da última execução
+    comando = montar_comando_behave([
+        '-f', 'json.pretty', '-o', str(arquivo_resultados),
+        '-f', 'plain',
+        *argumentos_behave
+    ])
+
+    inicio = time.monotonic()
+    with open(arquivo_log, 'w', encoding='utf-8') as log:
+        codigo = subprocess.call(comando, env=ambiente, stdout=log, stderr=subprocess.STDOUT)
+    return codigo, time.monotonic() - inicio
+
+
+def carregar_duracoes_passos(arquivo_resultados):
+    """
+    Lê a duração de cada passo aprovado
+
+    Args:
+        arquivo_resultados: Path do JSON gerado pelo Behave
+
+    Returns:
+        Dict (location do cenário, índice do passo) -> duração em segundos
+    """
+    try:
+        with open(arquivo_resultados, 'r', encoding='utf-8') as f:
+            features = json.load(f)
+    except (OSError, ValueError) as erro:
+        print(f"[BENCHMARK] Ignorando {arquivo_resultados}: {erro}")
+        return {}
+
+    duracoes = {}
+    for feature in features:
+        for cenario in feature.get('elements', []):
+            if cenario.get('type') == 'background':
+                continue
+            for indice, passo in enumerate(cenario.get('steps', [])):
+                resultado = passo.get('result', {})
+                if resultado.get('status') in STATUS_MEDIDOS:
+                    duracoes[(cenario.get('location', ''), indice)] = resultado.get('duration', 0.0)
+    return duracoes
+
+
+def resumir(amostras_por_configuracao):
+    """
+    Compara cada configuração com o gravador desligado, apenas nos passos medidos em todas
+
+    Args:
+        amostras_por_configuracao: Dict nome -> lista (uma por repetição) de dicts passo -> duração
+
+    Returns:
+        Dict nome -> {'passos', 'total_passos_segundos', 'p50_passo_ms', 'p95_passo_ms',
+                      'sobrecarga_percentual', 'sobrecarga_p50_passo_ms', 'sobrecarga_p95_passo_ms'}
+    """
+    medianas = {}
+    for nome, repeticoes in amostras_por_configuracao.items():
+        por_passo = {}
+        for duracoes in repeticoes:
+            for passo, duracao in duracoes.items():
+                por_passo.setdefault(passo, []).append(duracao)
+        medianas[nome] = {passo: calcular_percentil(valores, 50) for passo, valores in por_passo.items()}
+
+    passos_comuns = set.intersection(*(set(duracoes) for duracoes in medianas.values())) if medianas else set()
+    referencia = medianas.get('sem_video', {})
+    total_referencia = sum(referencia.get(passo, 0.0) for passo in passos_comuns)
+
+    resumo = {}
+    for nome, duracoes in medianas.items():
+        valores = [duracoes[passo] for passo in passos_comuns]
+        diferencas = [duracoes[passo] - referencia[passo] for passo in passos_comuns if passo in referencia]
+        total = sum(valores)
+        resumo[nome] = {
+            'passos': len(valores),
+            'total_passos_segundos': round(total, 3),
+            'p50_passo_ms': round(calcular_percentil(valores, 50) * 1000, 1),
+            'p95_passo_ms': round(calcular_percentil(valores, 95) * 1000, 1),
+            'sobrecarga_percentual': round((total / total_referencia - 1) * 100, 1) if total_referencia else 0.0,
+            'sobrecarga_p50_passo_ms': round(calcular_percentil(diferencas, 50) * 1000, 1),
+            'sobrecarga_p95_passo_ms': round(calcular_percentil(diferencas, 95) * 1000, 1)
+        }
+    return resumo
+
+
+def main():
+    configuracao = GerenciadorDeConfiguracao()
+
+    parser = argparse.ArgumentParser(description='Compara a duração dos passos com e sem gravação de vídeo')
+    parser.add_argument('caminhos', nargs='*', default=['features'],
+                        help='Arquivos .feature ou diretórios (padrão: features)')
+    parser.add_argument('--repeticoes', type=int, default=3,
+                        help='Rodadas de cada configuração (a mediana de cada passo é comparada)')
+    parser.add_argument('--fps', type=int, nargs='+', default=[configuracao.video_fps],
+                        help='FPS testados com o gravador ligado (padrão: VIDEO_FPS)')
+    parser.add_argument('--canais', nargs='+', choices=['dedicado', 'driver'], default=['dedicado'],
+                        help='Canal dos screenshots: DevTools/conexão própria (dedicado) ou a do driver')
+    parser.add_argument('--tags', default=None, help='Expressão de tags do Behave (ex: @portal)')
+
+    # Tudo após '--' é repassado sem alteração para o Behave
+    argv = sys.argv[1:]
+    argumentos_extras = []
+    if '--' in argv:
+        posicao = argv.index('--')
+        argv, argumentos_extras = argv[:posicao], argv[posicao + 1:]
+    argumentos = parser.parse_args(argv)
+    if argumentos.repeticoes < 1:
+        parser.error('--repeticoes deve ser >= 1')
+
+    argumentos_behave = [*argumentos_extras, *argumentos.caminhos]
+    if argumentos.tags:
+        argumentos_behave = ['--tags', argumentos.tags, *argumentos_behave]
+
+    diretorio_benchmark = configuracao.diretorio_relatorios / 'benchmark_video'
+    diretorio_benchmark.mkdir(parents=True, exist_ok=True)
+    configuracoes = montar_configuracoes(argumentos.fps, argumentos.canais)
+
+    print("\n" + "="*60)
+    print("BENCHMARK DA GRAVAÇÃO DE VÍDEO")
+    print("="*60 + "\n")
+    print(f"[BENCHMARK] {len(configuracoes)} configuração(ões) x {argumentos.repeticoes} rodada(s)")
+
+    amostras = {configuracao_execucao['nome']: [] for configuracao_execucao in configuracoes}
+    execucoes = []
+    # Intercala as configurações a cada rodada para não confundir variação do ambiente com o gravador
+    for rodada in range(1, argumentos.repeticoes + 1):
+        for configuracao_execucao in configuracoes:
+            nome = configuracao_execucao['nome']
+            arquivo_resultados = diretorio_benchmark / f'{nome}_{rodada}.json'
+            arquivo_log = diretorio_benchmark / f'{nome}_{rodada}.log'
+
+            codigo, duracao = executar_behave(configuracao_execucao, arquivo_resultados, arquivo_log, argumentos_behave)
+            amostras[nome].append(carregar_duracoes_passos(arquivo_resultados))
+            execucoes.append({'configuracao': nome, 'rodada': rodada, 'codigo_saida': codigo,
+                              'duracao_segundos': round(duracao, 3)})
+            print(f"[BENCHMARK] Rodada {rodada} | {nome}: {duracao:.1f}s (código {codigo})")
+
+    resumo = resumir(amostras)
+    with open(diretorio_benchmark / 'resumo.json', 'w', encoding='utf-8') as f:
+        json.dump({'configuracoes': configuracoes, 'execucoes': execucoes, 'resumo': resumo},
+                  f, indent=2, ensure_ascii=False)
+
+    print("\n" + "="*60)
+    print("DURAÇÃO DOS PASSOS (mediana das rodadas, passos aprovados em todas)")
+    print("="*60)
+    print(f"{'Configuração':<28}{'Passos':>8}{'Total (s)':>11}{'p50 (ms)':>10}{'p95 (ms)':>10}"
+          f"{'Sobrecarga':>12}{'Δp50 (ms)':>11}{'Δp95 (ms)':>11}")
+    for nome, dados in resumo.items():
+        print(f"{nome:<28}{dados['passos']:>8}{dados['total_passos_segundos']:>11.2f}"
+              f"{dados['p50_passo_ms']:>10.1f}{dados['p95_passo_ms']:>10.1f}"
+              f"{dados['sobrecarga_percentual']:>11.1f}%{dados['sobrecarga_p50_passo_ms']:>11.1f}"
+              f"{dados['sobrecarga_p95_passo_ms']:>11.1f}")
+    print(f"\n[BENCHMARK] Resultados em: {diretorio_benchmark}")
+
+    return 1 if any(execucao['codigo_saida'] for execucao in execucoes) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,13 @@
+import os
+
 from recursos.utils.gerenciador_configuracao import GerenciadorDeConfiguracao
-from recursos.utils.gerenciador_navegador import GerenciadorDeNavegador
+from recursos.utils.gerenciador_navegador import GerenciadorDeNavegador, ResolvedorDeDriver
 from recursos.utils.gerenciador_evidencias import GerenciadorDeEvidencias
 from recursos.utils.gerenciador_relatorio import GerenciadorDeRelatorio
+from recursos.utils.perfilador_fases import PerfiladorDeFases
+from recursos.utils.pool_navegadores import PoolDeNavegadores
+from recursos.utils.pre_aquecedor_navegador import PreAquecedorDeNavegador
+from recursos.utils.servidor_portal_local import ServidorPortalLocal
 
 
 def before_all(context):
@@ -20,104 +26,194 @@ def before_all(context):
     
     context.gerenciador_evidencias = GerenciadorDeEvidencias(context.configuracao)
     context.gerenciador_evidencias.preparar_diretorios()
+    
+    context.perfilador_fases = PerfiladorDeFases()
+    
+    # Na execução paralela o Portal local é servido pelo processo principal (run_parallel.py)
+    context.servidor_portal_local = None
+    if context.configuracao.portal_local_ativo and not os.environ.get('PARALELO_WORKER_ID'):
+        context.servidor_portal_local = ServidorPortalLocal(context.configuracao)
+        context.servidor_portal_local.iniciar()
+    
+    context.pool_navegadores = None
+    if context.configuracao.navegador_pool_ativo:
+        context.pool_navegadores = PoolDeNavegadores(context.configuracao)
+        print("[POOL] Pool de navegadores ativo (NAVEGADOR_POOL_ATIVO=true)")
+    
+    context.cenarios_com_video = {}
+    context.pre_aquecedor_navegador = None
+    if context.configuracao.navegador_pre_aquecimento and not context.pool_navegadores:
+        context.pre_aquecedor_navegador = PreAquecedorDeNavegador(context.configuracao)
+        print("[PRE-AQUECIMENTO] Navegador do próximo cenário será aberto em segundo plano")
 
 
 def before_scenario(context, scenario):
     """
     Executado ANTES de cada cenário individual.
-    Inicializa o navegador, prepara evidências e inicia gravação de vídeo.
+    Inicializa o navegador, prepara evidências e inicia a gravação (vídeo ou eventos do DOM).
     """
     print(f"\n{'-'*60}")
     print(f"CENARIO: {scenario.name}")
     print(f"{'-'*60}\n")
     
-    context.gerenciador_navegador = GerenciadorDeNavegador(context.configuracao)
-    context.driver = context.gerenciador_navegador.inicializar_navegador()
+    perfilador = context.perfilador_fases
+    perfilador.iniciar_cenario()
+    
+    with perfilador.medir('abertura_navegador'):
+        if context.pool_navegadores:
+            context.gerenciador_navegador = context.pool_navegadores.obter_navegador()
+            context.driver = context.gerenciador_navegador.driver
+        elif context.pre_aquecedor_navegador:
+            context.gerenciador_navegador = context.pre_aquecedor_navegador.obter_navegador()
+            context.driver = context.gerenciador_navegador.driver
+            context.pre_aquecedor_navegador.preparar_proximo()
+        else:
+            context.gerenciador_navegador = GerenciadorDeNavegador(context.configuracao)
+            context.driver = context.gerenciador_navegador.inicializar_navegador()
     
     if not hasattr(context, 'informacoes_navegador_coletadas'):
-        informacoes_navegador = context.gerenciador_navegador.obter_informacoes()
-        context.gerenciador_relatorio.registrar_informacoes_navegador(informacoes_navegador)
+        with perfilador.medir('informacoes_navegador'):
+            informacoes_navegador = context.gerenciador_navegador.obter_informacoes()
+            context.gerenciador_relatorio.registrar_informacoes_navegador(informacoes_navegador)
         context.informacoes_navegador_coletadas = True
     
     context.gerenciador_evidencias.iniciar_contagem_passos()
-    context.gerenciador_evidencias.iniciar_gravacao_video(context.driver, scenario.name)
+    # @gravacao_dom / @gravacao_video escolhem a evidência (padrão: GRAVACAO_MODO_PADRAO)
+    context.modo_gravacao = context.gerenciador_evidencias.obter_modo_gravacao(scenario.effective_tags)
+    if context.modo_gravacao == 'dom':
+        with perfilador.medir('inicio_replay_dom'):
+            context.gerenciador_evidencias.iniciar_gravacao_dom(context.driver, scenario.name)
+    else:
+        with perfilador.medir('inicio_video'):
+            context.gerenciador_evidencias.iniciar_gravacao_video(context.driver, scenario.name)
     
     # Rastreia informações do cenário para captura de screenshot no último passo
     context.cenario_atual = scenario
     context.indice_passo_atual = 0
+    
+    perfilador.marcar_inicio_passos()
+
+
+def before_step(context, step):
+    """
+    Executado ANTES de cada passo (step).
+    Marca o início do passo no vídeo (capítulos WebVTT do relatório).
+    """
+    context.gerenciador_evidencias.registrar_inicio_passo(f"{step.keyword} {step.name}")
 
 
 def after_step(context, step):
     """
     Executado APÓS cada passo (step).
+    Marca o fim do passo no vídeo.
     Captura screenshot automaticamente se o passo falhar.
     Captura screenshot em todos os passos se configurado.
     Captura screenshot no último passo se configurado.
     """
-    # Incrementa índice do passo atual
-    context.indice_passo_atual += 1
-    
-    # Captura screenshot em caso de falha
-    if step.status in ["failed", "error"]:
-        nome_arquivo_screenshot = context.gerenciador_evidencias.capturar_screenshot_falha(
-            context.driver,
-            step.name
-        )
+    context.gerenciador_evidencias.registrar_fim_passo(step.status)
+    
+    with context.perfilador_fases.medir('screenshots'):
+        # Incrementa índice do passo atual
+        context.indice_passo_atual += 1
+        
+        # Captura screenshot em caso de falha
+        if step.status in ["failed", "error"]:
+            nome_arquivo_screenshot = context.gerenciador_evidencias.capturar_screenshot_falha(
+                context.driver,
+                step.name
+            )
+        
+            if nome_arquivo_screenshot and not hasattr(step, 'screenshots'):
+                step.screenshots = []
+                step.screenshots.append(nome_arquivo_screenshot)
+        
+        # Verifica se é o último passo do cenário
+        total_passos = len(context.cenario_atual.steps)
+        eh_ultimo_passo = (context.indice_passo_atual == total_passos)
+        
+        # Decide qual screenshot capturar baseado na configuração
+        nome_arquivo_screenshot = None
         
-        if nome_arquivo_screenshot and not hasattr(step, 'screenshots'):
-            step.screenshots = []
+        # Prioridade: último passo > todos os passos > falhas (já capturadas acima)
+        if eh_ultimo_passo and context.configuracao.screenshot_ultimo_passo:
+            nome_arquivo_screenshot = context.gerenciador_evidencias.capturar_screenshot_ultimo_passo(
+                context.driver,
+                context.cenario_atual.name,
+                step.name
+            )
+        elif context.configuracao.screenshot_em_todos_passos:
+            nome_arquivo_screenshot = context.gerenciador_evidencias.capturar_screenshot_passo(
+                context.driver,
+                step.name,
+                context.indice_passo_atual
+            )
+        
+        # Adiciona screenshot se foi capturado e não é duplicata de falha
+        if nome_arquivo_screenshot:
+            if not hasattr(step, 'screenshots'):
+                step.screenshots = []
             step.screenshots.append(nome_arquivo_screenshot)
-    
-    # Verifica se é o último passo do cenário
-    total_passos = len(context.cenario_atual.steps)
-    eh_ultimo_passo = (context.indice_passo_atual == total_passos)
-    
-    # Decide qual screenshot capturar baseado na configuração
-    nome_arquivo_screenshot = None
-    
-    # Prioridade: último passo > todos os passos > falhas (já capturadas acima)
-    if eh_ultimo_passo and context.configuracao.screenshot_ultimo_passo:
-        nome_arquivo_screenshot = context.gerenciador_evidencias.capturar_screenshot_ultimo_passo(
-            context.driver,
-            context.cenario_atual.name,
-            step.name
-        )
-    elif context.configuracao.screenshot_em_todos_passos:
-        nome_arquivo_screenshot = context.gerenciador_evidencias.capturar_screenshot_passo(
-            context.driver,
-            step.name,
-            context.indice_passo_atual
-        )
-    
-    # Adiciona screenshot se foi capturado e não é duplicata de falha
-    if nome_arquivo_screenshot:
-        if not hasattr(step, 'screenshots'):
-            step.screenshots = []
-        step.screenshots.append(nome_arquivo_screenshot)
 
 
 def after_scenario(context, scenario):
     """
     Executado APÓS cada cenário.
-    Finaliza gravação de vídeo e fecha o navegador.
+    Finaliza gravação de vídeo e fecha o navegador (ou devolve ao pool).
     """
     print(f"\n{'-'*60}")
     print(f"CENARIO FINALIZADO: {scenario.name}")
     print(f"STATUS: {scenario.status}")
     print(f"{'-'*60}\n")
     
+    perfilador = context.perfilador_fases
+    perfilador.marcar_fim_passos()
+    
     cenario_falhou = (scenario.status == 'failed')
     tem_tag_video_always = any(tag == 'video_always' for tag in scenario.tags)
     
-    nome_video = context.gerenciador_evidencias.finalizar_gravacao_video(
-        cenario_falhou,
-        tem_tag_video_always
-    )
+    nome_video = None
+    if context.modo_gravacao == 'dom':
+        with perfilador.medir('fim_replay_dom'):
+            context.gerenciador_evidencias.finalizar_gravacao_dom(cenario_falhou, tem_tag_video_always)
+    else:
+        with perfilador.medir('fim_video'):
+            nome_video = context.gerenciador_evidencias.finalizar_gravacao_video(
+                cenario_falhou,
+                tem_tag_video_always,
+                str(scenario.location)
+            )
     
     if nome_video:
         scenario.video_file = nome_video
+        # Com a codificação em segundo plano o vídeo só existe depois do after_all
+        context.cenarios_com_video[str(scenario.location)] = scenario
+    
+    metricas_video = context.gerenciador_evidencias.metricas_ultimo_video
+    if metricas_video:
+        context.gerenciador_relatorio.registrar_metricas_cenario(scenario.location, 'video', metricas_video)
+    
+    metricas_replay = context.gerenciador_evidencias.metricas_ultima_gravacao_dom
+    if metricas_replay:
+        context.gerenciador_relatorio.registrar_metricas_cenario(scenario.location, 'replay_dom', metricas_replay)
     
-    context.gerenciador_navegador.fechar_navegador()
+    metricas_rede = context.gerenciador_navegador.coletar_metricas_rede()
+    if metricas_rede:
+        context.gerenciador_relatorio.registrar_metricas_cenario(scenario.location, 'rede', metricas_rede)
+        print(
+            f"[REDE] {metricas_rede['requisicoes']} requisição(ões), "
+            f"{metricas_rede['requisicoes_bloqueadas']} bloqueada(s), "
+            f"{metricas_rede['bytes_transferidos'] / 1024:.1f} KB transferidos, "
+            f"{metricas_rede['bytes_economizados'] / 1024:.1f} KB economizados"
+        )
+    
+    with perfilador.medir('fechamento_navegador'):
+        if context.pool_navegadores:
+            context.pool_navegadores.devolver_navegador(context.gerenciador_navegador)
+        else:
+            context.gerenciador_navegador.fechar_navegador()
+    
+    fases = perfilador.finalizar_cenario()
+    context.gerenciador_relatorio.registrar_metricas_cenario(scenario.location, 'fases', fases)
 
 
 def after_all(context):
@@ -125,6 +221,45 @@ def after_all(context):
     Executado UMA vez após todos os testes.
     Finaliza execução, salva metadados e exibe resumo.
     """
+    if context.pool_navegadores:
+        context.pool_navegadores.encerrar()
+        context.gerenciador_relatorio.registrar_metricas_desempenho(
+            'pool_navegadores',
+            context.pool_navegadores.obter_estatisticas()
+        )
+    
+    if context.pre_aquecedor_navegador:
+        context.pre_aquecedor_navegador.encerrar()
+        context.gerenciador_relatorio.registrar_metricas_desempenho(
+            'pre_aquecimento_navegador',
+            context.pre_aquecedor_navegador.obter_estatisticas()
+        )
+    
+    context.gerenciador_relatorio.registrar_metricas_desempenho(
+        'resolucao_driver',
+        ResolvedorDeDriver.obter_estatisticas()
+    )
+    
+    if context.servidor_portal_local:
+        context.servidor_portal_local.encerrar()
+    
+    # Os vídeos precisam estar no disco antes do relatório
+    for codificacao in context.gerenciador_evidencias.aguardar_codificacoes_video():
+        # Codificação falhou: o arquivo foi removido e o cenário deixa de apontar para ele
+        cenario_do_video = context.cenarios_com_video.get(str(codificacao['localizacao']))
+        if codificacao['erro'] and cenario_do_video:
+            cenario_do_video.video_file = None
+        context.gerenciador_relatorio.registrar_metricas_cenario(
+            codificacao['localizacao'],
+            'video_codificacao',
+            codificacao['resultado'] or {'arquivo': codificacao['arquivo'], 'erro': codificacao['erro']}
+        )
+    if context.gerenciador_evidencias.codificador_video:
+        context.gerenciador_relatorio.registrar_metricas_desempenho(
+            'codificacao_video',
+            context.gerenciador_evidencias.codificador_video.obter_estatisticas()
+        )
+    
     context.gerenciador_relatorio.registrar_fim_execucao()
     context.gerenciador_relatorio.salvar_metadados()
     
@@ -138,4 +273,21 @@ def after_all(context):
     print(f"Duração:   {resumo['duracao']}")
     print(f"Sistema:   {resumo['sistema']}")
     print(f"Navegador: {resumo['navegador']}")
+    for fase, estatisticas_fase in context.perfilador_fases.obter_resumo().items():
+        print(
+            f"Fase {fase}: p50 {estatisticas_fase['p50_segundos']:.2f}s / "
+            f"p95 {estatisticas_fase['p95_segundos']:.2f}s"
+        )
+    if context.pool_navegadores:
+        estatisticas_pool = context.pool_navegadores.obter_estatisticas()
+        print(
+            f"Pool:      {estatisticas_pool['sessoes_reutilizadas']} reuso(s), "
+            f"~{estatisticas_pool['tempo_economizado_segundos']:.1f}s economizados"
+        )
+    if context.pre_aquecedor_navegador:
+        estatisticas_pre_aquecimento = context.pre_aquecedor_navegador.obter_estatisticas()
+        print(
+            f"Pré-aquec.: {estatisticas_pre_aquecimento['lancamentos_antecipados']} navegador(es) pronto(s), "
+            f"~{estatisticas_pre_aquecimento['tempo_oculto_segundos']:.1f}s de abertura escondidos"
+        )
     print("="*60 + "\n")
@@ -4,9 +4,13 @@
 Gerador de Relatório HTML para resultados do Behave.
 Lê o arquivo JSON e gera um HTML visual com suporte correto a UTF-8.
 """
+import base64
+import gzip
 import json
+import re
 import unicodedata
 from datetime import datetime
+from html import escape as html_escape, unescape as html_unescape
 from pathlib import Path
 import shutil
 import os
@@ -14,6 +18,23 @@ import platform
 import psutil
 import selenium
 
+from recursos.utils.gravador_eventos_dom import SCRIPT_REPRODUTOR_EVENTOS_DOM
+from recursos.utils.perfilador_fases import calcular_percentil
+
+
+# Fases dos hooks medidas pelo PerfiladorDeFases: (chave, rótulo, cor no gráfico)
+FASES_HOOKS = [
+    ('abertura_navegador', 'Abertura do navegador', '#667eea'),
+    ('informacoes_navegador', 'Informações do navegador', '#9f7aea'),
+    ('inicio_video', 'Início do vídeo', '#f6ad55'),
+    ('inicio_replay_dom', 'Início da gravação do DOM', '#d6bcfa'),
+    ('passos', 'Passos', '#48bb78'),
+    ('screenshots', 'Screenshots (after_step)', '#4fd1c5'),
+    ('fim_video', 'Fim do vídeo (encode)', '#ed8936'),
+    ('fim_replay_dom', 'Fim da gravação do DOM (coleta e gzip)', '#805ad5'),
+    ('fechamento_navegador', 'Fechamento do navegador', '#a0aec0')
+]
+
 def carregar_configuracoes_env():
     """
     Carrega configurações do arquivo .env para usar nas mensagens dinâmicas
@@ -107,22 +128,36 @@ def generate_html_report(json_file='reports/results.json', output_file=None):
     videos_src = Path('reports/videos')
     videos_dest = None
     video_mapping = {}  # Mapeia nome original -> novo caminho relativo
+    replay_mapping = {}  # Gravações dos eventos do DOM (.json.gz) -> caminho relativo
     
     if videos_src.exists() and any(videos_src.iterdir()):
         videos_dest = report_dir / f'videos_{timestamp}'
         videos_dest.mkdir(parents=True, exist_ok=True)
         
-        # Copia APENAS arquivos de vídeo (mp4, avi, webm)
+        # Copia APENAS arquivos de vídeo (mp4, avi, webm), os capítulos dos passos (vtt)
+        # e as gravações dos eventos do DOM (json.gz)
         arquivos_video_copiados = 0
         for video_file in videos_src.iterdir():
             if video_file.is_file() and video_file.suffix in ['.mp4', '.avi', '.webm']:
                 shutil.copy2(video_file, videos_dest / video_file.name)
                 arquivos_video_copiados += 1
+            elif video_file.is_file() and video_file.suffix == '.vtt':
+                shutil.copy2(video_file, videos_dest / video_file.name)
+            elif video_file.is_file() and video_file.name.endswith('.json.gz'):
+                shutil.copy2(video_file, videos_dest / video_file.name)
+                replay_mapping[video_file.name] = f'videos_{timestamp}/{video_file.name}'
         
         print(f"[OK] {arquivos_video_copiados} vídeo(s) copiado(s) para: {videos_dest}")
+        if replay_mapping:
+            print(f"[OK] {len(replay_mapping)} gravação(ões) dos eventos do DOM copiada(s) para: {videos_dest}")
+        
+        # Vídeos WebM (VP8) não passam pela conversão. Os MP4/AVI são verificados e os codecs que os
+        # navegadores não tocam (FMP4, MP4V e o MJPEG do modo streaming, VIDEO_FORMATO) são convertidos
+        # para WebM
+        videos_webm = sum(1 for video_file in videos_dest.iterdir() if video_file.suffix == '.webm')
+        if videos_webm:
+            print(f"[INFO] {videos_webm} vídeo(s) já gravado(s) em WebM (sem conversão)")
         
-        # Tenta converter vídeos com codecs problemáticos (FMP4, MP4V) para WebM
-        # para melhor compatibilidade com navegadores
         try:
             from recursos.utils.video_converter import ensure_web_compatible_video
             
@@ -162,6 +197,39 @@ def generate_html_report(json_file='reports/results.json', output_file=None):
             except Exception:
                 pass
     
+    # Capítulos dos passos gravados ao lado de cada vídeo (GerenciadorDeEvidencias._salvar_capitulos_video)
+    def _carregar_capitulos_video(caminho_video_relativo):
+        caminho_capitulos = (report_dir / caminho_video_relativo).with_suffix('.vtt')
+        if not caminho_capitulos.exists():
+            return None, []
+        
+        capitulos = []
+        for bloco in caminho_capitulos.read_text(encoding='utf-8').split('\n\n')[1:]:
+            linhas = bloco.strip().split('\n')
+            if len(linhas) < 3 or '-->' not in linhas[1]:
+                continue
+            inicio_texto, fim_texto = [parte.strip() for parte in linhas[1].split('-->')]
+            horas, minutos, segundos = inicio_texto.split(':')
+            capitulos.append({
+                'status': linhas[0].split(' ', 1)[-1],
+                'inicio': int(horas) * 3600 + int(minutos) * 60 + float(segundos),
+                'fim_texto': fim_texto,
+                'nome': html_unescape(' '.join(linhas[2:]))
+            })
+        return str(Path(caminho_video_relativo).with_suffix('.vtt')).replace('\\', '/'), capitulos
+    
+    # Gravação dos eventos do DOM (GravadorDeEventosDom): o arquivo vai embutido no HTML em base64
+    # (o relatório abre via file://, sem fetch) e os passos viram atalhos na linha do tempo
+    def _carregar_replay_dom(caminho_replay_relativo):
+        caminho_replay = report_dir / caminho_replay_relativo
+        try:
+            conteudo = caminho_replay.read_bytes()
+            passos = json.loads(gzip.decompress(conteudo)).get('passos', [])
+        except (OSError, EOFError, ValueError) as erro:
+            print(f"[AVISO] Gravação dos eventos do DOM ignorada ({caminho_replay.name}): {erro}")
+            return None, []
+        return base64.b64encode(conteudo).decode('ascii'), passos
+    
     # Sanitiza nome de cenário/passo como o gerenciador de evidências (para match de arquivos)
     def _sanitizar_nome_arquivo(nome):
         caracteres_proibidos = ['/', '\\', ':', '*', '?', '"', '<', '>', '|']
@@ -189,6 +257,8 @@ def generate_html_report(json_file='reports/results.json', output_file=None):
     system_info_raw = metadata.get('sistema', metadata.get('system', {}))
     test_env_raw = metadata.get('ambiente_teste', metadata.get('test_env', {}))
     execution_info = metadata.get('execucao', metadata.get('execution', {}))
+    performance_info = metadata.get('desempenho', {})
+    scenario_metrics = metadata.get('cenarios', {})
     
     # Mapeia chaves em português para inglês (retrocompatibilidade)
     def obter_valor(dicionario, chave_pt, chave_en, padrao='Unknown'):
@@ -226,6 +296,59 @@ def generate_html_report(json_file='reports/results.json', output_file=None):
         'execution_dir': obter_valor(test_env_raw, 'diretorio_execucao', 'execution_dir', str(Path.cwd()))
     }
     
+    # Itens extras da seção "Execução" com métricas de desempenho do framework
+    performance_items_html = ""
+    pool_info = performance_info.get('pool_navegadores')
+    if pool_info:
+        performance_items_html += f"""
+                        <div class="info-item">
+                            <span class="info-label">Pool de Navegadores:</span>
+                            <span class="info-value">{pool_info.get('sessoes_criadas', 0)} aberto(s) / {pool_info.get('sessoes_reutilizadas', 0)} reuso(s)</span>
+                        </div>
+                        <div class="info-item">
+                            <span class="info-label">Tempo Economizado (Pool):</span>
+                            <span class="info-value">{pool_info.get('tempo_economizado_segundos', 0):.1f}s</span>
+                        </div>"""
+    
+    pre_aquecimento_info = performance_info.get('pre_aquecimento_navegador')
+    if pre_aquecimento_info:
+        performance_items_html += f"""
+                        <div class="info-item">
+                            <span class="info-label">Abertura Escondida (Pré-aquecimento):</span>
+                            <span class="info-value">{pre_aquecimento_info.get('tempo_oculto_segundos', 0):.1f}s em {pre_aquecimento_info.get('lancamentos_antecipados', 0)} cenário(s)</span>
+                        </div>"""
+    
+    for tipo_navegador, resolucao in performance_info.get('resolucao_driver', {}).items():
+        performance_items_html += f"""
+                        <div class="info-item">
+                            <span class="info-label">Resolução do Driver ({tipo_navegador}):</span>
+                            <span class="info-value">{resolucao.get('tempo_total_segundos', 0):.3f}s ({resolucao.get('origem', 'N/A')})</span>
+                        </div>"""
+    
+    # Resumo p50/p95 das fases dos hooks (calculado dos cenários para valer também na execução paralela)
+    phase_samples = {}
+    for metrics in scenario_metrics.values():
+        for phase, seconds in metrics.get('fases', {}).items():
+            phase_samples.setdefault(phase, []).append(seconds)
+    
+    phase_section_html = ""
+    if phase_samples:
+        phase_items_html = ""
+        for phase, label, color in FASES_HOOKS:
+            samples = phase_samples.get(phase)
+            if not samples:
+                continue
+            phase_items_html += f"""
+                        <div class="info-item">
+                            <span class="info-label"><span class="phase-dot" style="background: {color};"></span>{label}:</span>
+                            <span class="info-value">p50 {calcular_percentil(samples, 50):.2f}s / p95 {calcular_percentil(samples, 95):.2f}s</span>
+                        </div>"""
+        phase_section_html = f"""
+                    <div class="info-section">
+                        <h3>⏱️ Fases dos Hooks ({sum(1 for metrics in scenario_metrics.values() if metrics.get('fases'))} cenário(s))</h3>{phase_items_html}
+                    </div>
+                    """
+    
     # Calcula tempo total de execução
     total_duration = 0
     for feature in data:
@@ -484,6 +607,33 @@ def generate_html_report(json_file='reports/results.json', output_file=None):
             display: block;
         }}
         
+        .scenario-metrics {{
+            font-size: 12px;
+            color: #666;
+            margin: 0 0 10px 10px;
+        }}
+        
+        .phase-bar {{
+            display: flex;
+            height: 14px;
+            margin: 0 0 10px 10px;
+            border-radius: 4px;
+            overflow: hidden;
+            background: #e0e0e0;
+        }}
+        
+        .phase-segment {{
+            height: 100%;
+        }}
+        
+        .phase-dot {{
+            display: inline-block;
+            width: 10px;
+            height: 10px;
+            margin-right: 6px;
+            border-radius: 2px;
+        }}
+        
         .toggle-icon {{
             margin-right: 10px;
             transition: transform 0.3s;
@@ -753,6 +903,130 @@ def generate_html_report(json_file='reports/results.json', output_file=None):
             text-align: center;
         }}
         
+        .video-chapters {{
+            display: flex;
+            flex-wrap: wrap;
+            gap: 6px;
+            margin-top: 10px;
+        }}
+        
+        .video-chapter {{
+            padding: 4px 10px;
+            border: 1px solid #ccc;
+            border-radius: 12px;
+            background: white;
+            font-size: 12px;
+            cursor: pointer;
+        }}
+        
+        .video-chapter:hover {{
+            background: #e7f3ff;
+        }}
+        
+        .replay-container {{
+            border-left-color: #805ad5;
+        }}
+        
+        .replay-container h4 {{
+            color: #805ad5;
+        }}
+        
+        .replay-abrir {{
+            padding: 8px 16px;
+            border: none;
+            border-radius: 6px;
+            background: #805ad5;
+            color: white;
+            cursor: pointer;
+        }}
+        
+        .replay-conteudo {{
+            display: none;
+            max-width: 900px;
+        }}
+        
+        .replay-controles {{
+            display: flex;
+            align-items: center;
+            gap: 10px;
+            margin-bottom: 8px;
+            font-size: 13px;
+        }}
+        
+        .replay-barra {{
+            flex: 1;
+        }}
+        
+        .replay-url {{
+            font-size: 12px;
+            color: #666;
+            margin-bottom: 6px;
+            word-break: break-all;
+        }}
+        
+        .replay-tela {{
+            position: relative;
+            overflow: hidden;
+            border-radius: 8px;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+            background: white;
+        }}
+        
+        .replay-tela iframe {{
+            position: absolute;
+            top: 0;
+            left: 0;
+            border: none;
+            transform-origin: 0 0;
+            pointer-events: none;
+            background: white;
+        }}
+        
+        .replay-clique {{
+            position: absolute;
+            width: 24px;
+            height: 24px;
+            margin: -12px 0 0 -12px;
+            border-radius: 50%;
+            background: rgba(128, 90, 213, 0.5);
+            opacity: 0;
+            pointer-events: none;
+        }}
+        
+        .replay-clique.ativo {{
+            animation: replay-clique 0.6s ease-out;
+        }}
+        
+        @keyframes replay-clique {{
+            from {{ opacity: 1; transform: scale(0.5); }}
+            to {{ opacity: 0; transform: scale(2); }}
+        }}
+        
+        .video-chapter.chapter-passed {{
+            border-color: #4caf50;
+        }}
+        
+        .video-chapter.chapter-failed, .video-chapter.chapter-error {{
+            border-color: #e74c3c;
+            background: #fdecea;
+            font-weight: bold;
+        }}
+        
+        .video-health {{
+            margin-top: 10px;
+            padding: 8px;
+            background: #eef7ee;
+            border-left: 3px solid #4caf50;
+            border-radius: 4px;
+            color: #2e5e30;
+        }}
+        
+        .video-health-alert {{
+            background: #fdecea;
+            border-left-color: #e74c3c;
+            color: #8a1f11;
+        }}
+        
         .video-controls-info a {{
             color: #1976D2;
             text-decoration: none;
@@ -833,9 +1107,9 @@ def generate_html_report(json_file='reports/results.json', output_file=None):
                         <div class="info-item">
                             <span class="info-label">Data/Hora Geração:</span>
                             <span class="info-value">{datetime.now().strftime('%d/%m/%Y %H:%M:%S')}</span>
-                        </div>
+                        </div>{performance_items_html}
                     </div>
-                    
+                    {phase_section_html}
                     <div class="info-section">
                         <h3>💻 Sistema</h3>
                         <div class="info-item">
@@ -1007,6 +1281,25 @@ def generate_html_report(json_file='reports/results.json', output_file=None):
                         📋 Cenário: {scenario_name}
                     </div>
                     <div class="scenario-steps {expanded_class}">
+"""
+            # Tempo de cada fase dos hooks do cenário (barra empilhada)
+            phase_metrics = scenario_metrics.get(scenario.get('location', ''), {}).get('fases', {})
+            phase_total = sum(phase_metrics.values())
+            if phase_total > 0:
+                html += """
+                        <div class="phase-bar">"""
+                for phase, label, color in FASES_HOOKS:
+                    seconds = phase_metrics.get(phase, 0)
+                    if seconds > 0:
+                        html += f"""<div class="phase-segment" style="width: {seconds / phase_total * 100:.2f}%; background: {color};" title="{label}: {seconds:.2f}s"></div>"""
+                html += """</div>
+"""
+            
+            # Métricas de rede do cenário (perfil leve do navegador)
+            network_metrics = scenario_metrics.get(scenario.get('location', ''), {}).get('rede')
+            if network_metrics:
+                html += f"""
+                        <div class="scenario-metrics">🌐 {network_metrics.get('requisicoes', 0)} requisição(ões) | {network_metrics.get('requisicoes_bloqueadas', 0)} bloqueada(s) | {network_metrics.get('bytes_transferidos', 0) / 1024:.1f} KB transferidos | {network_metrics.get('bytes_economizados', 0) / 1024:.1f} KB economizados</div>
 """
             # Nome do cenário sanitizado como no gerenciador de evidências (para vincular screenshots/vídeo ao cenário correto, ex.: Esquema do Cenário @1.1, @1.2, @1.3)
             scenario_name_ascii = unicodedata.normalize('NFKD', scenario_name).encode('ASCII', 'ignore').decode('ASCII')
@@ -1115,6 +1408,19 @@ def generate_html_report(json_file='reports/results.json', output_file=None):
                         scenario_video_file = video_path
                         break
             
+            # Codificação em segundo plano falhou: o vídeo foi removido no after_all, só fica o aviso
+            failed_encode = scenario_metrics.get(scenario.get('location', ''), {}).get('video_codificacao')
+            if failed_encode and failed_encode.get('erro'):
+                scenario_video_file = None
+                html += f"""
+                    <div class="video-container">
+                        <h4>🎥 Vídeo de Evidência</h4>
+                        <div class="video-health video-health-alert">
+                            <small>❌ O vídeo deste cenário não foi gerado: a codificação falhou ({html_escape(failed_encode['erro'])})</small>
+                        </div>
+                    </div>
+"""
+            
             if scenario_video_file:
                 # Determina o status do cenário para mensagem dinâmica
                 scenario_status = scenario.get('status', 'undefined')
@@ -1139,26 +1445,152 @@ def generate_html_report(json_file='reports/results.json', output_file=None):
                 else:
                     video_type = "video/mp4"
                 
+                # Saúde do gravador (FPS obtido, latência de captura, tempos por frame, erros, memória)
+                video_health_html = ""
+                video_metrics = scenario_metrics.get(scenario.get('location', ''), {}).get('video')
+                if video_metrics:
+                    latency = video_metrics.get('latencia_captura_ms', {})
+                    histogram_title = ', '.join(
+                        f"{faixa.replace('<=', '≤')} ms: {quantidade}"
+                        for faixa, quantidade in video_metrics.get('histograma_latencia_ms', {}).items()
+                    )
+                    encode_metrics = scenario_metrics.get(scenario.get('location', ''), {}).get('video_codificacao')
+                    encode_text = ""
+                    if encode_metrics and encode_metrics.get('erro'):
+                        encode_text = f" | ❌ codificação falhou: {encode_metrics['erro']}"
+                    elif encode_metrics:
+                        encode_text = f" | codificado em segundo plano em {encode_metrics.get('codificacao_s', 0):.1f}s ({encode_metrics.get('arquivo_kb', 0):.0f} KB)"
+                    # Na captura adaptativa o FPS fica abaixo do máximo de propósito com a página parada
+                    adaptive = video_metrics.get('captura_adaptativa')
+                    adaptive_text = ""
+                    if adaptive:
+                        adaptive_text = (
+                            f" (adaptativo {adaptive.get('fps_minimo', 0):g}-{adaptive.get('fps_maximo', 0)} FPS, "
+                            f"{adaptive.get('segundos_ativos', 0):.1f}s no máximo)"
+                        )
+                    health_alert = (
+                        (not adaptive and video_metrics.get('fps_obtido', 0) < 0.8 * video_metrics.get('fps_alvo', 0))
+                        or video_metrics.get('erros_captura', 0) > 0
+                        or bool(encode_metrics and encode_metrics.get('erro'))
+                    )
+                    video_health_html = f"""
+                        <div class="video-health{' video-health-alert' if health_alert else ''}" title="Latência de captura: {histogram_title}">
+                            <small>
+                                🩺 Gravador ({video_metrics.get('backend')}, {video_metrics.get('modo')}):
+                                {video_metrics.get('fps_obtido', 0):.1f}/{video_metrics.get('fps_alvo', 0)} FPS{adaptive_text} |
+                                captura p50 {latency.get('p50', 0):.0f} ms / p95 {latency.get('p95', 0):.0f} ms |
+                                decodificação {video_metrics.get('decodificacao_ms_por_frame', 0):.1f} ms,
+                                overlay {video_metrics.get('overlay_ms_por_frame', 0):.2f} ms,
+                                escrita {video_metrics.get('escrita_ms_por_frame', 0):.1f} ms por frame
+                                ({video_metrics.get('frames_escritos_repetidos', 0)} de {video_metrics.get('frames_escritos', 0)} frames escritos são repetições) |
+                                {video_metrics.get('erros_captura', 0)} erro(s) |
+                                pico {video_metrics.get('pico_buffer_mb', 0):.1f} MB{encode_text}
+                            </small>
+                        </div>"""
+                
+                # Marcadores dos passos: clicar posiciona o vídeo no início do passo (sem recodificar)
+                video_id = 'video_' + re.sub(r'\W', '_', scenario_video_file)
+                chapters_file, chapters = _carregar_capitulos_video(scenario_video_file)
+                chapters_track_html = ""
+                chapters_html = ""
+                if chapters:
+                    chapters_track_html = f"""
+                            <track kind="chapters" src="{chapters_file}" srclang="pt" label="Passos" default>"""
+                    chapters_html = """
+                        <div class="video-chapters">"""
+                    for chapter in chapters:
+                        minutes, seconds = divmod(int(chapter['inicio']), 60)
+                        chapters_html += f"""
+                            <button class="video-chapter chapter-{html_escape(chapter['status'])}" onclick="seekVideo('{video_id}', {chapter['inicio']:.3f})" title="Até {chapter['fim_texto']}">
+                                ⏵ {minutes:02d}:{seconds:02d} {html_escape(chapter['nome'])}
+                            </button>"""
+                    chapters_html += """
+                        </div>"""
+                
                 html += f"""
                     <div class="video-container">
                         <h4>🎥 Vídeo de Evidência</h4>
-                        <video controls preload="metadata" width="100%" style="max-width: 900px;">
+                        <video id="{video_id}" controls preload="metadata" width="100%" style="max-width: 900px;">
                             <source src="{scenario_video_file}" type="{video_type}">
                             <source src="{scenario_video_file}" type="video/mp4">
-                            <source src="{scenario_video_file}" type="video/webm">
+                            <source src="{scenario_video_file}" type="video/webm">{chapters_track_html}
                             <p>Seu navegador não suporta o elemento de vídeo HTML5.</p>
                             <p>Você pode <a href="{scenario_video_file}" download>baixar o vídeo</a> para assistir.</p>
-                        </video>
+                        </video>{chapters_html}
                         <p class="video-info">
                             <small>{video_message}</small>
                         </p>
                         <div class="video-controls-info">
                             <small>
                                 🔹 Clique no vídeo para reproduzir | 
-                                <a href="{scenario_video_file}" download="evidencia_teste.mp4">💾 Baixar vídeo</a> |
+                                <a href="{scenario_video_file}" download="evidencia_teste{Path(scenario_video_file).suffix}">💾 Baixar vídeo</a> |
                                 <a href="{scenario_video_file}" target="_blank">🔗 Abrir em nova aba</a>
                             </small>
+                        </div>{video_health_html}
+                    </div>
+"""
+            
+            # Reprodução dos eventos do DOM (@gravacao_dom / GRAVACAO_MODO_PADRAO=dom)
+            replay_metrics = scenario_metrics.get(scenario.get('location', ''), {}).get('replay_dom')
+            replay_file = replay_mapping.get(replay_metrics.get('arquivo', '')) if replay_metrics else None
+            replay_data, replay_steps = _carregar_replay_dom(replay_file) if replay_file else (None, [])
+            if replay_data:
+                replay_id = 'replay_' + re.sub(r'\W', '_', replay_file)
+                replay_steps_html = ""
+                if replay_steps:
+                    replay_start = replay_steps[0]['inicio']
+                    replay_steps_html = """
+                        <div class="video-chapters">"""
+                    for step_record in replay_steps:
+                        minutes, seconds = divmod(int(step_record['inicio'] - replay_start), 60)
+                        replay_steps_html += f"""
+                            <button class="video-chapter chapter-{html_escape(step_record.get('status') or 'undefined')}" onclick="irParaPassoDom('{replay_id}', {step_record['inicio']:.3f})">
+                                ⏵ {minutes:02d}:{seconds:02d} {html_escape(step_record['nome'])}
+                            </button>"""
+                    replay_steps_html += """
+                        </div>"""
+                
+                replay_alert = replay_metrics.get('erros', 0) > 0
+                html += f"""
+                    <div class="video-container replay-container" id="{replay_id}">
+                        <h4>🧩 Reprodução dos Eventos do DOM</h4>
+                        <button class="replay-abrir" onclick="abrirReproducaoDom('{replay_id}')">
+                            ▶ Abrir reprodução ({replay_metrics.get('eventos', 0)} eventos)
+                        </button>
+                        <div class="replay-conteudo">
+                            <div class="replay-controles">
+                                <button class="replay-tocar" title="Reproduzir/pausar">▶</button>
+                                <input type="range" class="replay-barra" min="0" max="1" value="0" step="10">
+                                <span class="replay-tempo"></span>
+                                <select class="replay-velocidade" title="Velocidade">
+                                    <option value="1">1x</option>
+                                    <option value="2">2x</option>
+                                    <option value="4">4x</option>
+                                    <option value="8">8x</option>
+                                </select>
+                                <label><input type="checkbox" class="replay-pular" checked> Pular esperas</label>
+                            </div>
+                            <div class="replay-url"></div>
+                            <div class="replay-tela">
+                                <iframe sandbox="allow-same-origin" title="Reprodução do cenário"></iframe>
+                                <div class="replay-clique"></div>
+                            </div>
+                        </div>{replay_steps_html}
+                        <div class="video-controls-info">
+                            <small>
+                                <a href="{replay_file}" download>💾 Baixar eventos (.json.gz)</a>
+                            </small>
+                        </div>
+                        <div class="video-health{' video-health-alert' if replay_alert else ''}">
+                            <small>
+                                🩺 Gravador do DOM: {replay_metrics.get('eventos', 0)} evento(s),
+                                {replay_metrics.get('snapshots', 0)} página(s) |
+                                {replay_metrics.get('json_kb', 0):.0f} KB de JSON, {replay_metrics.get('arquivo_kb', 0):.0f} KB compactado |
+                                {replay_metrics.get('sincronizacoes', 0)} coleta(s), {replay_metrics.get('sincronizacao_ms', 0):.1f} ms em média |
+                                {replay_metrics.get('erros', 0)} erro(s)
+                            </small>
                         </div>
+                        <script type="application/octet-stream" id="{replay_id}_dados">{replay_data}</script>
                     </div>
 """
             
@@ -1187,6 +1619,14 @@ def generate_html_report(json_file='reports/results.json', output_file=None):
     </div>
     
     <script>
+""" + SCRIPT_REPRODUTOR_EVENTOS_DOM + """
+        
+        function seekVideo(videoId, seconds) {
+            const video = document.getElementById(videoId);
+            video.currentTime = seconds;
+            video.play();
+        }
+        
         function openModal(modalId, imageSrc) {
             var modal = document.getElementById('screenshotModal');
             var modalImg = document.getElementById('modalImage');
@@ -5,6 +5,8 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
+from recursos.utils.gerenciador_navegador import SCRIPT_MONITOR_REQUISICOES
+from recursos.utils.atividade_pagina import notificar_atividade
 import time
 
 
@@ -24,8 +26,78 @@ class PaginaBase:
             timeout_padrao: Tempo máximo de espera para elementos (padrão: 10 segundos)
         """
         self.driver = driver
+        self.timeout_padrao = timeout_padrao
         self.espera = WebDriverWait(self.driver, timeout_padrao)
 
+    def navegar_para(self, url: str):
+        """
+        Abre a URL no navegador.
+        Com pageLoadStrategy 'eager' ou 'none' o driver.get() não espera o evento load,
+        então aguarda as requisições fetch/XHR da página terminarem antes de seguir.
+        
+        Args:
+            url: Endereço a ser aberto
+        """
+        notificar_atividade(self.driver, 'navegacao')
+        self.driver.get(url)
+        
+        if self.driver.capabilities.get('pageLoadStrategy', 'normal') != 'normal':
+            self.aguardar_rede_ociosa()
+
+    def aguardar_rede_ociosa(self, timeout: int = None, janela_ociosa: float = 0.5) -> float:
+        """
+        Aguarda até que não haja requisições fetch/XHR em andamento na página.
+        A rede é considerada ociosa quando o DOM já foi interpretado, nenhuma requisição
+        está pendente e nenhuma nova terminou durante a janela de ociosidade.
+        Imagens, fontes e scripts de terceiros não entram na conta.
+        
+        Args:
+            timeout: Tempo máximo de espera em segundos (padrão: timeout da página)
+            janela_ociosa: Segundos sem atividade de rede para considerar a página estável
+            
+        Returns:
+            Tempo aguardado em segundos
+            
+        Raises:
+            TimeoutException: Se a rede não ficar ociosa no tempo limite
+        """
+        timeout = timeout if timeout is not None else self.timeout_padrao
+        script_estado = SCRIPT_MONITOR_REQUISICOES + """
+            return {
+                estado: document.readyState,
+                pendentes: window.__monitorRequisicoes.pendentes,
+                concluidas: performance.getEntriesByType('resource').filter(function (recurso) {
+                    return recurso.initiatorType === 'fetch' || recurso.initiatorType === 'xmlhttprequest';
+                }).length
+            };
+        """
+        
+        inicio = time.perf_counter()
+        limite = inicio + timeout
+        ultima_assinatura = None
+        ocioso_desde = None
+        
+        while True:
+            agora = time.perf_counter()
+            estado = self.driver.execute_script(script_estado)
+            assinatura = (estado['estado'], estado['pendentes'], estado['concluidas'])
+            
+            if estado['estado'] == 'loading' or estado['pendentes'] > 0 or assinatura != ultima_assinatura:
+                ocioso_desde = None if estado['pendentes'] > 0 or estado['estado'] == 'loading' else agora
+            elif ocioso_desde is not None and agora - ocioso_desde >= janela_ociosa:
+                tempo_aguardado = agora - inicio
+                print(f"[PAGINA] Rede ociosa em {tempo_aguardado:.2f}s")
+                return tempo_aguardado
+            
+            ultima_assinatura = assinatura
+            
+            if agora >= limite:
+                raise TimeoutException(
+                    f"Rede não ficou ociosa em {timeout}s. "
+                    f"Requisições pendentes: {estado['pendentes']}"
+                )
+            time.sleep(0.1)
+
     def _encontrar_elemento(self, localizador: tuple) -> WebElement:
         """
         Encontra um único elemento na página usando espera explícita.
@@ -78,6 +150,7 @@ class PaginaBase:
             localizador: Tupla (By.TIPO, 'seletor') do elemento a ser clicado
         """
         elemento = self.espera.until(EC.element_to_be_clickable(localizador))
+        notificar_atividade(self.driver, 'clique')
         elemento.click()
 
     def preencher_campo_texto(self, localizador: tuple, texto: str):
@@ -90,6 +163,7 @@ class PaginaBase:
             texto: Texto a ser inserido no campo
         """
         elemento = self._encontrar_elemento(localizador)
+        notificar_atividade(self.driver, 'digitacao')
         elemento.clear()
         elemento.send_keys(texto)
 
@@ -175,6 +249,7 @@ class PaginaBase:
         """
         elemento_select = self._encontrar_elemento(localizador)
         select = Select(elemento_select)
+        notificar_atividade(self.driver, 'selecao')
         select.select_by_visible_text(texto_visivel)
         
     def obter_titulo_pagina(self) -> str:
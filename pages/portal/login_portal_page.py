@@ -21,7 +21,7 @@ class PaginaLoginPortal(PaginaBase):
 
     def carregar_pagina(self):
         """Abre a página de login do Portal de Colaboradores."""
-        self.driver.get(self.url_pagina)
+        self.navegar_para(self.url_pagina)
         print(f"[PAGINA] Login Portal carregada: {self.url_pagina}")
 
     def preencher_usuario(self, usuario: str):
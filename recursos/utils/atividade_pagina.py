@@ -0,0 +1,54 @@
+import threading
+
+
+_ouvintes = {}
+_trava = threading.Lock()
+
+
+def _chave_sessao(driver):
+    """Identifica a sessão do navegador (o mesmo driver é reaproveitado pelo pool entre cenários)"""
+    return getattr(driver, 'session_id', None) or id(driver)
+
+
+def registrar_ouvinte_atividade(driver, ouvinte):
+    """
+    Registra uma função chamada a cada atividade na página controlada pelo driver
+
+    Args:
+        driver: Instância do WebDriver
+        ouvinte: Função que recebe a origem da atividade ('navegacao', 'clique', 'digitacao', 'selecao')
+    """
+    with _trava:
+        _ouvintes.setdefault(_chave_sessao(driver), []).append(ouvinte)
+
+
+def remover_ouvinte_atividade(driver, ouvinte):
+    """
+    Remove um ouvinte registrado com registrar_ouvinte_atividade
+
+    Args:
+        driver: Instância do WebDriver
+        ouvinte: Função registrada
+    """
+    with _trava:
+        ouvintes = _ouvintes.get(_chave_sessao(driver), [])
+        if ouvinte in ouvintes:
+            ouvintes.remove(ouvinte)
+        if not ouvintes:
+            _ouvintes.pop(_chave_sessao(driver), None)
+
+
+def notificar_atividade(driver, origem):
+    """
+    Avisa os ouvintes da sessão que um comando vai alterar a página.
+    Chamado pelo PaginaBase antes de navegar, clicar, digitar e selecionar
+    (o gravador de vídeo adaptativo passa para o FPS máximo).
+
+    Args:
+        driver: Instância do WebDriver
+        origem: Tipo de atividade
+    """
+    with _trava:
+        ouvintes = list(_ouvintes.get(_chave_sessao(driver), []))
+    for ouvinte in ouvintes:
+        ouvinte(origem)
@@ -0,0 +1,118 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+
+class CodificadorDeVideoEmSegundoPlano:
+    """
+    Codifica os vídeos mantidos em um pool de processos, fora do caminho crítico dos cenários.
+    O after_scenario só grava os frames em um arquivo temporário (VideoRecorder.encode_job) e segue;
+    o after_all aguarda as codificações pendentes antes de salvar os metadados do relatório.
+    """
+
+    def __init__(self, configuracao):
+        """
+        Inicializa o codificador (o pool de processos só é criado no primeiro vídeo)
+
+        Args:
+            configuracao: Instância de GerenciadorDeConfiguracao
+        """
+        self.configuracao = configuracao
+        self.executor = None
+        self.pendentes = []
+        self.videos_codificados = 0
+        self.videos_com_erro = 0
+        self.tempo_codificacao = 0.0
+        self.tempo_espera = 0.0
+
+    def enviar(self, encode_job, nome_cenario, localizacao_cenario=None):
+        """
+        Envia a codificação de um vídeo para o pool
+
+        Args:
+            encode_job: Dict gerado por VideoRecorder.stop_recording(defer_encode=True)
+            nome_cenario: Nome do cenário (para os logs de erro)
+            localizacao_cenario: Location do cenário (chave das métricas no relatório)
+        """
+        from recursos.utils.gravador_video import encode_spilled_video
+
+        if self.executor is None:
+            # spawn: o processo do Behave tem threads (Selenium, gravação) que não sobrevivem a um fork
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.configuracao.video_codificacao_processos,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            print(f"[VIDEO] Codificação em segundo plano com {self.configuracao.video_codificacao_processos} processo(s)")
+
+        futuro = self.executor.submit(encode_spilled_video, encode_job)
+        self.pendentes.append({
+            'futuro': futuro,
+            'cenario': nome_cenario,
+            'localizacao': localizacao_cenario,
+            'arquivo': Path(encode_job['output_path']).name
+        })
+
+    def aguardar(self):
+        """
+        Aguarda todas as codificações pendentes e registra falhas no cenário de origem
+
+        Returns:
+            Lista de dicts {'cenario', 'localizacao', 'arquivo', 'sucesso', 'erro', 'resultado'}
+        """
+        if not self.pendentes:
+            return []
+
+        print(f"[VIDEO] Aguardando {len(self.pendentes)} codificação(ões) em segundo plano...")
+        inicio = time.perf_counter()
+        resultados = []
+
+        for pendente in self.pendentes:
+            resultado = {
+                'cenario': pendente['cenario'],
+                'localizacao': pendente['localizacao'],
+                'arquivo': pendente['arquivo'],
+                'sucesso': False,
+                'erro': None,
+                'resultado': None
+            }
+            try:
+                resultado['resultado'] = pendente['futuro'].result()
+                resultado['sucesso'] = True
+                self.videos_codificados += 1
+                self.tempo_codificacao += resultado['resultado']['codificacao_s']
+            except Exception as erro:
+                resultado['erro'] = str(erro) or erro.__class__.__name__
+                self.videos_com_erro += 1
+                print(f"[VIDEO] ERRO ao codificar vídeo do cenário '{pendente['cenario']}': {resultado['erro']}")
+            resultados.append(resultado)
+
+        self.pendentes = []
+        self.tempo_espera += time.perf_counter() - inicio
+        print(
+            f"[VIDEO] {self.videos_codificados} vídeo(s) codificado(s) em segundo plano "
+            f"({self.tempo_codificacao:.1f}s de codificação, {self.tempo_espera:.1f}s de espera no final)"
+        )
+        return resultados
+
+    def encerrar(self):
+        """Aguarda as codificações pendentes e encerra o pool de processos"""
+        resultados = self.aguardar()
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        return resultados
+
+    def obter_estatisticas(self):
+        """
+        Retorna as estatísticas da codificação em segundo plano
+
+        Returns:
+            Dict com vídeos codificados, erros e tempos
+        """
+        return {
+            'videos_codificados': self.videos_codificados,
+            'videos_com_erro': self.videos_com_erro,
+            'tempo_codificacao_segundos': round(self.tempo_codificacao, 2),
+            'tempo_espera_final_segundos': round(self.tempo_espera, 2)
+        }
@@ -0,0 +1,62 @@
+"""
+Executa o Behave sem os formatadores do behave.ini.
+
+O behave.ini define 'pretty' (saída padrão) e 'json.pretty' em reports/results.json; no Behave
+os -f/-o da linha de comando são somados aos do arquivo de configuração em vez de substituí-los.
+Processos que rodam em paralelo (run_parallel.py) ou que não devem sobrescrever o resultado da
+última execução (benchmark_video.py) usam este módulo: as demais opções do behave.ini (paths,
+lang, ...) continuam valendo e só os formatadores passados na linha de comando são usados.
+
+Uso:
+    python -m recursos.utils.executor_behave -f json.pretty -o worker/results.json -f plain features
+"""
+import sys
+
+from behave.__main__ import run_behave
+from behave.configuration import Configuration, load_configuration
+from behave.exception import ConfigError, TagExpressionError
+
+
+OPCOES_DE_FORMATADORES = ('format', 'outfiles')
+
+
+def montar_comando_behave(argumentos_behave):
+    """
+    Monta o comando que executa o Behave sem os formatadores do behave.ini
+
+    Args:
+        argumentos_behave: Argumentos do Behave (formatadores, tags, caminhos)
+
+    Returns:
+        Lista para subprocess
+    """
+    return [sys.executable, '-m', 'recursos.utils.executor_behave', *argumentos_behave]
+
+
+def main(argumentos=None):
+    """
+    Executa o Behave com as configurações do behave.ini, exceto format/outfiles
+
+    Args:
+        argumentos: Argumentos do Behave (padrão: sys.argv[1:])
+
+    Returns:
+        Código de saída do Behave
+    """
+    padroes = {}
+    load_configuration(padroes)
+    for opcao in OPCOES_DE_FORMATADORES:
+        padroes.pop(opcao, None)
+
+    try:
+        configuracao = Configuration(argumentos, load_config=False, **padroes)
+        return run_behave(configuracao)
+    except ConfigError as erro:
+        print(f"ConfigError: {erro}")
+    except TagExpressionError as erro:
+        print(f"TagExpressionError: {erro}")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -34,6 +34,10 @@ class GerenciadorDeConfiguracao:
         """Valida se configurações obrigatórias estão presentes"""
         configuracoes_obrigatorias = ['URL_BASE_SISTEMA']
         
+        # Com o Portal local a URL base é gerada automaticamente
+        if self.portal_local_ativo:
+            configuracoes_obrigatorias.remove('URL_BASE_SISTEMA')
+        
         for config in configuracoes_obrigatorias:
             if not self._obter_valor(config):
                 raise ValueError(
@@ -84,9 +88,25 @@ class GerenciadorDeConfiguracao:
         except ValueError:
             return valor_padrao
     
+    def _obter_lista(self, chave, valor_padrao=''):
+        """
+        Obtém uma lista de valores separados por vírgula
+        
+        Args:
+            chave: Nome da variável de ambiente
+            valor_padrao: Valor padrão (texto separado por vírgula)
+            
+        Returns:
+            Lista de strings sem espaços e sem itens vazios
+        """
+        valor = self._obter_valor(chave, valor_padrao) or ''
+        return [item.strip() for item in valor.split(',') if item.strip()]
+    
     @property
     def url_base_sistema(self):
-        """URL base do sistema sendo testado"""
+        """URL base do sistema sendo testado (Portal local quando PORTAL_LOCAL_ATIVO=true)"""
+        if self.portal_local_ativo:
+            return f'http://127.0.0.1:{self.portal_local_porta}'
         return self._obter_valor(
             'URL_BASE_SISTEMA',
             'https://sistemacreditogestaowebteste.hml.cloud.poupex'
@@ -116,6 +136,26 @@ class GerenciadorDeConfiguracao:
             f'{self.url_base_sistema}/api'
         )
     
+    @property
+    def portal_local_ativo(self):
+        """Se deve subir o Portal local e apontar a URL base para ele"""
+        return self._obter_booleano('PORTAL_LOCAL_ATIVO', False)
+    
+    @property
+    def portal_local_porta(self):
+        """Porta do Portal local"""
+        return self._obter_inteiro('PORTAL_LOCAL_PORTA', 5180)
+    
+    @property
+    def portal_local_latencia_ms(self):
+        """Latência artificial aplicada a cada resposta do Portal local (milissegundos)"""
+        return self._obter_inteiro('PORTAL_LOCAL_LATENCIA_MS', 0)
+    
+    @property
+    def portal_local_tamanho_kb(self):
+        """Bytes extras (KB) adicionados a cada página e resposta da API do Portal local"""
+        return self._obter_inteiro('PORTAL_LOCAL_TAMANHO_KB', 0)
+    
     @property
     def tipo_navegador(self):
         """Tipo de navegador a ser usado (chrome, firefox, edge)"""
@@ -141,6 +181,55 @@ class GerenciadorDeConfiguracao:
         """Altura da janela do navegador"""
         return self._obter_inteiro('NAVEGADOR_ALTURA', 1080)
     
+    @property
+    def navegador_estrategia_carregamento(self):
+        """Estratégia de carregamento de página do WebDriver: 'normal', 'eager' ou 'none'"""
+        return self._obter_valor('NAVEGADOR_ESTRATEGIA_CARREGAMENTO', 'normal').lower()
+    
+    @property
+    def navegador_pool_ativo(self):
+        """Se deve reaproveitar sessões do navegador entre cenários (pool de sessões)"""
+        return self._obter_booleano('NAVEGADOR_POOL_ATIVO', False)
+    
+    @property
+    def navegador_pool_max_cenarios(self):
+        """Quantidade de cenários executados por sessão antes de reciclar o navegador"""
+        return self._obter_inteiro('NAVEGADOR_POOL_MAX_CENARIOS', 25)
+    
+    @property
+    def navegador_pre_aquecimento(self):
+        """Se deve abrir o navegador do próximo cenário em segundo plano (ignorado com o pool ativo)"""
+        return self._obter_booleano('NAVEGADOR_PRE_AQUECIMENTO', False)
+    
+    @property
+    def navegador_perfil_leve(self):
+        """Se deve usar o perfil leve (bloqueio de recursos e sem tarefas de segundo plano)"""
+        return self._obter_booleano('NAVEGADOR_PERFIL_LEVE', False)
+    
+    @property
+    def navegador_bloquear_urls(self):
+        """Padrões de URL bloqueados no perfil leve (curinga '*')"""
+        return self._obter_lista(
+            'NAVEGADOR_BLOQUEAR_URLS',
+            '*google-analytics.com*,*googletagmanager.com*,*doubleclick.net*,'
+            '*hotjar.com*,*facebook.net*,*fonts.googleapis.com*'
+        )
+    
+    @property
+    def navegador_bloquear_tipos(self):
+        """Tipos de recurso bloqueados no perfil leve (Image, Font, Media)"""
+        return [tipo.lower() for tipo in self._obter_lista('NAVEGADOR_BLOQUEAR_TIPOS', 'Image,Font,Media')]
+    
+    @property
+    def navegador_driver_caminho(self):
+        """Caminho explícito do executável do driver (chromedriver, geckodriver, msedgedriver)"""
+        return self._obter_valor('NAVEGADOR_DRIVER_CAMINHO', '')
+    
+    @property
+    def arquivo_cache_drivers(self):
+        """Arquivo JSON com o mapeamento versão do navegador -> caminho do driver"""
+        return Path(self._obter_valor('NAVEGADOR_DRIVER_CACHE', './.cache/drivers.json'))
+    
     @property
     def timeout_implicito(self):
         """Timeout implícito do Selenium em segundos"""
@@ -181,6 +270,16 @@ class GerenciadorDeConfiguracao:
         """Diretório para arquivos de metadados"""
         return Path(self._obter_valor('DIRETORIO_METADADOS', './reports'))
     
+    @property
+    def video_ativo(self):
+        """Se os cenários são gravados (false desliga o gravador; usado pelo benchmark_video.py)"""
+        return self._obter_booleano('VIDEO_ATIVO', True)
+    
+    @property
+    def gravacao_modo_padrao(self):
+        """Evidência gravada dos cenários sem @gravacao_video/@gravacao_dom: 'video' (pixels) ou 'dom' (eventos do DOM)"""
+        return self._obter_valor('GRAVACAO_MODO_PADRAO', 'video').lower()
+    
     @property
     def gravar_video_sempre(self):
         """Se deve gravar vídeo de todos os cenários"""
@@ -191,11 +290,76 @@ class GerenciadorDeConfiguracao:
         """FPS (quadros por segundo) para gravação de vídeo"""
         return self._obter_inteiro('VIDEO_FPS', 15)
     
+    @property
+    def video_adaptativo(self):
+        """Se a captura varia entre VIDEO_FPS_MINIMO (página parada) e VIDEO_FPS_MAXIMO (atividade)"""
+        return self._obter_booleano('VIDEO_ADAPTATIVO', False)
+    
+    @property
+    def video_fps_minimo(self):
+        """Piso da captura adaptativa (FPS com a página parada)"""
+        return max(1, self._obter_inteiro('VIDEO_FPS_MINIMO', 2))
+    
+    @property
+    def video_fps_maximo(self):
+        """Teto da captura adaptativa e FPS do arquivo de vídeo (padrão: VIDEO_FPS)"""
+        return self._obter_inteiro('VIDEO_FPS_MAXIMO', 0) or self.video_fps
+    
     @property
     def video_qualidade(self):
-        """Qualidade do vídeo (1-10)"""
+        """Qualidade do vídeo (1-10): resolução, interpolação e qualidade JPEG dos frames (ver VideoRecorder.QUALITY_TIERS)"""
         return self._obter_inteiro('VIDEO_QUALIDADE', 7)
     
+    @property
+    def video_modo(self):
+        """Modo de gravação: 'streaming' (grava durante o cenário), 'memoria' (grava ao final), 'caixa_preta' ou 'comprimido'"""
+        return self._obter_valor('VIDEO_MODO', 'streaming').lower()
+    
+    @property
+    def video_fila_frames(self):
+        """Máximo de frames aguardando escrita no modo streaming (limita a memória)"""
+        return self._obter_inteiro('VIDEO_FILA_FRAMES', 30)
+    
+    @property
+    def video_caixa_preta_segundos(self):
+        """Segundos finais do cenário mantidos no modo caixa_preta"""
+        return self._obter_inteiro('VIDEO_CAIXA_PRETA_SEGUNDOS', 10)
+    
+    @property
+    def video_captura(self):
+        """Backend de captura: 'auto', 'screencast' (DevTools, Chrome/Edge) ou 'screenshot'"""
+        return self._obter_valor('VIDEO_CAPTURA', 'auto').lower()
+    
+    @property
+    def video_canal_dedicado(self):
+        """Se os screenshots do vídeo usam um canal próprio: DevTools (Chrome/Edge) ou conexão HTTP com a sessão"""
+        return self._obter_booleano('VIDEO_CANAL_DEDICADO', True)
+    
+    @property
+    def video_formato(self):
+        """Formato do vídeo: 'auto' (mjpeg no streaming, webm nos demais modos), 'webm' (VP8), 'mjpeg' ou 'mp4'"""
+        return self._obter_valor('VIDEO_FORMATO', 'auto').lower()
+    
+    @property
+    def video_deduplicar(self):
+        """Se frames iguais ao anterior são guardados como repetição (sem cópia nem overlay; ainda são codificados)"""
+        return self._obter_booleano('VIDEO_DEDUPLICAR', True)
+    
+    @property
+    def video_compressao_qualidade(self):
+        """Qualidade JPEG (1-100) para recomprimir os frames no modo comprimido; 0 mantém os bytes do navegador"""
+        return self._obter_inteiro('VIDEO_COMPRESSAO_QUALIDADE', 0)
+    
+    @property
+    def video_codificacao_segundo_plano(self):
+        """Se os vídeos dos modos memoria/comprimido/caixa_preta são codificados em um pool de processos"""
+        return self._obter_booleano('VIDEO_CODIFICACAO_SEGUNDO_PLANO', True)
+    
+    @property
+    def video_codificacao_processos(self):
+        """Quantidade de processos do pool de codificação de vídeo"""
+        return max(1, self._obter_inteiro('VIDEO_CODIFICACAO_PROCESSOS', 1))
+    
     @property
     def screenshot_em_falhas(self):
         """Se deve capturar screenshot quando um passo falhar"""
@@ -256,6 +420,26 @@ class GerenciadorDeConfiguracao:
         """Se deve pausar a execução quando ocorrer um erro"""
         return self._obter_booleano('PAUSAR_EM_ERRO', False)
     
+    @property
+    def paralelo_workers(self):
+        """Quantidade de processos worker na execução paralela (run_parallel.py)"""
+        return self._obter_inteiro('PARALELO_WORKERS', 2)
+    
+    @property
+    def paralelo_granularidade(self):
+        """Unidade de distribuição entre workers: 'cenario' ou 'feature'"""
+        return self._obter_valor('PARALELO_GRANULARIDADE', 'cenario').lower()
+    
+    @property
+    def paralelo_logs(self):
+        """Destino da saída de cada worker: 'arquivo' (um log por worker) ou 'console'"""
+        return self._obter_valor('PARALELO_LOGS', 'arquivo').lower()
+    
+    @property
+    def paralelo_duracao_padrao(self):
+        """Duração estimada (segundos) de cenários sem histórico na divisão entre nós de CI"""
+        return self._obter_inteiro('PARALELO_DURACAO_PADRAO', 30)
+    
     def exibir_configuracoes(self):
         """Exibe um resumo das configurações carregadas (útil para debug)"""
         print("\n" + "="*60)
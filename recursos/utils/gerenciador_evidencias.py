@@ -1,8 +1,11 @@
 ﻿import os
 from datetime import datetime
 from pathlib import Path
+import time
 import unicodedata
 
+from recursos.utils.codificador_video import CodificadorDeVideoEmSegundoPlano
+
 
 class GerenciadorDeEvidencias:
     """
@@ -22,6 +25,14 @@ class GerenciadorDeEvidencias:
         self.gravador_video_atual = None
         self.nome_arquivo_video_atual = None
         self.nome_cenario_atual = None
+        self.metricas_ultimo_video = None
+        self.passos_video = []
+        self.gravador_dom_atual = None
+        self.metricas_ultima_gravacao_dom = None
+        
+        self.codificador_video = None
+        if configuracao.video_codificacao_segundo_plano:
+            self.codificador_video = CodificadorDeVideoEmSegundoPlano(configuracao)
     
     def preparar_diretorios(self):
         """Cria e limpa os diretórios de evidências antes da execução"""
@@ -189,6 +200,9 @@ class GerenciadorDeEvidencias:
             driver: Instância do WebDriver
             nome_cenario: Nome do cenário sendo testado
         """
+        if not self.configuracao.video_ativo:
+            return
+        
         try:
             from recursos.utils.gravador_video import VideoRecorder
             
@@ -202,27 +216,44 @@ class GerenciadorDeEvidencias:
             self.gravador_video_atual = VideoRecorder(
                 str(caminho_video),
                 driver=driver,
-                fps=self.configuracao.video_fps
+                fps=self.configuracao.video_fps_maximo if self.configuracao.video_adaptativo else self.configuracao.video_fps,
+                mode=self.configuracao.video_modo,
+                queue_size=self.configuracao.video_fila_frames,
+                buffer_seconds=self.configuracao.video_caixa_preta_segundos,
+                capture_backend=self.configuracao.video_captura,
+                deduplicate=self.configuracao.video_deduplicar,
+                compression_quality=self.configuracao.video_compressao_qualidade,
+                quality=self.configuracao.video_qualidade,
+                video_format=self.configuracao.video_formato,
+                dedicated_channel=self.configuracao.video_canal_dedicado,
+                adaptive=self.configuracao.video_adaptativo,
+                idle_fps=self.configuracao.video_fps_minimo
             )
+            # A extensão segue o encoder escolhido pelo gravador (.webm, .avi, .mp4)
+            self.nome_arquivo_video_atual = Path(self.gravador_video_atual.output_path).name
             self.gravador_video_atual.start_recording()
             self.nome_cenario_atual = nome_cenario
+            self.passos_video = []
             
             print(f"[VIDEO] Gravacao iniciada: {self.nome_arquivo_video_atual}")
         except Exception as erro:
             print(f"[VIDEO] Erro ao iniciar gravacao: {erro}")
             self.gravador_video_atual = None
     
-    def finalizar_gravacao_video(self, cenario_falhou, tem_tag_video_always):
+    def finalizar_gravacao_video(self, cenario_falhou, tem_tag_video_always, localizacao_cenario=None):
         """
-        Finaliza a gravação de vídeo e decide se mantém ou descarta
+        Finaliza a gravação de vídeo e decide se mantém ou descarta.
+        Com VIDEO_CODIFICACAO_SEGUNDO_PLANO, o vídeo mantido é codificado no pool de processos.
         
         Args:
             cenario_falhou: Boolean indicando se o cenário falhou
             tem_tag_video_always: Boolean indicando se o cenário tem tag @video_always
+            localizacao_cenario: Location do cenário (associa falhas de codificação ao cenário)
             
         Returns:
             Nome do arquivo de vídeo se foi mantido, None caso contrário
         """
+        self.metricas_ultimo_video = None
         if not self.gravador_video_atual:
             return None
         
@@ -233,9 +264,28 @@ class GerenciadorDeEvidencias:
         )
         
         try:
-            self.gravador_video_atual.stop_recording(save=deve_manter_video)
+            video_gravado = self.gravador_video_atual.stop_recording(
+                save=deve_manter_video,
+                defer_encode=self.codificador_video is not None
+            )
+            if self.gravador_video_atual.encode_job:
+                self.codificador_video.enviar(
+                    self.gravador_video_atual.encode_job,
+                    self.nome_cenario_atual,
+                    localizacao_cenario
+                )
+            
+            # Saúde do gravador (FPS, latência, erros, memória) para os metadados do cenário
+            self.metricas_ultimo_video = self.gravador_video_atual.get_stats()
+            self.metricas_ultimo_video['mantido'] = bool(deve_manter_video and video_gravado)
+            
+            # Sem arquivo (falha ao salvar/codificar) não há capítulos nem vídeo para o relatório
+            if deve_manter_video and not video_gravado:
+                print(f"[VIDEO] Falha ao salvar o vídeo, nenhum arquivo gerado: {self.nome_arquivo_video_atual}")
+                return None
             
             if deve_manter_video:
+                self._salvar_capitulos_video()
                 motivo = self._obter_motivo_gravacao(cenario_falhou, tem_tag_video_always)
                 print(f"[VIDEO] Mantido ({motivo}): {self.nome_arquivo_video_atual}")
                 return self.nome_arquivo_video_atual
@@ -250,6 +300,215 @@ class GerenciadorDeEvidencias:
             self.gravador_video_atual = None
             self.nome_arquivo_video_atual = None
     
+    def obter_modo_gravacao(self, tags):
+        """
+        Define como o cenário é gravado: vídeo (pixels) ou eventos do DOM
+        
+        Args:
+            tags: Tags do cenário (incluindo as herdadas da feature)
+            
+        Returns:
+            'dom' ou 'video'
+        """
+        if 'gravacao_dom' in tags:
+            return 'dom'
+        if 'gravacao_video' in tags:
+            return 'video'
+        return 'dom' if self.configuracao.gravacao_modo_padrao == 'dom' else 'video'
+    
+    def iniciar_gravacao_dom(self, driver, nome_cenario):
+        """
+        Inicia a gravação dos eventos do DOM para um cenário (alternativa leve ao vídeo)
+        
+        Args:
+            driver: Instância do WebDriver
+            nome_cenario: Nome do cenário sendo testado
+        """
+        if not self.configuracao.video_ativo:
+            return
+        
+        try:
+            from recursos.utils.gravador_eventos_dom import GravadorDeEventosDom
+            
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            nome_cenario_normalizado = self._normalizar_para_ascii(nome_cenario)
+            nome_cenario_sanitizado = self._sanitizar_nome_arquivo(nome_cenario_normalizado)
+            caminho_replay = self.configuracao.diretorio_videos / f"replay_{timestamp}_{nome_cenario_sanitizado}.json.gz"
+            
+            self.gravador_dom_atual = GravadorDeEventosDom(driver, caminho_replay)
+            self.gravador_dom_atual.iniciar()
+            self.nome_cenario_atual = nome_cenario
+            self.passos_video = []
+            
+            print(f"[REPLAY] Gravacao dos eventos do DOM iniciada: {caminho_replay.name}")
+        except Exception as erro:
+            print(f"[REPLAY] Erro ao iniciar gravacao: {erro}")
+            self.gravador_dom_atual = None
+    
+    def finalizar_gravacao_dom(self, cenario_falhou, tem_tag_video_always):
+        """
+        Finaliza a gravação dos eventos do DOM e decide se mantém ou descarta
+        (mesma regra do vídeo: falha, @video_always ou GRAVAR_VIDEO_SEMPRE)
+        
+        Args:
+            cenario_falhou: Boolean indicando se o cenário falhou
+            tem_tag_video_always: Boolean indicando se o cenário tem tag @video_always
+            
+        Returns:
+            Nome do arquivo .json.gz se foi mantido, None caso contrário
+        """
+        self.metricas_ultima_gravacao_dom = None
+        if not self.gravador_dom_atual:
+            return None
+        
+        deve_manter = (
+            cenario_falhou or
+            tem_tag_video_always or
+            self.configuracao.gravar_video_sempre
+        )
+        
+        try:
+            self.metricas_ultima_gravacao_dom = self.gravador_dom_atual.finalizar(
+                salvar=deve_manter,
+                passos=self.passos_video
+            )
+            self.metricas_ultima_gravacao_dom['mantido'] = deve_manter
+            nome_arquivo = self.metricas_ultima_gravacao_dom['arquivo']
+            
+            if deve_manter:
+                motivo = self._obter_motivo_gravacao(cenario_falhou, tem_tag_video_always)
+                print(
+                    f"[REPLAY] Mantido ({motivo}): {nome_arquivo} - "
+                    f"{self.metricas_ultima_gravacao_dom['eventos']} eventos, "
+                    f"{self.metricas_ultima_gravacao_dom['arquivo_kb']:.1f} KB"
+                )
+                return nome_arquivo
+            print(f"[REPLAY] Descartado (cenario passou): {nome_arquivo}")
+            return None
+            
+        except Exception as erro:
+            print(f"[REPLAY] Erro ao finalizar gravacao: {erro}")
+            return None
+        finally:
+            self.gravador_dom_atual = None
+    
+    def _instante_gravacao(self):
+        """
+        Instante atual na linha do tempo da gravação em andamento
+        
+        Returns:
+            Segundos do relógio do vídeo, epoch na gravação do DOM ou None sem gravação
+        """
+        if self.gravador_video_atual:
+            return self.gravador_video_atual.get_timestamp()
+        if self.gravador_dom_atual:
+            return time.time()
+        return None
+    
+    def registrar_inicio_passo(self, nome_passo):
+        """
+        Marca o início de um passo na linha do tempo da gravação (vídeo ou eventos do DOM)
+        
+        Args:
+            nome_passo: Texto do passo (palavra-chave + nome)
+        """
+        instante = self._instante_gravacao()
+        if instante is None:
+            return
+        self.passos_video.append({
+            'nome': nome_passo,
+            'inicio': instante,
+            'fim': None,
+            'status': None
+        })
+    
+    def registrar_fim_passo(self, status_passo):
+        """
+        Marca o fim do passo em andamento na linha do tempo da gravação.
+        Na gravação do DOM também coleta os eventos acumulados na página.
+        
+        Args:
+            status_passo: Status do passo no Behave (passed, failed, ...)
+        """
+        if self.gravador_dom_atual:
+            self.gravador_dom_atual.sincronizar()
+        instante = self._instante_gravacao()
+        if instante is None or not self.passos_video or self.passos_video[-1]['fim'] is not None:
+            return
+        self.passos_video[-1]['fim'] = instante
+        self.passos_video[-1]['status'] = getattr(status_passo, 'name', str(status_passo))
+    
+    def _salvar_capitulos_video(self):
+        """
+        Grava os passos como capítulos WebVTT ao lado do vídeo (mesmo nome, extensão .vtt).
+        Os tempos são relativos ao primeiro frame do vídeo; passos fora do vídeo
+        (ex: antes dos últimos segundos da caixa-preta) são ignorados.
+        """
+        inicio_video = self.gravador_video_atual.get_video_start()
+        if inicio_video is None or not self.passos_video:
+            return
+        
+        linhas = ['WEBVTT', '']
+        for indice, passo in enumerate(self.passos_video, start=1):
+            fim_passo = passo['fim'] if passo['fim'] is not None else self.gravador_video_atual.get_timestamp()
+            inicio = max(passo['inicio'] - inicio_video, 0.0)
+            fim = fim_passo - inicio_video
+            if fim <= inicio:
+                continue
+            
+            # Identificador do cue: "<índice> <status>" (usado pelo relatório para colorir os marcadores)
+            linhas.append(f"{indice} {passo['status'] or 'undefined'}")
+            linhas.append(f"{self._formatar_tempo_vtt(inicio)} --> {self._formatar_tempo_vtt(fim)}")
+            # Texto do cue: & e < são marcação no WebVTT
+            linhas.append(passo['nome'].replace('&', '&amp;').replace('<', '&lt;').replace('-->', '--&gt;'))
+            linhas.append('')
+        
+        caminho_capitulos = Path(self.gravador_video_atual.output_path).with_suffix('.vtt')
+        try:
+            caminho_capitulos.write_text('\n'.join(linhas), encoding='utf-8')
+        except OSError as erro:
+            print(f"[VIDEO] Erro ao salvar capítulos dos passos: {erro}")
+    
+    def _formatar_tempo_vtt(self, segundos):
+        """
+        Formata segundos no padrão de tempo do WebVTT
+        
+        Args:
+            segundos: Tempo em segundos
+            
+        Returns:
+            String HH:MM:SS.mmm
+        """
+        milissegundos = int(round(segundos * 1000))
+        horas, milissegundos = divmod(milissegundos, 3600000)
+        minutos, milissegundos = divmod(milissegundos, 60000)
+        segundos_inteiros, milissegundos = divmod(milissegundos, 1000)
+        return f"{horas:02d}:{minutos:02d}:{segundos_inteiros:02d}.{milissegundos:03d}"
+    
+    def aguardar_codificacoes_video(self):
+        """
+        Aguarda os vídeos em codificação no pool de processos e encerra o pool.
+        Vídeos cuja codificação falhou são removidos (com os capítulos .vtt).
+        
+        Returns:
+            Lista de resultados por vídeo (ver CodificadorDeVideoEmSegundoPlano.aguardar)
+        """
+        if not self.codificador_video:
+            return []
+        
+        resultados = self.codificador_video.encerrar()
+        # Codificação com erro: remove o arquivo parcial e os capítulos para o relatório não apontar para eles
+        for resultado in resultados:
+            if not resultado['erro']:
+                continue
+            caminho_video = self.configuracao.diretorio_videos / resultado['arquivo']
+            for caminho in (caminho_video, caminho_video.with_suffix('.vtt')):
+                try:
+                    caminho.unlink(missing_ok=True)
+                except OSError as erro:
+                    print(f"[VIDEO] Erro ao remover vídeo não codificado {caminho.name}: {erro}")
+        return resultados
+    
     def _obter_motivo_gravacao(self, cenario_falhou, tem_tag_video_always):
         """
         Retorna o motivo pelo qual o vídeo foi mantido
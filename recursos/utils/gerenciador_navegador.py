@@ -1,10 +1,377 @@
-﻿from selenium import webdriver
+﻿import json
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.edge.service import Service as EdgeService
 from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.firefox import GeckoDriverManager
 from webdriver_manager.microsoft import EdgeChromiumDriverManager
+from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+
+
+# Contador de requisições fetch/XHR em andamento (idempotente: instala uma vez por documento).
+# Registrado via DevTools antes dos scripts da página no Chrome/Edge; no Firefox é injetado
+# sob demanda por PaginaBase.aguardar_rede_ociosa().
+SCRIPT_MONITOR_REQUISICOES = """
+(function () {
+    if (window.__monitorRequisicoes) { return; }
+    var monitor = window.__monitorRequisicoes = { pendentes: 0 };
+    var iniciar = function () { monitor.pendentes++; };
+    var concluir = function () { monitor.pendentes = Math.max(monitor.pendentes - 1, 0); };
+
+    if (window.fetch) {
+        var fetchOriginal = window.fetch;
+        window.fetch = function () {
+            iniciar();
+            return fetchOriginal.apply(this, arguments).then(
+                function (resposta) { concluir(); return resposta; },
+                function (erro) { concluir(); throw erro; }
+            );
+        };
+    }
+
+    var enviarOriginal = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        iniciar();
+        this.addEventListener('loadend', concluir, { once: true });
+        try {
+            return enviarOriginal.apply(this, arguments);
+        } catch (erro) {
+            concluir();
+            throw erro;
+        }
+    };
+})();
+"""
+
+
+class ResolvedorDeDriver:
+    """
+    Resolve o caminho do executável do WebDriver uma única vez por execução.
+    Ordem: caminho explícito (NAVEGADOR_DRIVER_CAMINHO) > memória > cache em disco
+    (versão do navegador -> caminho do driver) > webdriver-manager (rede).
+    Com o cache em disco aquecido a resolução funciona totalmente offline.
+    """
+    
+    _caminhos_resolvidos = {}
+    _estatisticas = {}
+    _trava = threading.Lock()
+    
+    _tipos_navegador_os = {
+        'chrome': ChromeType.GOOGLE,
+        'firefox': 'firefox',
+        'edge': ChromeType.MSEDGE
+    }
+    
+    _gerenciadores_driver = {
+        'chrome': ChromeDriverManager,
+        'firefox': GeckoDriverManager,
+        'edge': EdgeChromiumDriverManager
+    }
+    
+    def __init__(self, configuracao):
+        """
+        Inicializa o resolvedor de driver
+        
+        Args:
+            configuracao: Instância de GerenciadorDeConfiguracao
+        """
+        self.configuracao = configuracao
+        self.arquivo_cache = self.configuracao.arquivo_cache_drivers
+    
+    def resolver(self, tipo_navegador):
+        """
+        Retorna o caminho do driver para o navegador informado
+        
+        Args:
+            tipo_navegador: chrome, firefox ou edge
+            
+        Returns:
+            Caminho do executável do driver, ou None para deixar o Selenium Manager resolver
+        """
+        with self._trava:
+            inicio = time.perf_counter()
+            
+            if tipo_navegador in self._caminhos_resolvidos:
+                caminho, origem = self._caminhos_resolvidos[tipo_navegador], 'memoria'
+            else:
+                caminho, origem = self._resolver_sem_memoria(tipo_navegador)
+                self._caminhos_resolvidos[tipo_navegador] = caminho
+            
+            self._registrar_resolucao(tipo_navegador, origem, time.perf_counter() - inicio)
+            return caminho
+    
+    def _resolver_sem_memoria(self, tipo_navegador):
+        """
+        Resolve o driver consultando variável de ambiente, cache em disco e rede
+        
+        Returns:
+            Tupla (caminho do driver ou None, origem da resolução)
+        """
+        caminho_explicito = self.configuracao.navegador_driver_caminho
+        if caminho_explicito:
+            if Path(caminho_explicito).exists():
+                print(f"[DRIVER] Usando driver explícito: {caminho_explicito}")
+                return caminho_explicito, 'ambiente'
+            print(f"[DRIVER] NAVEGADOR_DRIVER_CAMINHO não encontrado: {caminho_explicito}")
+        
+        versao_navegador = self._detectar_versao_navegador(tipo_navegador)
+        chave_cache = f"{tipo_navegador}:{versao_navegador or 'desconhecida'}"
+        cache = self._ler_cache()
+        
+        caminho_cache = cache.get(chave_cache, {}).get('caminho')
+        if caminho_cache and Path(caminho_cache).exists():
+            print(f"[DRIVER] Driver em cache ({chave_cache}): {caminho_cache}")
+            return caminho_cache, 'cache_disco'
+        
+        try:
+            caminho = self._gerenciadores_driver[tipo_navegador]().install()
+            cache[chave_cache] = {
+                'caminho': caminho,
+                'resolvido_em': datetime.now().isoformat()
+            }
+            self._salvar_cache({chave_cache: cache[chave_cache]})
+            print(f"[DRIVER] Driver instalado via webdriver-manager ({chave_cache}): {caminho}")
+            return caminho, 'rede'
+            
+        except Exception as erro:
+            print(f"[DRIVER] Erro ao baixar driver: {erro}")
+        
+        # Offline e sem driver para esta versão: usa o último driver conhecido do navegador
+        candidatos = sorted(
+            (
+                dados for chave, dados in cache.items()
+                if chave.startswith(f"{tipo_navegador}:") and Path(dados.get('caminho', '')).exists()
+            ),
+            key=lambda dados: dados.get('resolvido_em', ''),
+            reverse=True
+        )
+        if candidatos:
+            print(f"[DRIVER] Usando último driver conhecido (offline): {candidatos[0]['caminho']}")
+            return candidatos[0]['caminho'], 'cache_disco_fallback'
+        
+        print("[DRIVER] Nenhum driver disponível, delegando ao Selenium Manager")
+        return None, 'selenium_manager'
+    
+    def _detectar_versao_navegador(self, tipo_navegador):
+        """Detecta a versão do navegador instalado (sem acesso à rede)"""
+        try:
+            return OperationSystemManager().get_browser_version_from_os(
+                self._tipos_navegador_os.get(tipo_navegador)
+            )
+        except Exception:
+            return None
+    
+    def _ler_cache(self):
+        """Lê o mapeamento versão do navegador -> caminho do driver salvo em disco"""
+        try:
+            if self.arquivo_cache.exists():
+                with open(self.arquivo_cache, 'r', encoding='utf-8') as arquivo:
+                    return json.load(arquivo)
+        except Exception as erro:
+            print(f"[DRIVER] Cache de drivers inválido, ignorando: {erro}")
+        return {}
+    
+    def _salvar_cache(self, novas_entradas):
+        """
+        Grava entradas no mapeamento versão do navegador -> caminho do driver em disco.
+        Os workers do run_parallel.py resolvem drivers ao mesmo tempo: o arquivo é relido e mesclado
+        (sem apagar o que outro worker gravou) e substituído de uma vez (os.replace de um temporário),
+        para que nenhum processo leia um JSON pela metade.
+        
+        Args:
+            novas_entradas: Dict chave do cache -> {'caminho', 'resolvido_em'}
+        """
+        caminho_temporario = None
+        try:
+            self.arquivo_cache.parent.mkdir(parents=True, exist_ok=True)
+            cache = self._ler_cache()
+            cache.update(novas_entradas)
+            with tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', dir=self.arquivo_cache.parent,
+                prefix=f'.{self.arquivo_cache.name}.', suffix='.tmp', delete=False
+            ) as arquivo:
+                caminho_temporario = arquivo.name
+                json.dump(cache, arquivo, indent=2, ensure_ascii=False)
+            os.replace(caminho_temporario, self.arquivo_cache)
+        except Exception as erro:
+            print(f"[DRIVER] Erro ao salvar cache de drivers: {erro}")
+            if caminho_temporario and os.path.exists(caminho_temporario):
+                os.remove(caminho_temporario)
+    
+    def _registrar_resolucao(self, tipo_navegador, origem, duracao):
+        """Acumula o tempo gasto resolvendo o driver para os metadados da execução"""
+        estatisticas = self._estatisticas.setdefault(tipo_navegador, {
+            'resolucoes': 0,
+            'tempo_total_segundos': 0.0,
+            'primeira_resolucao_segundos': round(duracao, 4),
+            'origem': origem
+        })
+        estatisticas['resolucoes'] += 1
+        estatisticas['tempo_total_segundos'] = round(estatisticas['tempo_total_segundos'] + duracao, 4)
+    
+    @classmethod
+    def obter_estatisticas(cls):
+        """
+        Retorna o tempo de resolução de driver acumulado na execução
+        
+        Returns:
+            Dict por tipo de navegador com quantidade, tempo total, tempo da primeira resolução e origem
+        """
+        with cls._trava:
+            return {tipo: dict(dados) for tipo, dados in cls._estatisticas.items()}
+
+
+class BloqueadorDeTiposDeRecurso:
+    """
+    Bloqueia tipos de recurso pelo tipo que o próprio Chrome/Edge atribui à requisição
+    (Fetch.enable com resourceType), por uma conexão WebSocket própria com o DevTools da aba.
+    As requisições são pausadas no estágio de resposta e falhadas logo após os cabeçalhos:
+    o corpo não é baixado e o Content-Length entra nos bytes economizados.
+    """
+    
+    # Capability com o endereço do DevTools em cada navegador Chromium
+    CAPABILITIES_DEBUGGER = ('goog:chromeOptions', 'ms:edgeOptions')
+    
+    # NAVEGADOR_BLOQUEAR_TIPOS (minúsculo) -> Network.ResourceType do DevTools
+    TIPOS_DEVTOOLS = {
+        'image': 'Image',
+        'font': 'Font',
+        'media': 'Media',
+        'stylesheet': 'Stylesheet',
+        'texttrack': 'TextTrack',
+        'manifest': 'Manifest',
+        'ping': 'Ping'
+    }
+    
+    def __init__(self, driver, tipos):
+        """
+        Args:
+            driver: WebDriver do Chrome/Edge
+            tipos: Tipos de recurso em minúsculo (navegador_bloquear_tipos)
+        """
+        self.driver = driver
+        self.tipos = [self.TIPOS_DEVTOOLS[tipo] for tipo in tipos if tipo in self.TIPOS_DEVTOOLS]
+        self.conexao = None
+        self.thread_recepcao = None
+        self.ativo = False
+        self.trava = threading.Lock()
+        # As falhas saem da thread de recepção e Fetch.enable/disable da thread do cenário
+        self.trava_envio = threading.Lock()
+        self.id_mensagem = 0
+        self.bytes_economizados = 0
+    
+    @classmethod
+    def endereco_devtools(cls, driver):
+        """Endereço host:porta do DevTools informado nas capabilities do driver (ou None)"""
+        capabilities = getattr(driver, 'capabilities', None) or {}
+        for chave in cls.CAPABILITIES_DEBUGGER:
+            endereco = (capabilities.get(chave) or {}).get('debuggerAddress')
+            if endereco:
+                return endereco
+        return None
+    
+    def iniciar(self):
+        """Conecta ao DevTools da aba controlada pelo driver e ativa a interceptação dos tipos"""
+        import websocket
+        
+        endereco = self.endereco_devtools(self.driver)
+        if not endereco:
+            raise RuntimeError("driver não informa o endereço do DevTools")
+        with urllib.request.urlopen(f"http://{endereco}/json", timeout=5) as resposta:
+            alvos = json.loads(resposta.read().decode('utf-8'))
+        
+        # No ChromeDriver o handle da janela é o id do alvo do DevTools
+        handle = self.driver.current_window_handle
+        paginas = [alvo for alvo in alvos if alvo.get('type') == 'page']
+        alvo = next((pagina for pagina in paginas if pagina.get('id') == handle), None) or paginas[0]
+        
+        # suppress_origin: o Chrome recusa conexões WebSocket com Origin não autorizado
+        self.conexao = websocket.create_connection(
+            alvo['webSocketDebuggerUrl'], timeout=5, suppress_origin=True
+        )
+        self.conexao.settimeout(0.5)
+        self._enviar('Fetch.enable', {'patterns': [
+            {'urlPattern': '*', 'resourceType': tipo, 'requestStage': 'Response'} for tipo in self.tipos
+        ]})
+        
+        self.ativo = True
+        self.thread_recepcao = threading.Thread(target=self._receber, daemon=True)
+        self.thread_recepcao.start()
+    
+    def _enviar(self, metodo, parametros=None):
+        """Envia um comando ao DevTools sem aguardar a resposta"""
+        with self.trava_envio:
+            self.id_mensagem += 1
+            self.conexao.send(json.dumps({'id': self.id_mensagem, 'method': metodo, 'params': parametros or {}}))
+    
+    def _receber(self):
+        """Falha cada requisição pausada (ela fica parada até esta conexão responder)"""
+        import websocket
+        
+        while self.ativo:
+            try:
+                mensagem = json.loads(self.conexao.recv())
+            except websocket.WebSocketTimeoutException:
+                continue
+            except Exception:
+                break
+            
+            if mensagem.get('method') != 'Fetch.requestPaused':
+                continue
+            
+            parametros = mensagem['params']
+            try:
+                self._enviar('Fetch.failRequest', {
+                    'requestId': parametros['requestId'], 'errorReason': 'BlockedByClient'
+                })
+            except Exception:
+                break
+            
+            tamanho = next(
+                (cabecalho.get('value') for cabecalho in parametros.get('responseHeaders') or []
+                 if cabecalho.get('name', '').lower() == 'content-length'),
+                None
+            )
+            if tamanho and tamanho.isdigit():
+                with self.trava:
+                    self.bytes_economizados += int(tamanho)
+    
+    def coletar_bytes_economizados(self):
+        """
+        Devolve e zera os bytes economizados desde a última coleta
+        
+        Returns:
+            Soma do Content-Length das respostas bloqueadas (sem Content-Length não entram)
+        """
+        with self.trava:
+            bytes_economizados, self.bytes_economizados = self.bytes_economizados, 0
+        return bytes_economizados
+    
+    def parar(self):
+        """Desativa a interceptação e fecha a conexão com o DevTools"""
+        self.ativo = False
+        if self.conexao is None:
+            return
+        try:
+            self._enviar('Fetch.disable')
+        except Exception:
+            pass
+        if self.thread_recepcao:
+            self.thread_recepcao.join(timeout=2)
+        try:
+            self.conexao.close()
+        except Exception:
+            pass
+        self.conexao = None
 
 
 class GerenciadorDeNavegador:
@@ -13,6 +380,47 @@ class GerenciadorDeNavegador:
     Suporta Chrome, Firefox e Edge com configurações centralizadas.
     """
     
+    # Argumentos do perfil leve para Chrome/Edge: evitam trabalho de inicialização e de segundo plano
+    ARGUMENTOS_PERFIL_LEVE_CHROMIUM = [
+        '--disable-background-networking',
+        '--disable-extensions',
+        '--disable-component-update',
+        '--disable-default-apps',
+        '--disable-sync',
+        '--disable-client-side-phishing-detection',
+        '--disable-features=Translate,OptimizationHints,MediaRouter',
+        '--metrics-recording-only',
+        '--no-first-run',
+        '--mute-audio'
+    ]
+    
+    # Preferências do perfil leve para Firefox (equivalentes aos argumentos do Chromium)
+    PREFERENCIAS_PERFIL_LEVE_FIREFOX = {
+        'app.update.auto': False,
+        'app.normandy.enabled': False,
+        'extensions.update.enabled': False,
+        'browser.safebrowsing.malware.enabled': False,
+        'browser.safebrowsing.phishing.enabled': False,
+        'datareporting.healthreport.uploadEnabled': False,
+        'datareporting.policy.dataSubmissionEnabled': False,
+        'toolkit.telemetry.enabled': False,
+        'network.prefetch-next': False,
+        'network.dns.disablePrefetch': True,
+        'browser.shell.checkDefaultBrowser': False
+    }
+    
+    # Padrões de URL por tipo de recurso: fallback quando o DevTools da aba não está acessível
+    # (ex.: Selenium Grid remoto); o bloqueio normal usa o tipo da requisição (BloqueadorDeTiposDeRecurso)
+    PADROES_POR_TIPO_RECURSO = {
+        'image': ['png', 'jpg', 'jpeg', 'gif', 'webp', 'svg', 'ico'],
+        'font': ['woff', 'woff2', 'ttf', 'otf', 'eot'],
+        'media': ['mp4', 'webm', 'mp3', 'ogg', 'wav']
+    }
+    
+    # Informações do navegador por (browserName, browserVersion), compartilhadas na execução
+    _informacoes_por_navegador = {}
+    _trava_informacoes = threading.Lock()
+    
     def __init__(self, configuracao):
         """
         Inicializa o gerenciador de navegador
@@ -23,6 +431,10 @@ class GerenciadorDeNavegador:
         self.configuracao = configuracao
         self.driver = None
         self.informacoes_navegador = {}
+        self.resolvedor_driver = ResolvedorDeDriver(configuracao)
+        self.tempo_inicializacao = 0.0
+        self.cenarios_executados = 0
+        self.bloqueador_tipos = None
     
     def inicializar_navegador(self):
         """
@@ -34,6 +446,7 @@ class GerenciadorDeNavegador:
         tipo_navegador = self.configuracao.tipo_navegador
         
         print(f"[NAVEGADOR] Inicializando navegador: {tipo_navegador}")
+        inicio = time.perf_counter()
         
         if tipo_navegador == 'chrome':
             self.driver = self._criar_chrome()
@@ -48,7 +461,13 @@ class GerenciadorDeNavegador:
             )
         
         self._aplicar_configuracoes_gerais()
-        self._coletar_informacoes_navegador()
+        self._aplicar_bloqueios_devtools()
+        self._registrar_monitor_requisicoes()
+        self.informacoes_navegador = {}
+        
+        self.tempo_inicializacao = time.perf_counter() - inicio
+        self.cenarios_executados = 0
+        print(f"[NAVEGADOR] Navegador pronto em {self.tempo_inicializacao:.2f}s")
         
         return self.driver
     
@@ -63,8 +482,10 @@ class GerenciadorDeNavegador:
         opcoes.add_argument('--disable-gpu')
         opcoes.add_argument('--no-sandbox')
         opcoes.add_argument('--disable-dev-shm-usage')
+        self._aplicar_estrategia_carregamento(opcoes)
+        self._aplicar_perfil_leve_chromium(opcoes)
         
-        servico = ChromeService(executable_path=ChromeDriverManager().install())
+        servico = ChromeService(executable_path=self.resolvedor_driver.resolver('chrome'))
         return webdriver.Chrome(service=servico, options=opcoes)
     
     def _criar_firefox(self):
@@ -75,7 +496,21 @@ class GerenciadorDeNavegador:
             opcoes.add_argument('--headless')
             print("[NAVEGADOR] Modo headless ativado")
         
-        servico = FirefoxService(executable_path=GeckoDriverManager().install())
+        self._aplicar_estrategia_carregamento(opcoes)
+        
+        if self.configuracao.navegador_perfil_leve:
+            for preferencia, valor in self.PREFERENCIAS_PERFIL_LEVE_FIREFOX.items():
+                opcoes.set_preference(preferencia, valor)
+            tipos_bloqueados = self.configuracao.navegador_bloquear_tipos
+            if 'image' in tipos_bloqueados:
+                opcoes.set_preference('permissions.default.image', 2)
+            if 'font' in tipos_bloqueados:
+                opcoes.set_preference('browser.display.use_document_fonts', 0)
+            if 'media' in tipos_bloqueados:
+                opcoes.set_preference('media.autoplay.default', 5)
+            print("[NAVEGADOR] Perfil leve ativado (Firefox: bloqueio por URL não suportado)")
+        
+        servico = FirefoxService(executable_path=self.resolvedor_driver.resolver('firefox'))
         return webdriver.Firefox(service=servico, options=opcoes)
     
     def _criar_edge(self):
@@ -86,9 +521,142 @@ class GerenciadorDeNavegador:
             opcoes.add_argument('--headless')
             print("[NAVEGADOR] Modo headless ativado")
         
-        servico = EdgeService(executable_path=EdgeChromiumDriverManager().install())
+        self._aplicar_estrategia_carregamento(opcoes)
+        self._aplicar_perfil_leve_chromium(opcoes)
+        
+        servico = EdgeService(executable_path=self.resolvedor_driver.resolver('edge'))
         return webdriver.Edge(service=servico, options=opcoes)
     
+    def _aplicar_estrategia_carregamento(self, opcoes):
+        """
+        Define o pageLoadStrategy (quando o driver.get() devolve o controle)
+        
+        Args:
+            opcoes: ChromeOptions, FirefoxOptions ou EdgeOptions
+        """
+        estrategia = self.configuracao.navegador_estrategia_carregamento
+        if estrategia not in ('normal', 'eager', 'none'):
+            print(f"[NAVEGADOR] Estratégia de carregamento '{estrategia}' inválida, usando 'normal'")
+            estrategia = 'normal'
+        
+        opcoes.page_load_strategy = estrategia
+        if estrategia != 'normal':
+            print(f"[NAVEGADOR] Estratégia de carregamento: {estrategia}")
+    
+    def _aplicar_perfil_leve_chromium(self, opcoes):
+        """
+        Aplica o perfil leve nas opções do Chrome/Edge
+        
+        Args:
+            opcoes: ChromeOptions ou EdgeOptions
+        """
+        if not self.configuracao.navegador_perfil_leve:
+            return
+        
+        for argumento in self.ARGUMENTOS_PERFIL_LEVE_CHROMIUM:
+            opcoes.add_argument(argumento)
+        
+        if 'image' in self.configuracao.navegador_bloquear_tipos:
+            opcoes.add_experimental_option(
+                'prefs', {'profile.managed_default_content_settings.images': 2}
+            )
+        
+        # Log de performance do DevTools: usado para medir requisições e bytes por cenário
+        # (o msedgedriver só lê a capability com o prefixo da Microsoft)
+        chave_logs = 'ms:loggingPrefs' if isinstance(opcoes, webdriver.EdgeOptions) else 'goog:loggingPrefs'
+        opcoes.set_capability(chave_logs, {'performance': 'ALL'})
+        print("[NAVEGADOR] Perfil leve ativado")
+    
+    def _aplicar_bloqueios_devtools(self):
+        """Bloqueia padrões de URL e tipos de recurso via DevTools (Chrome/Edge)"""
+        if not self.configuracao.navegador_perfil_leve or not hasattr(self.driver, 'execute_cdp_cmd'):
+            return
+        
+        padroes = list(self.configuracao.navegador_bloquear_urls)
+        tipos = self.configuracao.navegador_bloquear_tipos
+        if tipos:
+            self.bloqueador_tipos = BloqueadorDeTiposDeRecurso(self.driver, tipos)
+            try:
+                self.bloqueador_tipos.iniciar()
+                print(f"[NAVEGADOR] Tipos de recurso bloqueados via DevTools: {', '.join(self.bloqueador_tipos.tipos)}")
+            except Exception as erro:
+                self.bloqueador_tipos.parar()
+                self.bloqueador_tipos = None
+                print(f"[NAVEGADOR] Bloqueio por tipo indisponível ({erro}), usando extensões na URL")
+                for tipo in tipos:
+                    for extensao in self.PADROES_POR_TIPO_RECURSO.get(tipo, []):
+                        padroes.extend([f'*.{extensao}', f'*.{extensao}?*'])
+        
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': padroes})
+            print(f"[NAVEGADOR] {len(padroes)} padrão(ões) de URL bloqueado(s) via DevTools")
+        except Exception as erro:
+            print(f"[NAVEGADOR] Erro ao aplicar bloqueios via DevTools: {erro}")
+    
+    def _registrar_monitor_requisicoes(self):
+        """Instala o contador de fetch/XHR em todo documento novo, antes dos scripts da página (Chrome/Edge)"""
+        if not hasattr(self.driver, 'execute_cdp_cmd'):
+            return
+        
+        try:
+            self.driver.execute_cdp_cmd(
+                'Page.addScriptToEvaluateOnNewDocument',
+                {'source': SCRIPT_MONITOR_REQUISICOES}
+            )
+        except Exception as erro:
+            print(f"[NAVEGADOR] Erro ao registrar monitor de requisições: {erro}")
+    
+    def coletar_metricas_rede(self):
+        """
+        Lê o log de performance do DevTools acumulado desde a última coleta (perfil leve, Chrome/Edge)
+        
+        Returns:
+            Dict com requisições, requisições bloqueadas (total e por tipo), bytes transferidos e bytes
+            economizados pelo bloqueio por tipo (Content-Length), ou None se indisponível
+        """
+        if not self.configuracao.navegador_perfil_leve or not hasattr(self.driver, 'execute_cdp_cmd'):
+            return None
+        
+        try:
+            entradas = self.driver.get_log('performance')
+        except Exception as erro:
+            print(f"[NAVEGADOR] Log de performance indisponível: {erro}")
+            return None
+        
+        requisicoes = 0
+        requisicoes_bloqueadas = 0
+        bloqueadas_por_tipo = {}
+        bytes_transferidos = 0
+        for entrada in entradas:
+            try:
+                mensagem = json.loads(entrada['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            
+            metodo = mensagem.get('method')
+            parametros = mensagem.get('params', {})
+            if metodo == 'Network.requestWillBeSent':
+                requisicoes += 1
+            elif metodo == 'Network.loadingFailed' and (
+                parametros.get('blockedReason') or parametros.get('errorText') == 'net::ERR_BLOCKED_BY_CLIENT'
+            ):
+                # Padrões de URL (setBlockedURLs) e tipos de recurso (Fetch.failRequest)
+                requisicoes_bloqueadas += 1
+                tipo = parametros.get('type', 'Other')
+                bloqueadas_por_tipo[tipo] = bloqueadas_por_tipo.get(tipo, 0) + 1
+            elif metodo == 'Network.loadingFinished':
+                bytes_transferidos += int(parametros.get('encodedDataLength', 0))
+        
+        bytes_economizados = self.bloqueador_tipos.coletar_bytes_economizados() if self.bloqueador_tipos else 0
+        return {
+            'requisicoes': requisicoes,
+            'requisicoes_bloqueadas': requisicoes_bloqueadas,
+            'bloqueadas_por_tipo': bloqueadas_por_tipo,
+            'bytes_transferidos': bytes_transferidos,
+            'bytes_economizados': bytes_economizados
+        }
+    
     def _aplicar_configuracoes_gerais(self):
         """Aplica configurações gerais ao navegador"""
         if self.configuracao.navegador_headless:
@@ -120,18 +688,44 @@ class GerenciadorDeNavegador:
         print(f"[NAVEGADOR] Timeout de carregamento: {self.configuracao.timeout_carregamento_pagina}s")
     
     def _coletar_informacoes_navegador(self):
-        """Coleta informações sobre o navegador para o relatório"""
+        """
+        Coleta informações sobre o navegador para o relatório.
+        O resultado é reaproveitado para o mesmo navegador/versão durante a execução
+        e, quando precisa ser coletado, usa um único execute_script.
+        """
         try:
             capabilities = self.driver.capabilities
+            chave_cache = (
+                capabilities.get('browserName', self.configuracao.tipo_navegador),
+                capabilities.get('browserVersion', '')
+            )
+            
+            with self._trava_informacoes:
+                informacoes_em_cache = self._informacoes_por_navegador.get(chave_cache)
+            if informacoes_em_cache:
+                self.informacoes_navegador = dict(informacoes_em_cache)
+                return
+            
+            dados_pagina = self.driver.execute_script(
+                "return {"
+                "userAgent: navigator.userAgent,"
+                "resolucaoTela: screen.width + 'x' + screen.height,"
+                "tamanhoViewport: window.innerWidth + 'x' + window.innerHeight,"
+                "plataforma: navigator.platform"
+                "};"
+            ) or {}
+            
             self.informacoes_navegador = {
                 'navegador': capabilities.get('browserName', 'Desconhecido'),
                 'versao_navegador': capabilities.get('browserVersion', 'Desconhecida'),
                 'versao_driver': self._obter_versao_driver(capabilities),
-                'user_agent': self.driver.execute_script("return navigator.userAgent;"),
-                'resolucao_tela': self.driver.execute_script("return screen.width + 'x' + screen.height;"),
-                'tamanho_viewport': self.driver.execute_script("return window.innerWidth + 'x' + window.innerHeight;"),
-                'plataforma': self.driver.execute_script("return navigator.platform;")
+                'user_agent': dados_pagina.get('userAgent', 'Desconhecido'),
+                'resolucao_tela': dados_pagina.get('resolucaoTela', 'Desconhecida'),
+                'tamanho_viewport': dados_pagina.get('tamanhoViewport', 'Desconhecido'),
+                'plataforma': dados_pagina.get('plataforma', 'Desconhecida')
             }
+            with self._trava_informacoes:
+                self._informacoes_por_navegador[chave_cache] = dict(self.informacoes_navegador)
             
             print(f"[NAVEGADOR] {self.informacoes_navegador['navegador']} {self.informacoes_navegador['versao_navegador']}")
             print(f"[NAVEGADOR] Resolução: {self.informacoes_navegador['resolucao_tela']}")
@@ -165,15 +759,75 @@ class GerenciadorDeNavegador:
     
     def obter_informacoes(self):
         """
-        Retorna as informações coletadas sobre o navegador
+        Retorna as informações sobre o navegador, coletando-as na primeira chamada
         
         Returns:
             Dict com informações do navegador
         """
+        if not self.informacoes_navegador and self.driver:
+            self._coletar_informacoes_navegador()
         return self.informacoes_navegador
     
+    def sessao_ativa(self):
+        """
+        Verifica se a sessão do WebDriver ainda responde
+        
+        Returns:
+            True se o navegador está vivo, False se travou ou foi encerrado
+        """
+        if not self.driver:
+            return False
+        
+        try:
+            self.driver.current_window_handle
+            return True
+        except Exception:
+            return False
+    
+    def resetar_estado(self):
+        """
+        Limpa o estado da sessão para reaproveitar o navegador em outro cenário.
+        Fecha janelas extras, apaga cookies e storage, volta para about:blank
+        e reaplica tamanho de janela e timeouts.
+        
+        Returns:
+            True se a sessão foi resetada, False se precisa ser reciclada
+        """
+        if not self.driver:
+            return False
+        
+        try:
+            janelas = self.driver.window_handles
+            janela_principal = janelas[0]
+            for janela in janelas[1:]:
+                self.driver.switch_to.window(janela)
+                self.driver.close()
+            self.driver.switch_to.window(janela_principal)
+            
+            # Storage é por origem: precisa ser limpo antes de sair da página atual
+            self.driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            )
+            self.driver.delete_all_cookies()
+            if hasattr(self.driver, 'execute_cdp_cmd'):
+                # Chromium: remove cookies de todos os domínios, não só do atual
+                self.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            
+            self.driver.get('about:blank')
+            self._aplicar_configuracoes_gerais()
+            
+            print("[NAVEGADOR] Sessão resetada para reaproveitamento")
+            return True
+            
+        except Exception as erro:
+            print(f"[NAVEGADOR] Erro ao resetar sessão: {erro}")
+            return False
+    
     def fechar_navegador(self):
         """Fecha o navegador de forma segura"""
+        if self.bloqueador_tipos:
+            self.bloqueador_tipos.parar()
+            self.bloqueador_tipos = None
         if self.driver:
             try:
                 self.driver.quit()
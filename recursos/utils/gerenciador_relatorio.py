@@ -27,6 +27,8 @@ class GerenciadorDeRelatorio:
         self.informacoes_sistema = {}
         self.informacoes_ambiente_teste = {}
         self.informacoes_navegador = {}
+        self.metricas_desempenho = {}
+        self.metricas_cenarios = {}
     
     def registrar_inicio_execucao(self):
         """Registra o horário de início da execução dos testes"""
@@ -60,6 +62,27 @@ class GerenciadorDeRelatorio:
         """
         self.informacoes_navegador = informacoes_navegador
     
+    def registrar_metricas_desempenho(self, chave, metricas):
+        """
+        Armazena métricas de desempenho do framework (pool de navegadores, tempos, etc.)
+        
+        Args:
+            chave: Nome do grupo de métricas (ex: 'pool_navegadores')
+            metricas: Dict com as métricas do grupo
+        """
+        self.metricas_desempenho[chave] = metricas
+    
+    def registrar_metricas_cenario(self, localizacao_cenario, chave, metricas):
+        """
+        Armazena métricas de um cenário específico (requisições de rede, tempos, etc.)
+        
+        Args:
+            localizacao_cenario: Localização do cenário (ex: 'features/login.feature:12')
+            chave: Nome do grupo de métricas (ex: 'rede')
+            metricas: Dict com as métricas do grupo
+        """
+        self.metricas_cenarios.setdefault(str(localizacao_cenario), {})[chave] = metricas
+    
     def _coletar_informacoes_sistema(self):
         """Coleta informações sobre o sistema operacional e hardware"""
         try:
@@ -113,7 +136,9 @@ class GerenciadorDeRelatorio:
                 },
                 'sistema': self.informacoes_sistema,
                 'navegador': self.informacoes_navegador,
-                'ambiente_teste': self.informacoes_ambiente_teste
+                'ambiente_teste': self.informacoes_ambiente_teste,
+                'desempenho': self.metricas_desempenho,
+                'cenarios': self.metricas_cenarios
             }
             
             arquivo_metadados = self.configuracao.diretorio_metadados / 'metadata_temp.json'
@@ -0,0 +1,556 @@
+import gzip
+import json
+import time
+from pathlib import Path
+
+from recursos.utils.atividade_pagina import registrar_ouvinte_atividade, remover_ouvinte_atividade
+
+
+# Gravador injetado na página: um snapshot serializado do DOM e, depois, as mutações
+# (nós adicionados/removidos, atributos, textos) e os eventos de entrada (valores, cliques,
+# rolagem, viewport) com o instante de cada um. Scripts e atributos on* não são gravados e
+# campos de senha são mascarados. Os eventos ainda não coletados passam de uma página para a
+# próxima da mesma origem pelo sessionStorage.
+SCRIPT_GRAVADOR_EVENTOS_DOM = """
+(function () {
+    if (window.__gravadorEventosDom) { return; }
+    var CHAVE_PENDENTES = '__gravadorEventosDomPendentes';
+    var LIMITE_EVENTOS = 50000;
+    var ids = new WeakMap();
+    var proximoId = 1;
+    var gravador = window.__gravadorEventosDom = { eventos: [], truncado: false };
+
+    try {
+        var pendentes = window.sessionStorage.getItem(CHAVE_PENDENTES);
+        if (pendentes) {
+            gravador.eventos = JSON.parse(pendentes);
+            window.sessionStorage.removeItem(CHAVE_PENDENTES);
+        }
+    } catch (erro) { }
+
+    var registrar = function (evento) {
+        if (gravador.eventos.length >= LIMITE_EVENTOS) {
+            if (!gravador.truncado) {
+                gravador.truncado = true;
+                gravador.eventos.push({ tipo: 'truncado', t: Date.now() });
+            }
+            return;
+        }
+        evento.t = Date.now();
+        gravador.eventos.push(evento);
+    };
+
+    var idDo = function (no) {
+        if (!ids.has(no)) { ids.set(no, proximoId++); }
+        return ids.get(no);
+    };
+
+    var valorDoCampo = function (elemento) {
+        return elemento.type === 'password' ? elemento.value.replace(/./g, '*') : elemento.value;
+    };
+
+    var valorDoAtributo = function (elemento, nome, valor) {
+        if (valor === null) { return null; }
+        if ((nome === 'src' || nome === 'href') && valor) {
+            try { return new URL(valor, document.baseURI).href; } catch (erro) { return valor; }
+        }
+        if (nome === 'value' && elemento.type === 'password') { return valor.replace(/./g, '*'); }
+        return valor;
+    };
+
+    var regrasDaFolha = function (elemento) {
+        try {
+            return Array.prototype.map.call(elemento.sheet.cssRules, function (regra) {
+                return regra.cssText;
+            }).join('\\n');
+        } catch (erro) {
+            return null;
+        }
+    };
+
+    var serializar = function (no) {
+        if (no.nodeType === 3) {
+            return { id: idDo(no), texto: no.nodeValue };
+        }
+        if (no.nodeType !== 1) { return null; }
+
+        var tag = no.tagName.toLowerCase();
+        if (tag === 'script' || tag === 'noscript') { return null; }
+
+        // Folhas de estilo da mesma origem viram <style> (o relatório abre sem o servidor)
+        if (tag === 'link' && /stylesheet/i.test(no.rel || '')) {
+            var regras = regrasDaFolha(no);
+            if (regras !== null) {
+                return { id: idDo(no), tag: 'style', atributos: {}, filhos: [{ id: idDo(no.sheet), texto: regras }] };
+            }
+        }
+
+        var atributos = {};
+        Array.prototype.forEach.call(no.attributes, function (atributo) {
+            if (!/^on/i.test(atributo.name)) {
+                atributos[atributo.name] = valorDoAtributo(no, atributo.name, atributo.value);
+            }
+        });
+
+        var dado = { id: idDo(no), tag: tag, atributos: atributos, filhos: [] };
+        if (no.namespaceURI === 'http://www.w3.org/2000/svg') { dado.svg = true; }
+        if (tag === 'input' || tag === 'textarea' || tag === 'select') {
+            dado.valor = valorDoCampo(no);
+            if (no.type === 'checkbox' || no.type === 'radio') { dado.marcado = no.checked; }
+        }
+        Array.prototype.forEach.call(no.childNodes, function (filho) {
+            var serializado = serializar(filho);
+            if (serializado) { dado.filhos.push(serializado); }
+        });
+        return dado;
+    };
+
+    var proximoIrmaoConhecido = function (no) {
+        var irmao = no.nextSibling;
+        while (irmao && !ids.has(irmao)) { irmao = irmao.nextSibling; }
+        return irmao ? ids.get(irmao) : null;
+    };
+
+    var iniciar = function () {
+        registrar({
+            tipo: 'snapshot',
+            url: location.href,
+            titulo: document.title,
+            largura: window.innerWidth,
+            altura: window.innerHeight,
+            raiz: serializar(document.documentElement)
+        });
+
+        new MutationObserver(function (mutacoes) {
+            mutacoes.forEach(function (mutacao) {
+                var alvo = ids.get(mutacao.target);
+                if (!alvo) { return; }
+
+                if (mutacao.type === 'childList') {
+                    Array.prototype.forEach.call(mutacao.removedNodes, function (no) {
+                        if (ids.has(no)) { registrar({ tipo: 'remover', id: ids.get(no) }); }
+                    });
+                    Array.prototype.forEach.call(mutacao.addedNodes, function (no) {
+                        if (no.parentNode !== mutacao.target) { return; }
+                        var serializado = serializar(no);
+                        if (serializado) {
+                            registrar({ tipo: 'adicionar', pai: alvo, antes: proximoIrmaoConhecido(no), no: serializado });
+                        }
+                    });
+                } else if (mutacao.type === 'attributes') {
+                    if (/^on/i.test(mutacao.attributeName)) { return; }
+                    registrar({
+                        tipo: 'atributo',
+                        id: alvo,
+                        nome: mutacao.attributeName,
+                        valor: valorDoAtributo(mutacao.target, mutacao.attributeName,
+                                               mutacao.target.getAttribute(mutacao.attributeName))
+                    });
+                } else if (mutacao.type === 'characterData') {
+                    registrar({ tipo: 'texto', id: alvo, texto: mutacao.target.nodeValue });
+                }
+            });
+        }).observe(document, { childList: true, subtree: true, attributes: true, characterData: true });
+
+        var registrarValor = function (evento) {
+            var alvo = evento.target;
+            if (!ids.has(alvo) || !('value' in alvo)) { return; }
+            var dado = { tipo: 'valor', id: ids.get(alvo), valor: valorDoCampo(alvo) };
+            if (alvo.type === 'checkbox' || alvo.type === 'radio') { dado.marcado = alvo.checked; }
+            registrar(dado);
+        };
+        document.addEventListener('input', registrarValor, true);
+        document.addEventListener('change', registrarValor, true);
+
+        document.addEventListener('click', function (evento) {
+            registrar({ tipo: 'clique', id: ids.get(evento.target) || null, x: evento.clientX, y: evento.clientY });
+        }, true);
+
+        var ultimaRolagem = 0;
+        document.addEventListener('scroll', function (evento) {
+            var agora = Date.now();
+            if (agora - ultimaRolagem < 100) { return; }
+            ultimaRolagem = agora;
+            var elemento = evento.target === document ? document.documentElement : evento.target;
+            var pagina = elemento === document.documentElement;
+            registrar({
+                tipo: 'rolagem',
+                id: ids.get(elemento) || null,
+                x: pagina ? window.scrollX : elemento.scrollLeft,
+                y: pagina ? window.scrollY : elemento.scrollTop
+            });
+        }, true);
+
+        window.addEventListener('resize', function () {
+            registrar({ tipo: 'viewport', largura: window.innerWidth, altura: window.innerHeight });
+        });
+    };
+
+    // Eventos ainda não coletados seguem para a próxima página da mesma origem
+    window.addEventListener('pagehide', function () {
+        try {
+            if (gravador.eventos.length) {
+                window.sessionStorage.setItem(CHAVE_PENDENTES, JSON.stringify(gravador.eventos));
+            }
+        } catch (erro) { }
+    });
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', iniciar, { once: true });
+    } else {
+        iniciar();
+    }
+})();
+"""
+
+# Instala o gravador (se a página ainda não tem) e devolve os eventos acumulados desde a última coleta
+# Coleta enviada a cada sincronização: devolve os eventos acumulados desde a última coleta,
+# ou null se o documento ainda não tem o gravador (página nova sem a injeção pelo DevTools)
+SCRIPT_COLETA_EVENTOS_DOM = """
+var gravador = window.__gravadorEventosDom;
+if (!gravador) { return null; }
+var eventos = gravador.eventos;
+gravador.eventos = [];
+return eventos;
+"""
+
+# Instala o gravador e já coleta (uma vez por documento, só quando a coleta devolve null)
+SCRIPT_INSTALACAO_EVENTOS_DOM = SCRIPT_GRAVADOR_EVENTOS_DOM + SCRIPT_COLETA_EVENTOS_DOM
+
+# Player do relatório (generate_report.py): reconstrói o DOM em um iframe sem scripts e aplica
+# os eventos na linha do tempo. Os dados ficam embutidos no HTML em base64 (gzip) e só são
+# descompactados quando o usuário abre a reprodução.
+SCRIPT_REPRODUTOR_EVENTOS_DOM = """
+function ReprodutorDom(container) {
+    this.container = container;
+    this.iframe = container.querySelector('iframe');
+    this.tela = container.querySelector('.replay-tela');
+    this.cursor = container.querySelector('.replay-clique');
+    this.barra = container.querySelector('.replay-barra');
+    this.rotuloTempo = container.querySelector('.replay-tempo');
+    this.rotuloUrl = container.querySelector('.replay-url');
+    this.botaoTocar = container.querySelector('.replay-tocar');
+    this.velocidade = container.querySelector('.replay-velocidade');
+    this.pularInatividade = container.querySelector('.replay-pular');
+    this.tocando = false;
+    this.escala = 1;
+    var reprodutor = this;
+    this.botaoTocar.addEventListener('click', function () { reprodutor.alternar(); });
+    this.barra.addEventListener('input', function () { reprodutor.irPara(parseFloat(reprodutor.barra.value)); });
+}
+
+ReprodutorDom.prototype.carregar = async function (base64) {
+    var bytes = Uint8Array.from(atob(base64), function (caractere) { return caractere.charCodeAt(0); });
+    var fluxo = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+    var dados = JSON.parse(await new Response(fluxo).text());
+    this.eventos = dados.eventos.slice().sort(function (a, b) { return a.t - b.t; });
+    this.passos = dados.passos || [];
+    this.inicio = this.eventos.length ? this.eventos[0].t : 0;
+    this.duracao = this.eventos.length ? this.eventos[this.eventos.length - 1].t - this.inicio : 0;
+    this.barra.max = Math.max(this.duracao, 1);
+    this.indice = 0;
+    this.tempo = 0;
+    this._reiniciar();
+    this.irPara(0);
+    return this;
+};
+
+ReprodutorDom.prototype._reiniciar = function () {
+    var documento = this.iframe.contentDocument;
+    documento.open();
+    documento.write('<!DOCTYPE html><html><head></head><body></body></html>');
+    documento.close();
+    this.nos = new Map();
+    this.indice = 0;
+};
+
+ReprodutorDom.prototype._construir = function (dado, svg) {
+    var documento = this.iframe.contentDocument;
+    if ('texto' in dado) {
+        var texto = documento.createTextNode(dado.texto);
+        this.nos.set(dado.id, texto);
+        return texto;
+    }
+    var emSvg = svg || dado.svg;
+    var elemento = emSvg
+        ? documento.createElementNS('http://www.w3.org/2000/svg', dado.tag)
+        : documento.createElement(dado.tag);
+    Object.keys(dado.atributos).forEach(function (nome) {
+        try { elemento.setAttribute(nome, dado.atributos[nome]); } catch (erro) { }
+    });
+    var reprodutor = this;
+    dado.filhos.forEach(function (filho) { elemento.appendChild(reprodutor._construir(filho, emSvg)); });
+    if ('valor' in dado) { elemento.value = dado.valor; }
+    if ('marcado' in dado) { elemento.checked = dado.marcado; }
+    this.nos.set(dado.id, elemento);
+    return elemento;
+};
+
+ReprodutorDom.prototype._ajustarTela = function (largura, altura) {
+    var escala = Math.min(1, (this.tela.clientWidth || this.container.clientWidth) / largura);
+    this.iframe.style.width = largura + 'px';
+    this.iframe.style.height = altura + 'px';
+    this.iframe.style.transform = 'scale(' + escala + ')';
+    this.tela.style.height = (altura * escala) + 'px';
+    this.escala = escala;
+};
+
+ReprodutorDom.prototype._aplicar = function (evento) {
+    var documento = this.iframe.contentDocument;
+    var no = evento.id ? this.nos.get(evento.id) : null;
+    switch (evento.tipo) {
+        case 'snapshot':
+            this._reiniciar();
+            if (evento.raiz) {
+                documento.replaceChild(this._construir(evento.raiz, false), documento.documentElement);
+                // URLs relativas do CSS inline resolvem contra a página gravada
+                if (documento.head) {
+                    var base = documento.createElement('base');
+                    base.href = evento.url;
+                    documento.head.insertBefore(base, documento.head.firstChild);
+                }
+            }
+            this.rotuloUrl.textContent = evento.url;
+            this._ajustarTela(evento.largura, evento.altura);
+            break;
+        case 'adicionar':
+            var pai = this.nos.get(evento.pai);
+            if (!pai) { break; }
+            var anterior = this.nos.get(evento.no.id);
+            if (anterior && anterior.parentNode) { anterior.parentNode.removeChild(anterior); }
+            var antes = evento.antes ? this.nos.get(evento.antes) : null;
+            var emSvg = pai.namespaceURI === 'http://www.w3.org/2000/svg';
+            pai.insertBefore(this._construir(evento.no, emSvg), antes && antes.parentNode === pai ? antes : null);
+            break;
+        case 'remover':
+            if (no && no.parentNode) { no.parentNode.removeChild(no); }
+            break;
+        case 'atributo':
+            if (!no) { break; }
+            try {
+                if (evento.valor === null) { no.removeAttribute(evento.nome); } else { no.setAttribute(evento.nome, evento.valor); }
+            } catch (erro) { }
+            break;
+        case 'texto':
+            if (no) { no.nodeValue = evento.texto; }
+            break;
+        case 'valor':
+            if (!no) { break; }
+            no.value = evento.valor;
+            if ('marcado' in evento) { no.checked = evento.marcado; }
+            break;
+        case 'rolagem':
+            if (!no || no === documento.documentElement) {
+                this.iframe.contentWindow.scrollTo(evento.x, evento.y);
+            } else {
+                no.scrollLeft = evento.x;
+                no.scrollTop = evento.y;
+            }
+            break;
+        case 'viewport':
+            this._ajustarTela(evento.largura, evento.altura);
+            break;
+        case 'clique':
+            this.cursor.style.left = (evento.x * this.escala) + 'px';
+            this.cursor.style.top = (evento.y * this.escala) + 'px';
+            this.cursor.classList.remove('ativo');
+            void this.cursor.offsetWidth;
+            this.cursor.classList.add('ativo');
+            break;
+    }
+};
+
+ReprodutorDom.prototype.irPara = function (tempo) {
+    var alvo = this.inicio + tempo;
+    if (tempo < this.tempo) {
+        // Voltar: reconstrói a partir do último snapshot antes do instante
+        var snapshot = 0;
+        for (var i = 0; i < this.eventos.length && this.eventos[i].t <= alvo; i++) {
+            if (this.eventos[i].tipo === 'snapshot') { snapshot = i; }
+        }
+        this._reiniciar();
+        this.indice = snapshot;
+    }
+    while (this.indice < this.eventos.length && this.eventos[this.indice].t <= alvo) {
+        this._aplicar(this.eventos[this.indice]);
+        this.indice++;
+    }
+    this.tempo = tempo;
+    this.barra.value = tempo;
+    this.rotuloTempo.textContent = (tempo / 1000).toFixed(1) + 's / ' + (this.duracao / 1000).toFixed(1) + 's';
+};
+
+ReprodutorDom.prototype.alternar = function () {
+    if (this.tocando) {
+        this.tocando = false;
+        this.botaoTocar.textContent = '▶';
+        return;
+    }
+    if (this.tempo >= this.duracao) { this.irPara(0); }
+    this.tocando = true;
+    this.botaoTocar.textContent = '⏸';
+    var reprodutor = this;
+    var ultimoQuadro = performance.now();
+    var quadro = function (agora) {
+        if (!reprodutor.tocando) { return; }
+        var proximo = reprodutor.tempo + (agora - ultimoQuadro) * parseFloat(reprodutor.velocidade.value);
+        ultimoQuadro = agora;
+        // Pula períodos sem eventos (esperas) deixando meio segundo antes do próximo evento
+        var seguinte = reprodutor.eventos[reprodutor.indice];
+        if (reprodutor.pularInatividade.checked && seguinte && seguinte.t - reprodutor.inicio - proximo > 2000) {
+            proximo = seguinte.t - reprodutor.inicio - 500;
+        }
+        reprodutor.irPara(Math.min(proximo, reprodutor.duracao));
+        if (reprodutor.tempo >= reprodutor.duracao) {
+            reprodutor.alternar();
+            return;
+        }
+        requestAnimationFrame(quadro);
+    };
+    requestAnimationFrame(quadro);
+};
+
+async function abrirReproducaoDom(idContainer) {
+    var container = document.getElementById(idContainer);
+    if (!container.reprodutor) {
+        var dados = document.getElementById(idContainer + '_dados').textContent.trim();
+        container.querySelector('.replay-conteudo').style.display = 'block';
+        container.querySelector('.replay-abrir').style.display = 'none';
+        try {
+            container.reprodutor = await new ReprodutorDom(container).carregar(dados);
+        } catch (erro) {
+            container.querySelector('.replay-url').textContent = 'Não foi possível abrir a reprodução: ' + erro;
+            return;
+        }
+    }
+    return container.reprodutor;
+}
+
+function irParaPassoDom(idContainer, segundos) {
+    abrirReproducaoDom(idContainer).then(function (reprodutor) {
+        if (!reprodutor) { return; }
+        reprodutor.irPara(Math.max(0, segundos * 1000 - reprodutor.inicio));
+    });
+}
+"""
+
+
+class GravadorDeEventosDom:
+    """
+    Alternativa leve ao vídeo: grava o DOM da página e o que muda nele (mutações e eventos
+    de entrada) em vez de pixels. O stream de eventos é coletado do navegador nos pontos de
+    sincronização (fim de cada passo e antes de cada comando do PaginaBase) e salvo como JSON
+    compactado (gzip), reproduzido no relatório HTML.
+
+    No Chrome/Edge o gravador é injetado em cada documento novo pelo DevTools; nos demais
+    navegadores é reinstalado na próxima sincronização (eventos da mesma origem não coletados
+    antes de uma navegação seguem pelo sessionStorage).
+    """
+
+    def __init__(self, driver, caminho_saida):
+        """
+        Inicializa o gravador de eventos do DOM
+
+        Args:
+            driver: Instância do WebDriver
+            caminho_saida: Path do arquivo .json.gz
+        """
+        self.driver = driver
+        self.caminho_saida = Path(caminho_saida)
+        self.eventos = []
+        self.id_script_devtools = None
+        self.sincronizacoes = 0
+        self.instalacoes = 0
+        self.tempo_sincronizacao = 0.0
+        self.erros = 0
+        self.inicio = None
+        self.fim = None
+
+    def iniciar(self):
+        """Injeta o gravador na página atual (e nas próximas, pelo DevTools quando disponível)"""
+        self.inicio = time.time()
+        if hasattr(self.driver, 'execute_cdp_cmd'):
+            try:
+                resposta = self.driver.execute_cdp_cmd(
+                    'Page.addScriptToEvaluateOnNewDocument', {'source': SCRIPT_GRAVADOR_EVENTOS_DOM}
+                )
+                self.id_script_devtools = resposta.get('identifier')
+            except Exception as erro:
+                print(f"[REPLAY] Injeção pelo DevTools indisponível ({erro}), instalando em cada página nova na sincronização")
+
+        self.sincronizar()
+        registrar_ouvinte_atividade(self.driver, self._ao_detectar_atividade)
+
+    def _ao_detectar_atividade(self, origem):
+        """Antes de navegar/clicar/digitar: coleta os eventos da página atual e garante o gravador nela"""
+        self.sincronizar()
+
+    def sincronizar(self):
+        """
+        Coleta os eventos acumulados na página. A coleta é um script curto; o gravador completo
+        só é enviado quando o documento ainda não o tem (uma vez por página nova)
+        """
+        inicio = time.perf_counter()
+        try:
+            eventos = self.driver.execute_script(SCRIPT_COLETA_EVENTOS_DOM)
+            if eventos is None:
+                eventos = self.driver.execute_script(SCRIPT_INSTALACAO_EVENTOS_DOM)
+                self.instalacoes += 1
+            self.eventos.extend(eventos or [])
+        except Exception as erro:
+            self.erros += 1
+            print(f"[REPLAY] Erro ao coletar eventos do DOM: {erro}")
+        self.sincronizacoes += 1
+        self.tempo_sincronizacao += time.perf_counter() - inicio
+
+    def finalizar(self, salvar=True, passos=None):
+        """
+        Coleta os últimos eventos, remove o gravador e salva o stream
+
+        Args:
+            salvar: Se False, descarta os eventos
+            passos: Passos do cenário [{'nome', 'inicio', 'fim', 'status'}] com instantes epoch
+
+        Returns:
+            Dict com eventos, snapshots, tamanhos (KB) e custo das sincronizações
+        """
+        remover_ouvinte_atividade(self.driver, self._ao_detectar_atividade)
+        self.sincronizar()
+        self.fim = time.time()
+
+        if self.id_script_devtools:
+            try:
+                self.driver.execute_cdp_cmd(
+                    'Page.removeScriptToEvaluateOnNewDocument', {'identifier': self.id_script_devtools}
+                )
+            except Exception:
+                pass
+
+        metricas = {
+            'arquivo': self.caminho_saida.name,
+            'eventos': len(self.eventos),
+            'snapshots': sum(1 for evento in self.eventos if evento.get('tipo') == 'snapshot'),
+            'sincronizacoes': self.sincronizacoes,
+            'instalacoes': self.instalacoes,
+            'sincronizacao_ms': round(self.tempo_sincronizacao * 1000 / max(self.sincronizacoes, 1), 1),
+            'erros': self.erros,
+            'json_kb': 0.0,
+            'arquivo_kb': 0.0
+        }
+        if not salvar:
+            return metricas
+
+        conteudo = json.dumps({
+            'versao': 1,
+            'inicio': self.inicio,
+            'fim': self.fim,
+            'eventos': self.eventos,
+            'passos': passos or []
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.caminho_saida.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.caminho_saida, 'wb', compresslevel=6) as arquivo:
+            arquivo.write(conteudo)
+
+        metricas['json_kb'] = round(len(conteudo) / 1024, 1)
+        metricas['arquivo_kb'] = round(self.caminho_saida.stat().st_size / 1024, 1)
+        return metricas
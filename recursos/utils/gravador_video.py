@@ -56,11 +56,27 @@ import numpy as np
 import pyautogui
 from datetime import datetime
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import http.client
+import json
+import queue
+import tempfile
 import threading
 import time
+import urllib.parse
+import urllib.request
+
+from recursos.utils.atividade_pagina import registrar_ouvinte_atividade, remover_ouvinte_atividade
+from recursos.utils.perfilador_fases import calcular_percentil
 
 # Desabilita todos os níveis de log do OpenCV
-cv2.setLogLevel(0)  # 0 = Silent
+# (OpenCV 5 moveu setLogLevel para cv2.utils.logging)
+if hasattr(cv2, 'setLogLevel'):
+    cv2.setLogLevel(0)  # 0 = Silent
+else:
+    cv2.utils.logging.setLogLevel(cv2.utils.logging.LOG_LEVEL_SILENT)
 warnings.filterwarnings('ignore', category=UserWarning, module='cv2')
 
 
@@ -122,6 +138,646 @@ def _suprimir_stderr_contexto():
         return contextlib.nullcontext()
 
 
+# === ENCODERS DE VÍDEO ===
+# (fourcc, extensão) por formato, na ordem de preferência.
+# webm (VP8) toca direto no navegador e dispensa a conversão do generate_report.py;
+# mjpeg (Motion JPEG em AVI, o contêiner nativo do MJPG) e mp4 (mp4v) codificam rápido e são
+# convertidos para WebM ao gerar o relatório.
+VIDEO_FORMATS = {
+    'webm': (('VP80', '.webm'), ('MJPG', '.avi'), ('mp4v', '.mp4')),
+    'mjpeg': (('MJPG', '.avi'), ('mp4v', '.mp4'), ('VP80', '.webm')),
+    'mp4': (('mp4v', '.mp4'), ('MJPG', '.avi'), ('avc1', '.mp4'), ('H264', '.mp4')),
+}
+
+# Codecs que os navegadores reproduzem sem conversão (mesma lista do video_converter)
+WEB_COMPATIBLE_CODECS = ('VP80', 'VP90', 'avc1', 'H264')
+
+_encoders_testados = {}
+_encoders_lock = threading.Lock()
+
+
+def probe_video_encoders(candidates):
+    """
+    Testa quais encoders o OpenCV/FFmpeg deste processo consegue usar.
+    Cada (fourcc, extensão) é testado uma única vez por processo (grava e relê 2 frames
+    em um arquivo temporário); as chamadas seguintes usam o resultado em cache.
+    
+    Args:
+        candidates: Sequência de (fourcc, extensão) na ordem de preferência
+        
+    Returns:
+        list: Os candidatos que funcionaram, na mesma ordem
+    """
+    with _encoders_lock:
+        pendentes = [candidate for candidate in candidates if candidate not in _encoders_testados]
+        if pendentes:
+            with tempfile.TemporaryDirectory(prefix='encoders_video_') as diretorio:
+                with _suprimir_stderr_contexto():
+                    for fourcc_str, ext in pendentes:
+                        _encoders_testados[(fourcc_str, ext)] = _probe_encoder(
+                            Path(diretorio) / f"teste_{fourcc_str}{ext}", fourcc_str
+                        )
+            disponiveis = [f"{fourcc_str} ({ext})" for (fourcc_str, ext), ok in _encoders_testados.items() if ok]
+            print(f"[VIDEO] Encoders disponíveis: {', '.join(disponiveis) or 'nenhum'}")
+        
+        return [candidate for candidate in candidates if _encoders_testados[candidate]]
+
+
+def _probe_encoder(path, fourcc_str):
+    """Grava 2 frames pequenos com o fourcc e confirma que o arquivo é legível"""
+    out = None
+    try:
+        out = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*fourcc_str), 15, (64, 64))
+        if not out.isOpened():
+            return False
+        for value in (0, 255):
+            out.write(np.full((64, 64, 3), value, dtype=np.uint8))
+        out.release()
+        out = None
+        
+        if not path.exists() or path.stat().st_size == 0:
+            return False
+        cap = cv2.VideoCapture(str(path))
+        try:
+            return cap.read()[0]
+        finally:
+            cap.release()
+    except Exception:
+        return False
+    finally:
+        if out is not None:
+            out.release()
+
+
+# Observador de mutações do DOM para a captura adaptativa. Avisa no máximo a cada 250 ms:
+# pela binding do DevTools (screencast) ou incrementando um contador lido pelo screenshot.
+# Retorna true quando instala (documento novo, ou seja, houve navegação).
+SCRIPT_OBSERVADOR_ATIVIDADE = """
+return (function () {
+    if (window.__observadorAtividadeVideo) { return false; }
+    var ultimoAviso = 0;
+    window.__atividadesVideo = 0;
+    window.__observadorAtividadeVideo = new MutationObserver(function () {
+        var agora = Date.now();
+        if (agora - ultimoAviso < 250) { return; }
+        ultimoAviso = agora;
+        if (typeof window.__avisarAtividadeVideo === 'function') {
+            window.__avisarAtividadeVideo('dom');
+        } else {
+            window.__atividadesVideo += 1;
+        }
+    });
+    window.__observadorAtividadeVideo.observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    return true;
+})();
+"""
+
+# Instala o observador (se preciso) e consome o contador de mutações
+SCRIPT_CONSULTA_ATIVIDADE = SCRIPT_OBSERVADOR_ATIVIDADE.replace('return (function', 'var instalado = (function', 1) + """
+var atividades = window.__atividadesVideo;
+window.__atividadesVideo = 0;
+return instalado ? 'navegacao' : (atividades > 0 ? 'dom' : null);
+"""
+
+
+# Capability com o endereço do DevTools em cada navegador Chromium
+DEVTOOLS_CAPABILITIES = ('goog:chromeOptions', 'ms:edgeOptions')
+
+
+def devtools_address(driver):
+    """Endereço host:porta do DevTools informado nas capabilities do driver (ou None)"""
+    capabilities = getattr(driver, 'capabilities', None) or {}
+    for chave in DEVTOOLS_CAPABILITIES:
+        endereco = (capabilities.get(chave) or {}).get('debuggerAddress')
+        if endereco:
+            return endereco
+    return None
+
+
+def open_devtools_connection(driver):
+    """
+    Abre uma conexão WebSocket própria com o DevTools da aba controlada pelo driver (Chrome/Edge).
+    
+    Returns:
+        websocket.WebSocket conectado ao alvo da página
+    """
+    import websocket
+    
+    endereco = devtools_address(driver)
+    with urllib.request.urlopen(f"http://{endereco}/json", timeout=5) as resposta:
+        alvos = json.loads(resposta.read().decode('utf-8'))
+    
+    # No ChromeDriver o handle da janela é o id do alvo do DevTools
+    handle = driver.current_window_handle
+    paginas = [alvo for alvo in alvos if alvo.get('type') == 'page']
+    alvo = next((pagina for pagina in paginas if pagina.get('id') == handle), None) or paginas[0]
+    
+    # suppress_origin: o Chrome recusa conexões WebSocket com Origin não autorizado
+    return websocket.create_connection(alvo['webSocketDebuggerUrl'], timeout=5, suppress_origin=True)
+
+
+class DedicatedWebDriverChannel:
+    """
+    Conexão HTTP própria com a sessão do WebDriver, usada só pela thread de gravação.
+    Os screenshots não disputam o pool de conexões do command_executor do cliente Selenium,
+    mas o chromedriver/geckodriver ainda executa um comando por vez na sessão: o screenshot
+    espera o comando do passo em andamento (e vice-versa). No Chrome/Edge o
+    DevToolsScreenshotChannel evita essa fila.
+    """
+    
+    def __init__(self, driver):
+        """
+        Args:
+            driver: Instância do Selenium WebDriver (local ou remoto)
+        """
+        endereco = urllib.parse.urlsplit(self._server_address(driver))
+        self.session_path = f"{endereco.path.rstrip('/')}/session/{driver.session_id}"
+        self.headers = {'Accept': 'application/json', 'Connection': 'keep-alive'}
+        if endereco.username:
+            credenciais = f"{urllib.parse.unquote(endereco.username)}:{urllib.parse.unquote(endereco.password or '')}"
+            self.headers['Authorization'] = f"Basic {base64.b64encode(credenciais.encode('utf-8')).decode('ascii')}"
+        
+        classe_conexao = http.client.HTTPSConnection if endereco.scheme == 'https' else http.client.HTTPConnection
+        self.connection = classe_conexao(endereco.hostname, endereco.port, timeout=10)
+    
+    @staticmethod
+    def _server_address(driver):
+        """URL do servidor do WebDriver (chromedriver, geckodriver, Grid)"""
+        executor = driver.command_executor
+        client_config = getattr(executor, '_client_config', None)
+        if client_config is not None:
+            return client_config.remote_server_addr
+        return executor._url
+    
+    def screenshot_png(self):
+        """
+        Captura a viewport pela conexão dedicada.
+        
+        Returns:
+            bytes: PNG da página
+        """
+        return base64.b64decode(self._request('GET', '/screenshot'))
+    
+    def execute_script(self, script):
+        """
+        Executa um script síncrono na página pela conexão dedicada.
+        
+        Args:
+            script (str): Corpo da função JavaScript (sem argumentos)
+            
+        Returns:
+            Valor retornado pelo script
+        """
+        return self._request('POST', '/execute/sync', {'script': script, 'args': []})
+    
+    def _request(self, method, path, body=None):
+        """Envia o comando e devolve o 'value' da resposta (reconecta uma vez se a conexão caiu)"""
+        try:
+            return self._send_request(method, path, body)
+        except (http.client.RemoteDisconnected, http.client.CannotSendRequest, ConnectionError):
+            # O servidor fechou a conexão keep-alive: reconecta uma vez
+            self.connection.close()
+            return self._send_request(method, path, body)
+    
+    def _send_request(self, method, path, body):
+        """Requisição HTTP do protocolo W3C WebDriver na sessão"""
+        headers = dict(self.headers)
+        dados = None
+        if body is not None:
+            dados = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json; charset=utf-8'
+        self.connection.request(method, self.session_path + path, body=dados, headers=headers)
+        resposta = self.connection.getresponse()
+        corpo = json.loads(resposta.read().decode('utf-8'))
+        if resposta.status != 200:
+            valor = corpo.get('value') or {}
+            raise Exception(valor.get('message') or f"HTTP {resposta.status}")
+        return corpo['value']
+    
+    def close(self):
+        """Fecha a conexão"""
+        self.connection.close()
+
+
+class DevToolsScreenshotChannel:
+    """
+    Screenshots por uma conexão WebSocket própria com o DevTools da aba (Chrome/Edge),
+    com Page.captureScreenshot. Os comandos não passam pelo chromedriver, então não entram
+    na fila de comandos da sessão usada pelos passos.
+    """
+    
+    def __init__(self, driver):
+        """
+        Args:
+            driver: Instância do Selenium WebDriver (Chrome ou Edge)
+        """
+        self.connection = open_devtools_connection(driver)
+        self.message_id = 0
+    
+    def _command(self, method, params=None):
+        """Envia um comando e aguarda a resposta com o mesmo id (eventos são ignorados)"""
+        self.message_id += 1
+        self.connection.send(json.dumps({'id': self.message_id, 'method': method, 'params': params or {}}))
+        while True:
+            mensagem = json.loads(self.connection.recv())
+            if mensagem.get('id') != self.message_id:
+                continue
+            if 'error' in mensagem:
+                raise Exception(mensagem['error'].get('message', 'erro do DevTools'))
+            return mensagem.get('result', {})
+    
+    def screenshot_png(self):
+        """
+        Captura a viewport pelo DevTools.
+        
+        Returns:
+            bytes: PNG da página
+        """
+        return base64.b64decode(self._command('Page.captureScreenshot', {'format': 'png'})['data'])
+    
+    def execute_script(self, script):
+        """
+        Executa um script síncrono na página pelo DevTools.
+        
+        Args:
+            script (str): Corpo da função JavaScript (sem argumentos)
+            
+        Returns:
+            Valor retornado pelo script
+        """
+        resultado = self._command('Runtime.evaluate', {
+            'expression': f"(function () {{\n{script}\n}})()",
+            'returnByValue': True
+        })
+        if 'exceptionDetails' in resultado:
+            raise Exception(resultado['exceptionDetails'].get('text', 'erro no script'))
+        return resultado.get('result', {}).get('value')
+    
+    def close(self):
+        """Fecha a conexão"""
+        self.connection.close()
+
+
+class ScreenshotCaptureBackend:
+    """
+    Captura por polling: um screenshot do WebDriver por frame (qualquer navegador).
+    Com dedicated_channel, os screenshots usam o DevTools da aba no Chrome/Edge
+    (DevToolsScreenshotChannel, fora da fila de comandos do chromedriver) ou, nos demais,
+    uma conexão HTTP própria com a sessão (DedicatedWebDriverChannel) em vez do
+    command_executor que os passos usam.
+    Sem driver, ou se o Selenium falhar, captura a janela/tela com pyautogui.
+    """
+    
+    name = 'screenshot'
+    # O instante do frame é o da própria captura (o gravador usa o meio do intervalo da chamada)
+    frame_timestamps = False
+    
+    def __init__(self, driver=None, window_rect=None, dedicated_channel=True):
+        """
+        Args:
+            driver: Instância do Selenium WebDriver (opcional)
+            window_rect (dict): Posição/tamanho da janela para o fallback com pyautogui
+            dedicated_channel (bool): Usa o DevTools (Chrome/Edge) ou uma conexão HTTP própria com a sessão
+        """
+        self.driver = driver
+        self.window_rect = window_rect
+        self.dedicated_channel = dedicated_channel
+        self.channel = None
+        self.channel_name = 'webdriver' if driver else 'pyautogui'
+        self.cpu_seconds = 0.0
+        self.decode_seconds = 0.0
+        self.frames_decoded = 0
+    
+    def start(self):
+        """Abre o canal dedicado (se pedido): DevTools no Chrome/Edge, conexão HTTP própria nos demais"""
+        if not (self.driver and self.dedicated_channel):
+            return
+        canais = [(DedicatedWebDriverChannel, 'http_dedicado')]
+        if devtools_address(self.driver):
+            canais.insert(0, (DevToolsScreenshotChannel, 'devtools'))
+        for classe_canal, nome_canal in canais:
+            try:
+                self.channel = classe_canal(self.driver)
+                self.channel.screenshot_png()
+                self.channel_name = nome_canal
+                return
+            except Exception as e:
+                print(f"[VIDEO] Canal {nome_canal} indisponível ({e})")
+                if self.channel:
+                    self.channel.close()
+                self.channel = None
+        print("[VIDEO] Usando a conexão do driver para os screenshots")
+    
+    def _screenshot_png(self):
+        """PNG da página pela conexão dedicada ou, sem ela, pelo driver"""
+        if self.channel:
+            return self.channel.screenshot_png()
+        return self.driver.get_screenshot_as_png()
+    
+    def poll_activity(self):
+        """
+        Consulta o observador de mutações injetado na página (captura adaptativa).
+        
+        Returns:
+            str: 'navegacao' (documento novo), 'dom' (houve mutações) ou None
+        """
+        if not self.driver:
+            return None
+        if self.channel:
+            return self.channel.execute_script(SCRIPT_CONSULTA_ATIVIDADE)
+        return self.driver.execute_script(SCRIPT_CONSULTA_ATIVIDADE)
+    
+    def capture(self):
+        """
+        Captura um frame.
+        
+        Returns:
+            tuple: (np.ndarray BGR, timestamp em segundos)
+        """
+        if self.driver:
+            try:
+                # Captura screenshot usando Selenium (funciona em headless)
+                png_bytes = self._screenshot_png()
+                # Converte PNG bytes para array numpy
+                decode_start = time.perf_counter()
+                nparr = np.frombuffer(png_bytes, np.uint8)
+                frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+                self.decode_seconds += time.perf_counter() - decode_start
+                self.frames_decoded += 1
+                return frame, time.time()
+            except Exception as e:
+                # Fallback: usa pyautogui se Selenium falhar
+                print(f"[VIDEO] Erro ao capturar via Selenium: {e}, usando pyautogui")
+        
+        return self._capture_screen()
+    
+    def capture_encoded(self):
+        """
+        Captura um frame sem decodificar (modo comprimido).
+        
+        Returns:
+            tuple: (bytes PNG do WebDriver, ou JPEG no fallback com pyautogui, timestamp em segundos)
+        """
+        if self.driver:
+            try:
+                return self._screenshot_png(), time.time()
+            except Exception as e:
+                print(f"[VIDEO] Erro ao capturar via Selenium: {e}, usando pyautogui")
+        
+        frame, timestamp = self._capture_screen()
+        return cv2.imencode('.jpg', frame)[1].tobytes(), timestamp
+    
+    def _capture_screen(self):
+        """
+        Captura a janela (ou a tela inteira) com pyautogui.
+        
+        Returns:
+            tuple: (np.ndarray BGR, timestamp em segundos)
+        """
+        if self.window_rect:
+            screenshot = pyautogui.screenshot(region=(
+                self.window_rect['x'],
+                self.window_rect['y'],
+                self.window_rect['width'],
+                self.window_rect['height']
+            ))
+        else:
+            screenshot = pyautogui.screenshot()
+        frame = np.array(screenshot)
+        return cv2.cvtColor(frame, cv2.COLOR_RGB2BGR), time.time()
+    
+    def stop(self):
+        """Fecha a conexão dedicada"""
+        if self.channel:
+            self.channel.close()
+            self.channel = None
+
+
+class ScreencastCaptureBackend:
+    """
+    Captura via DevTools Page.startScreencast (Chrome/Edge).
+    O navegador envia frames JPEG com timestamp apenas quando a página muda, por uma
+    conexão WebSocket própria com o DevTools (não usa o canal de comandos do WebDriver).
+    capture() devolve o frame mais recente recebido.
+    """
+    
+    name = 'screencast'
+    channel_name = 'devtools'
+    # capture() devolve o instante em que o navegador gerou o frame (metadata.timestamp)
+    frame_timestamps = True
+    
+    def __init__(self, driver, jpeg_quality=80, max_size=None, on_activity=None):
+        """
+        Args:
+            driver: Instância do Selenium WebDriver (Chrome ou Edge)
+            jpeg_quality (int): Qualidade JPEG dos frames enviados pelo navegador (0-100)
+            max_size (tuple): (largura, altura) máximas; o próprio navegador reduz os frames
+            on_activity: Função chamada com 'dom' ou 'navegacao' (captura adaptativa); os avisos
+                chegam pela mesma conexão do DevTools, sem consultar a página
+        """
+        self.driver = driver
+        self.jpeg_quality = jpeg_quality
+        self.max_size = max_size
+        self.on_activity = on_activity
+        self.observer_script_message = None
+        self.observer_script_id = None
+        self.connection = None
+        self.receiver_thread = None
+        self.running = False
+        self.lock = threading.Lock()
+        # Os acks saem da thread de recepção e os demais comandos da thread que grava
+        self.send_lock = threading.Lock()
+        self.latest_jpeg = None
+        self.latest_timestamp = None
+        self.latest_sequence = 0
+        self.decoded_sequence = 0
+        self.decoded_frame = None
+        self.frames_received = 0
+        self.cpu_seconds = 0.0
+        self.decode_seconds = 0.0
+        self.frames_decoded = 0
+        self._message_id = 0
+    
+    @classmethod
+    def is_supported(cls, driver):
+        """
+        Verifica se o driver expõe o endereço do DevTools (Chrome/Edge)
+        
+        Returns:
+            bool: True se o screencast pode ser usado
+        """
+        return bool(driver) and devtools_address(driver) is not None
+    
+    def start(self):
+        """Conecta ao DevTools da aba controlada pelo driver e inicia o screencast"""
+        self.connection = open_devtools_connection(self.driver)
+        self.connection.settimeout(0.5)
+        parametros = {'format': 'jpeg', 'quality': self.jpeg_quality, 'everyNthFrame': 1}
+        if self.max_size:
+            parametros['maxWidth'], parametros['maxHeight'] = self.max_size
+        self._send('Page.startScreencast', parametros)
+        if self.on_activity:
+            self._start_activity_observer()
+        
+        self.running = True
+        self.receiver_thread = threading.Thread(target=self._receive_loop, daemon=True)
+        self.receiver_thread.start()
+    
+    def _send(self, method, params=None):
+        """
+        Envia um comando ao DevTools (sem aguardar a resposta)
+        
+        Returns:
+            int: Id da mensagem (a resposta chega no _receive_loop com o mesmo id)
+        """
+        with self.send_lock:
+            self._message_id += 1
+            message_id = self._message_id
+            self.connection.send(json.dumps({'id': message_id, 'method': method, 'params': params or {}}))
+        return message_id
+    
+    def _start_activity_observer(self):
+        """Avisos de navegação (Page.frameNavigated) e do observador do DOM (binding do Runtime)"""
+        script = SCRIPT_OBSERVADOR_ATIVIDADE.replace('return (function', '(function', 1)
+        self._send('Page.enable')
+        self._send('Runtime.addBinding', {'name': '__avisarAtividadeVideo'})
+        self.observer_script_message = self._send('Page.addScriptToEvaluateOnNewDocument', {'source': script})
+        self._send('Runtime.evaluate', {'expression': script})
+    
+    def _receive_loop(self):
+        """Recebe os frames do screencast e confirma cada um (o navegador só envia o próximo após o ack)"""
+        import websocket
+        
+        while self.running:
+            try:
+                mensagem = json.loads(self.connection.recv())
+            except websocket.WebSocketTimeoutException:
+                continue
+            except Exception:
+                break
+            
+            metodo = mensagem.get('method')
+            if metodo != 'Page.screencastFrame':
+                self._handle_activity_message(mensagem, metodo)
+                continue
+            
+            parametros = mensagem['params']
+            self._send('Page.screencastFrameAck', {'sessionId': parametros['sessionId']})
+            with self.lock:
+                self.latest_jpeg = base64.b64decode(parametros['data'])
+                self.latest_timestamp = parametros.get('metadata', {}).get('timestamp', time.time())
+                self.latest_sequence += 1
+            self.frames_received += 1
+        
+        self.cpu_seconds += time.thread_time()
+    
+    def _handle_activity_message(self, mensagem, metodo):
+        """Repassa ao on_activity as navegações do frame principal e os avisos do observador"""
+        if not self.on_activity:
+            return
+        if mensagem.get('id') == self.observer_script_message:
+            self.observer_script_id = mensagem.get('result', {}).get('identifier')
+        elif metodo == 'Runtime.bindingCalled' and mensagem['params'].get('name') == '__avisarAtividadeVideo':
+            self.on_activity('dom')
+        elif metodo == 'Page.frameNavigated' and not mensagem['params'].get('frame', {}).get('parentId'):
+            self.on_activity('navegacao')
+    
+    def poll_activity(self):
+        """Os avisos de atividade chegam pelo DevTools (on_activity): nada a consultar"""
+        return None
+    
+    def capture(self):
+        """
+        Devolve o frame mais recente (decodificado só quando muda).
+        
+        Returns:
+            tuple: (np.ndarray BGR, timestamp em segundos) ou None se nenhum frame chegou ainda
+        """
+        with self.lock:
+            jpeg, timestamp, sequence = self.latest_jpeg, self.latest_timestamp, self.latest_sequence
+        if jpeg is None:
+            return None
+        
+        if sequence != self.decoded_sequence:
+            decode_start = time.perf_counter()
+            self.decoded_frame = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+            self.decode_seconds += time.perf_counter() - decode_start
+            self.frames_decoded += 1
+            self.decoded_sequence = sequence
+        return self.decoded_frame, timestamp
+    
+    def capture_encoded(self):
+        """
+        Devolve o JPEG mais recente sem decodificar (modo comprimido).
+        Enquanto a página não muda, devolve o mesmo objeto bytes.
+        
+        Returns:
+            tuple: (bytes JPEG, timestamp em segundos) ou None se nenhum frame chegou ainda
+        """
+        with self.lock:
+            jpeg, timestamp = self.latest_jpeg, self.latest_timestamp
+        if jpeg is None:
+            return None
+        return jpeg, timestamp
+    
+    def stop(self):
+        """Para o screencast e fecha a conexão com o DevTools"""
+        self.running = False
+        if self.connection is None:
+            return
+        try:
+            self._send('Page.stopScreencast')
+            if self.on_activity:
+                # O script e a binding ficariam na aba reaproveitada pelo pool de navegadores
+                if self.observer_script_id:
+                    self._send('Page.removeScriptToEvaluateOnNewDocument', {'identifier': self.observer_script_id})
+                self._send('Runtime.removeBinding', {'name': '__avisarAtividadeVideo'})
+        except Exception:
+            pass
+        if self.receiver_thread:
+            self.receiver_thread.join(timeout=2)
+        try:
+            self.connection.close()
+        except Exception:
+            pass
+        self.connection = None
+
+
+def create_capture_backend(driver, preference='auto', window_rect=None, jpeg_quality=80, max_size=None,
+                           dedicated_channel=True, on_activity=None):
+    """
+    Escolhe o backend de captura.
+    
+    Args:
+        driver: Instância do Selenium WebDriver (ou None)
+        preference (str): 'auto' (screencast quando disponível), 'screencast' ou 'screenshot'
+        window_rect (dict): Posição/tamanho da janela para o fallback com pyautogui
+        jpeg_quality (int): Qualidade JPEG dos frames do screencast
+        max_size (tuple): (largura, altura) máximas dos frames do screencast
+        dedicated_channel (bool): Screenshots por uma conexão HTTP própria com a sessão
+        on_activity: No screencast, função chamada a cada navegação/mutação do DOM (captura adaptativa)
+        
+    Returns:
+        Backend já iniciado (ScreencastCaptureBackend ou ScreenshotCaptureBackend)
+    """
+    if preference in ('auto', 'screencast') and ScreencastCaptureBackend.is_supported(driver):
+        backend = ScreencastCaptureBackend(driver, jpeg_quality, max_size, on_activity)
+        try:
+            backend.start()
+            return backend
+        except Exception as e:
+            backend.stop()
+            print(f"[VIDEO] Screencast do DevTools indisponível ({e}), usando screenshots")
+    elif preference == 'screencast':
+        print("[VIDEO] Screencast requer Chrome/Edge, usando screenshots")
+    
+    backend = ScreenshotCaptureBackend(driver, window_rect, dedicated_channel)
+    backend.start()
+    return backend
+
+
 class VideoRecorder:
     """
     Gravador de vídeo para evidência de testes automatizados.
@@ -131,9 +787,59 @@ class VideoRecorder:
     - Adiciona timestamp overlay no vídeo
     - Grava em formato MP4
     - Executa em thread separada para não impactar performance dos testes
+    - Frames repetidos (página parada) são guardados como repetição do anterior,
+      e só são expandidos na escrita do vídeo (o VideoWriter grava taxa constante:
+      cada repetição ainda é codificada, a economia é de memória, cópias e overlay)
+    
+    Modos de gravação:
+    - 'streaming': os frames passam por uma fila limitada para uma thread de escrita
+      que grava no arquivo à medida que chegam (memória constante)
+    - 'memoria': guarda todos os frames e só grava ao final (comportamento antigo)
+    - 'comprimido': como 'memoria', mas guarda os bytes PNG/JPEG entregues pelo navegador
+      (10-20x menores) e só decodifica ao salvar, em um pool de threads
+    - 'caixa_preta': mantém apenas os últimos N segundos em um buffer circular
+      pré-alocado e só codifica quando o vídeo for mantido (ex: cenário falhou)
     """
     
-    def __init__(self, output_path, driver=None, fps=15):
+    MODES = ('streaming', 'memoria', 'caixa_preta', 'comprimido')
+    
+    # Resolução reduzida usada para detectar se o frame mudou, e diferença máxima tolerada por pixel
+    CHANGE_DETECTION_SIZE = (64, 36)
+    CHANGE_DETECTION_THRESHOLD = 1
+    
+    # Região do timestamp overlay (retângulo inclusivo), origem e cor (BGR) do texto
+    OVERLAY_RECT = ((5, 5), (250, 40))
+    OVERLAY_TEXT_ORIGIN = (10, 28)
+    OVERLAY_TEXT_COLOR = (0, 255, 0)
+    GLYPH_CACHE_SIZE = 64
+    
+    # Níveis de VIDEO_QUALIDADE (até 2, até 4...): fator de escala, interpolação do redimensionamento,
+    # qualidade JPEG (screencast e modo comprimido) e tamanho máximo do frame
+    QUALITY_TIERS = (
+        (2, {'scale': 0.5, 'interpolation': cv2.INTER_NEAREST, 'jpeg_quality': 40, 'max_size': (960, 540)}),
+        (4, {'scale': 0.5, 'interpolation': cv2.INTER_AREA, 'jpeg_quality': 55, 'max_size': (1280, 720)}),
+        (6, {'scale': 0.75, 'interpolation': cv2.INTER_AREA, 'jpeg_quality': 70, 'max_size': (1600, 900)}),
+        (8, {'scale': 1.0, 'interpolation': cv2.INTER_AREA, 'jpeg_quality': 80, 'max_size': (1920, 1080)}),
+        (10, {'scale': 1.0, 'interpolation': cv2.INTER_AREA, 'jpeg_quality': 95, 'max_size': None}),
+    )
+    
+    # Limites (ms) das faixas do histograma de latência de captura
+    LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000)
+    
+    # Threads que decodificam os frames do modo comprimido ao salvar (cv2.imdecode libera o GIL)
+    DECODER_THREADS = min(4, os.cpu_count() or 1)
+    
+    # Buffer circular da caixa-preta reaproveitado entre gravações (evita realocar a cada cenário)
+    _ring_buffer_livre = None
+    
+    # Captura adaptativa: segundos no FPS máximo após cada atividade e intervalo entre
+    # consultas ao observador do DOM no backend screenshot
+    ACTIVITY_BURST_SECONDS = 1.5
+    ACTIVITY_POLL_SECONDS = 0.25
+    
+    def __init__(self, output_path, driver=None, fps=15, mode='streaming', queue_size=30, buffer_seconds=10,
+                 capture_backend='auto', deduplicate=True, compression_quality=0, quality=7, video_format='auto',
+                 dedicated_channel=True, adaptive=False, idle_fps=2):
         """
         Inicializa o gravador de vídeo.
         
@@ -141,15 +847,117 @@ class VideoRecorder:
             output_path (str): Caminho onde o vídeo será salvo
             driver: Instância do Selenium WebDriver para capturar posição da janela
             fps (int): Frames por segundo (padrão: 15)
+            mode (str): Modo de gravação, 'streaming', 'memoria', 'caixa_preta' ou 'comprimido' (padrão: 'streaming')
+            queue_size (int): Máximo de frames aguardando escrita no modo streaming
+            buffer_seconds (int): Segundos finais mantidos no modo caixa_preta
+            capture_backend (str): 'auto', 'screencast' (DevTools, Chrome/Edge) ou 'screenshot'
+            deduplicate (bool): Guarda frames iguais ao anterior como repetição (padrão: True)
+            compression_quality (int): No modo comprimido, recomprime cada frame em JPEG com esta
+                qualidade (1-100); 0 guarda os bytes como o navegador entregou
+            quality (int): Nível de VIDEO_QUALIDADE (1-10) que define resolução e qualidade JPEG (padrão: 7)
+            video_format (str): 'webm' (VP8), 'mjpeg' (AVI) ou 'mp4' (mp4v), os dois últimos convertidos no
+                relatório; 'auto' usa mjpeg no modo streaming e webm nos demais (padrão: 'auto')
+            dedicated_channel (bool): No backend screenshot, captura por uma conexão HTTP própria
+                com a sessão em vez da conexão usada pelos passos (padrão: True)
+            adaptive (bool): Captura adaptativa: idle_fps com a página parada e fps (máximo) por
+                ACTIVITY_BURST_SECONDS após navegações, mutações do DOM, comandos do PaginaBase
+                ou mudanças na imagem (padrão: False)
+            idle_fps (float): FPS mínimo da captura adaptativa (padrão: 2)
         """
-        self.output_path = output_path
+        self.mode = mode if mode in self.MODES else 'streaming'
+        if video_format not in VIDEO_FORMATS:
+            # O streaming codifica cada frame durante o cenário: o VP8 (~70-90 ms por frame em 1080p)
+            # não acompanha o FPS, então usa MJPEG. Os demais modos codificam no fim (ou em segundo plano)
+            video_format = 'mjpeg' if self.mode == 'streaming' else 'webm'
+        self.video_format = video_format
+        # Encoders testados uma vez por processo; a extensão do arquivo já sai do primeiro que funciona
+        self.encoders = probe_video_encoders(VIDEO_FORMATS[self.video_format])
+        self.output_path = str(Path(output_path).with_suffix(self.encoders[0][1])) if self.encoders else output_path
         self.driver = driver
         self.fps = fps
+        self.queue_size = max(1, queue_size)
+        self.deduplicate = deduplicate
+        self.quality = min(max(quality, 1), 10)
+        self.quality_settings = self.settings_for_quality(self.quality)
+        self._target_sizes = {}
         self.recording = False
         self.frames = []
         self.thread = None
         self.window_rect = None
         
+        # Backend de captura e custo medido
+        self.capture_backend_preference = capture_backend
+        self.dedicated_channel = dedicated_channel
+        
+        # Captura adaptativa: até quando vale o FPS máximo (monotônico) e avisos recebidos
+        self.adaptive = adaptive
+        self.idle_fps = min(max(idle_fps, 0.1), fps)
+        self.activity_event = threading.Event()
+        self.activity_until = 0.0
+        self.active_seconds = 0.0
+        self.activity_counts = {}
+        self.last_activity_poll = 0.0
+        self.capture_backend = None
+        self.capture_cpu_seconds = 0.0
+        self.started_at = None
+        self.stopped_at = None
+        
+        # Detecção de frames repetidos
+        self.last_raw_frame = None
+        self.last_thumbnail = None
+        self.frames_deduplicated = 0
+        
+        # Modo comprimido: bytes do último frame recebido e total guardado
+        self.compression_quality = compression_quality
+        self.last_encoded_source = None
+        self.compressed_bytes = 0
+        
+        # Ritmo da captura: relógio (parede no início, monotônico depois) e prazos perdidos
+        self.clock_origin = (time.time(), time.monotonic())
+        self.last_frame_timestamp = self.clock_origin[0]
+        self.stopped_clock = None
+        self.frames_skipped = 0
+        
+        # Linha do tempo do vídeo: instante do frame 0, próximo frame do vídeo e frame aguardando escrita
+        self.video_started_at = None
+        self._timeline_slot = 0
+        self._pending_frame = None
+        
+        # Overlay: patches do texto do timestamp já renderizados e custo medido
+        self._glyph_cache = {}
+        self.overlay_seconds = 0.0
+        self.overlay_count = 0
+        
+        # Modo streaming: fila limitada + thread dona do cv2.VideoWriter
+        self.frame_queue = None
+        self.writer_thread = None
+        self.writer_error = None
+        self.discard = False
+        self.frames_written = 0
+        self.codec_used = None
+        self.frame_size = None
+        self.encode_seconds = 0.0
+        
+        # Saúde do gravador: latência de cada captura, erros, decodificação e pico de memória dos frames
+        self.capture_latencies = []
+        self.capture_errors = 0
+        self.decode_seconds = 0.0
+        self.frames_decoded = 0
+        self._decode_lock = threading.Lock()
+        self.buffer_bytes = 0
+        self.peak_buffer_bytes = 0
+        
+        # Codificação em segundo plano: descrição do arquivo temporário com os frames (ver encode_spilled_video)
+        self.encode_job = None
+        
+        # Modo caixa_preta: buffer circular com os últimos frames distintos e os instantes de cada um
+        self.buffer_seconds = max(1, buffer_seconds)
+        self.ring_buffer = None
+        self.ring_timestamps = []
+        self.ring_next = 0
+        self.ring_count = 0
+        self.frames_captured = 0
+        
     def start_recording(self):
         """Inicia a gravação do vídeo"""
         # Captura dimensões da janela do navegador
@@ -164,94 +972,693 @@ class VideoRecorder:
         
         self.recording = True
         self.frames = []
+        self.frames_written = 0
+        self.discard = False
+        self.writer_error = None
+        self.ring_next = 0
+        self.ring_count = 0
+        self.frames_captured = 0
+        self.frames_deduplicated = 0
+        self.frames_skipped = 0
+        self.last_raw_frame = None
+        self.last_thumbnail = None
+        self.last_encoded_source = None
+        self.compressed_bytes = 0
+        self.capture_cpu_seconds = 0.0
+        self.overlay_seconds = 0.0
+        self.overlay_count = 0
+        self.clock_origin = (time.time(), time.monotonic())
+        self.last_frame_timestamp = self.clock_origin[0]
+        self.stopped_clock = None
+        self.encode_seconds = 0.0
+        self.capture_latencies = []
+        self.capture_errors = 0
+        self.decode_seconds = 0.0
+        self.frames_decoded = 0
+        self.buffer_bytes = 0
+        self.peak_buffer_bytes = 0
+        self.activity_event.clear()
+        self.activity_until = 0.0
+        self.active_seconds = 0.0
+        self.activity_counts = {}
+        self.last_activity_poll = 0.0
+        if self.window_rect:
+            screencast_size = self._target_size(self.window_rect['width'], self.window_rect['height'])
+        else:
+            screencast_size = self.quality_settings['max_size']
+        self.capture_backend = create_capture_backend(
+            self.driver, self.capture_backend_preference, self.window_rect,
+            jpeg_quality=self.quality_settings['jpeg_quality'], max_size=screencast_size,
+            dedicated_channel=self.dedicated_channel,
+            on_activity=self.notify_activity if self.adaptive else None
+        )
+        if self.adaptive and self.driver:
+            registrar_ouvinte_atividade(self.driver, self.notify_activity)
+        self.started_at = time.perf_counter()
+        self.stopped_at = None
+        
+        if self.mode == 'streaming':
+            self.frame_queue = queue.Queue(maxsize=self.queue_size)
+            self.writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self.writer_thread.start()
+        
         self.thread = threading.Thread(target=self._record_loop, daemon=True)
         self.thread.start()
-        print(f"[VIDEO] Gravação iniciada: {Path(self.output_path).name}")
+        print(
+            f"[VIDEO] Gravação iniciada ({self.mode}, {self.capture_backend.name} via "
+            f"{self.capture_backend.channel_name}"
+            f"{f', {self.idle_fps:g}-{self.fps} FPS adaptativo' if self.adaptive else ''}): "
+            f"{Path(self.output_path).name}"
+        )
+    
+    def notify_activity(self, source='externa'):
+        """
+        Registra atividade na página: a captura adaptativa vai para o FPS máximo por
+        ACTIVITY_BURST_SECONDS e, se estava no intervalo ocioso, captura na hora.
+        Chamado pelo PaginaBase (recursos.utils.atividade_pagina), pelo DevTools e pelo loop de captura.
+        
+        Args:
+            source (str): Origem da atividade ('navegacao', 'dom', 'clique', 'digitacao'...)
+        """
+        self._extend_activity(source)
+        self.activity_event.set()
+    
+    def _extend_activity(self, source):
+        """Estende o período no FPS máximo e conta a atividade por origem"""
+        now = time.monotonic()
+        until = now + self.ACTIVITY_BURST_SECONDS
+        self.active_seconds += until - max(self.activity_until, now)
+        self.activity_until = until
+        self.activity_counts[source] = self.activity_counts.get(source, 0) + 1
+    
+    def _capture_interval(self):
+        """Intervalo até a próxima captura: 1/fps em atividade, 1/idle_fps com a página parada"""
+        if self.adaptive and time.monotonic() >= self.activity_until:
+            return 1.0 / self.idle_fps
+        return 1.0 / self.fps
+    
+    def _wait_for_deadline(self, deadline):
+        """
+        Aguarda o prazo da próxima captura.
+        Na captura adaptativa acorda antes quando chega um aviso de atividade e, a cada
+        ACTIVITY_POLL_SECONDS, consulta o observador do DOM (backend screenshot).
+        
+        Args:
+            deadline (float): Prazo no relógio monotônico
+            
+        Returns:
+            bool: True se acordou por atividade antes do prazo (só quando o prazo era o ocioso)
+        """
+        if not self.adaptive:
+            time.sleep(max(0.0, deadline - time.monotonic()))
+            return False
+        
+        while self.recording:
+            now = time.monotonic()
+            if now - self.last_activity_poll >= self.ACTIVITY_POLL_SECONDS:
+                # A primeira consulta só instala o observador na página atual (não é navegação)
+                first_poll = self.last_activity_poll == 0.0
+                self.last_activity_poll = now
+                try:
+                    source = self.capture_backend.poll_activity()
+                except Exception:
+                    source = None
+                if source and not first_poll:
+                    self.notify_activity(source)
+            if self.activity_event.is_set():
+                self.activity_event.clear()
+                if deadline - now > 1.0 / self.fps:
+                    return True
+            if now >= deadline:
+                return False
+            remaining_poll = self.ACTIVITY_POLL_SECONDS - (now - self.last_activity_poll)
+            self.activity_event.wait(max(0.0, min(deadline - now, remaining_poll)))
+        return False
+        
+    def _compress_frame(self, data):
+        """
+        Prepara os bytes de um frame para o modo comprimido.
+        Bytes iguais aos do frame anterior são repetição (o screencast devolve o mesmo objeto).
         
+        Args:
+            data (bytes): PNG/JPEG entregue pelo backend de captura
+            
+        Returns:
+            tuple: (bytes a guardar ou None se repetido, se é repetição)
+        """
+        if self.deduplicate and (data is self.last_encoded_source or data == self.last_encoded_source):
+            return None, True
+        self.last_encoded_source = data
+        
+        # Níveis de qualidade com redução de escala recomprimem já na resolução final
+        if self._recompress_on_capture():
+            frame = self._scale_frame(cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR))
+            jpeg_quality = self.compression_quality or self.quality_settings['jpeg_quality']
+            data = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])[1].tobytes()
+        self.compressed_bytes += len(data)
+        return data, False
+    
+    @classmethod
+    def settings_for_quality(cls, quality):
+        """
+        Retorna as configurações do nível de qualidade.
+        
+        Args:
+            quality (int): VIDEO_QUALIDADE (1-10)
+            
+        Returns:
+            dict: scale, interpolation, jpeg_quality e max_size
+        """
+        for upper_bound, settings in cls.QUALITY_TIERS:
+            if quality <= upper_bound:
+                return settings
+        return cls.QUALITY_TIERS[-1][1]
+    
+    def _target_size(self, width, height):
+        """
+        Calcula o tamanho do frame no nível de qualidade (escala e tamanho máximo, dimensões pares).
+        
+        Args:
+            width (int): Largura capturada
+            height (int): Altura capturada
+            
+        Returns:
+            tuple: (largura, altura), ou None se o frame fica como está
+        """
+        key = (width, height)
+        if key not in self._target_sizes:
+            factor = self.quality_settings['scale']
+            if self.quality_settings['max_size']:
+                max_width, max_height = self.quality_settings['max_size']
+                factor = min(factor, max_width / width, max_height / height)
+            if factor < 1:
+                self._target_sizes[key] = (max(2, int(width * factor) // 2 * 2), max(2, int(height * factor) // 2 * 2))
+            else:
+                self._target_sizes[key] = None
+        return self._target_sizes[key]
+    
+    def _scale_frame(self, frame):
+        """
+        Reduz o frame para a resolução do nível de qualidade.
+        
+        Args:
+            frame (np.ndarray): Frame BGR capturado
+            
+        Returns:
+            np.ndarray: Frame reduzido (ou o próprio frame se já estiver no tamanho)
+        """
+        target = self._target_size(frame.shape[1], frame.shape[0])
+        if target is None:
+            return frame
+        return cv2.resize(frame, target, interpolation=self.quality_settings['interpolation'])
+    
+    def _clock(self):
+        """
+        Relógio da gravação: horário de parede no início + tempo monotônico decorrido.
+        Não sofre ajustes do relógio do sistema durante o cenário.
+        
+        Returns:
+            float: Instante atual (epoch em segundos)
+        """
+        return self.clock_origin[0] + (time.monotonic() - self.clock_origin[1])
+    
     def _record_loop(self):
-        """Loop de captura de frames em thread separada"""
+        """
+        Loop de captura de frames em thread separada.
+        Cada captura mira um prazo absoluto (início + n / fps) do relógio monotônico, então o tempo
+        da própria captura não se acumula como atraso. Prazos já perdidos são pulados (o frame
+        anterior cobre o intervalo na escrita, pelos instantes registrados).
+        """
+        next_deadline = time.monotonic()
+        
         while self.recording:
             try:
-                # Tenta usar screenshot do Selenium (funciona em headless)
-                if self.driver:
-                    try:
-                        # Captura screenshot usando Selenium (funciona em headless)
-                        png_bytes = self.driver.get_screenshot_as_png()
-                        # Converte PNG bytes para array numpy
-                        nparr = np.frombuffer(png_bytes, np.uint8)
-                        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-                    except Exception as e:
-                        # Fallback: usa pyautogui se Selenium falhar
-                        print(f"[VIDEO] Erro ao capturar via Selenium: {e}, usando pyautogui")
-                        if self.window_rect:
-                            screenshot = pyautogui.screenshot(region=(
-                                self.window_rect['x'],
-                                self.window_rect['y'],
-                                self.window_rect['width'],
-                                self.window_rect['height']
-                            ))
-                        else:
-                            screenshot = pyautogui.screenshot()
-                        frame = np.array(screenshot)
-                        frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+                cpu_start = time.thread_time()
+                requested_at = self._clock()
+                if self.mode == 'comprimido':
+                    captured = self.capture_backend.capture_encoded()
                 else:
-                    # Sem driver: usa pyautogui
-                    if self.window_rect:
-                        screenshot = pyautogui.screenshot(region=(
-                            self.window_rect['x'],
-                            self.window_rect['y'],
-                            self.window_rect['width'],
-                            self.window_rect['height']
-                        ))
+                    captured = self.capture_backend.capture()
+                captured_at = self._clock()
+                self.capture_latencies.append((captured_at - requested_at) * 1000)
+                if captured is not None:
+                    frame = captured[0]
+                    # O frame corresponde a algum ponto durante a captura: usa o meio do intervalo
+                    timestamp = (requested_at + captured_at) / 2
+                    if self.mode == 'comprimido':
+                        frame, repeated = self._compress_frame(frame)
                     else:
-                        screenshot = pyautogui.screenshot()
-                    frame = np.array(screenshot)
-                    frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                
-                # Adiciona timestamp overlay
-                timestamp_text = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                
-                # Fundo semi-transparente para o texto
-                overlay = frame.copy()
-                cv2.rectangle(overlay, (5, 5), (250, 40), (0, 0, 0), -1)
-                frame = cv2.addWeighted(frame, 0.7, overlay, 0.3, 0)
+                        repeated = self._is_repeated_frame(frame)
+                        if not repeated:
+                            frame = self._scale_frame(frame)
+                    if self.capture_backend.frame_timestamps and not repeated:
+                        # Screencast: o frame entra na linha do tempo no instante em que o navegador o
+                        # gerou, limitado ao intervalo desde o frame anterior (relógios podem divergir)
+                        timestamp = min(max(captured[1], self.last_frame_timestamp), captured_at)
+                    self.last_frame_timestamp = timestamp
+                self.capture_cpu_seconds += time.thread_time() - cpu_start
                 
-                # Texto do timestamp
-                cv2.putText(
-                    frame, 
-                    timestamp_text,
-                    (10, 28), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 
-                    0.6, 
-                    (0, 255, 0), 
-                    2,
-                    cv2.LINE_AA
-                )
-                
-                self.frames.append(frame)
-                
-                # Aguarda intervalo baseado no FPS
-                time.sleep(1.0 / self.fps)
+                if captured is not None:
+                    self._store_frame(None if repeated else frame, timestamp)
+                    self.frames_captured += 1
+                    if repeated:
+                        self.frames_deduplicated += 1
+                    elif self.adaptive and self.deduplicate and self.frames_captured > 1:
+                        # Imagem mudou sem aviso (animação, resposta assíncrona): mantém o FPS máximo
+                        self._extend_activity('quadro')
                 
             except Exception as e:
+                self.capture_errors += 1
                 print(f"[VIDEO] Erro ao capturar frame: {e}")
                 time.sleep(0.5)  # Aguarda antes de tentar novamente
+            
+            # Aguarda o próximo prazo; se a captura atrasou mais de um intervalo, pula os prazos perdidos
+            interval = self._capture_interval()
+            next_deadline += interval
+            now = time.monotonic()
+            if now > next_deadline:
+                missed = int((now - next_deadline) / interval)
+                self.frames_skipped += missed
+                next_deadline += missed * interval
+            if self._wait_for_deadline(next_deadline):
+                # Atividade no intervalo ocioso: captura agora e segue no FPS máximo
+                next_deadline = time.monotonic()
+    
+    def _is_repeated_frame(self, frame):
+        """
+        Verifica se o frame é igual ao anterior comparando versões reduzidas (64x36).
+        O screencast devolve o mesmo objeto quando a página não mudou, então nem compara.
+        
+        Args:
+            frame (np.ndarray): Frame BGR capturado (sem overlay)
+            
+        Returns:
+            bool: True se o frame repete o anterior
+        """
+        if not self.deduplicate:
+            return False
+        if frame is self.last_raw_frame:
+            return True
+        
+        thumbnail = cv2.resize(frame, self.CHANGE_DETECTION_SIZE, interpolation=cv2.INTER_AREA)
+        repeated = (
+            self.last_thumbnail is not None
+            and frame.shape == self.last_raw_frame.shape
+            and int(cv2.absdiff(thumbnail, self.last_thumbnail).max()) <= self.CHANGE_DETECTION_THRESHOLD
+        )
+        if not repeated:
+            self.last_raw_frame = frame
+            self.last_thumbnail = thumbnail
+        return repeated
+    
+    def _glyph_patch(self, timestamp_text):
+        """
+        Retorna o patch pré-renderizado do texto do timestamp (muda uma vez por segundo).
+        O patch guarda a cobertura (alpha) do texto desenhado com anti-aliasing na região do overlay.
+        
+        Args:
+            timestamp_text (str): Texto do timestamp
+            
+        Returns:
+            tuple: (1 - alpha, cor * alpha), ambos float32 do tamanho da região
+        """
+        patch = self._glyph_cache.get(timestamp_text)
+        if patch is None:
+            (left, top), (right, bottom) = self.OVERLAY_RECT
+            coverage = np.zeros((bottom - top + 1, right - left + 1), dtype=np.uint8)
+            cv2.putText(
+                coverage,
+                timestamp_text,
+                (self.OVERLAY_TEXT_ORIGIN[0] - left, self.OVERLAY_TEXT_ORIGIN[1] - top),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.6,
+                255,
+                2,
+                cv2.LINE_AA
+            )
+            alpha = (coverage.astype(np.float32) / 255)[..., None]
+            patch = (1 - alpha, np.array(self.OVERLAY_TEXT_COLOR, dtype=np.float32) * alpha)
+            
+            if len(self._glyph_cache) >= self.GLYPH_CACHE_SIZE:
+                self._glyph_cache.clear()
+            self._glyph_cache[timestamp_text] = patch
+        return patch
+    
+    def _apply_overlay(self, frame, original_region, timestamp):
+        """
+        Desenha o timestamp overlay direto no frame, processando apenas a região do overlay.
+        A região é escurecida (fundo preto a 30%) e recebe o texto do patch em cache,
+        com o mesmo resultado de rectangle + addWeighted + putText no frame inteiro.
+        
+        Args:
+            frame (np.ndarray): Frame BGR alterado no lugar
+            original_region (np.ndarray): Cópia da região do overlay sem o texto
+            timestamp (float): Instante da captura (epoch em segundos)
+        """
+        (left, top), _ = self.OVERLAY_RECT
+        region = frame[top:top + original_region.shape[0], left:left + original_region.shape[1]]
+        inverse_alpha, text_color = self._glyph_patch(datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S"))
+        height, width = region.shape[:2]
+        
+        darkened = cv2.convertScaleAbs(original_region, alpha=0.7)
+        np.copyto(region, (darkened * inverse_alpha[:height, :width] + text_color[:height, :width] + 0.5).astype(np.uint8))
+    
+    def _begin_timeline(self):
+        """Reinicia a linha do tempo do vídeo (o frame 0 será o primeiro frame escrito)"""
+        self.video_started_at = None
+        self._timeline_slot = 0
+        self._pending_frame = None
+        self.frames_written = 0
+    
+    def _slot_of(self, timestamp):
+        """Índice do frame do vídeo que corresponde ao instante"""
+        return int((timestamp - self.video_started_at) * self.fps)
+    
+    def _write_entry(self, out, frame, timestamps):
+        """
+        Posiciona um frame capturado (e suas repetições) na linha do tempo do vídeo.
+        O vídeo é de taxa constante: cada frame capturado ocupa os frames do vídeo desde o seu instante
+        até o instante da próxima captura, então o tempo do vídeo acompanha o tempo real
+        (capturas lentas viram repetições, capturas no mesmo frame do vídeo ficam só com a última).
+        
+        Args:
+            out (cv2.VideoWriter): Writer aberto
+            frame (np.ndarray): Frame BGR sem overlay
+            timestamps (list): Instantes em que o frame foi capturado
+        """
+        for timestamp in timestamps:
+            if self._pending_frame is None:
+                if self.video_started_at is None:
+                    self.video_started_at = timestamp
+            else:
+                pending_frame, pending_timestamp = self._pending_frame
+                if frame is pending_frame and int(timestamp) == int(pending_timestamp):
+                    # Mesmo frame e mesmo texto no overlay: só estende o intervalo do frame pendente
+                    continue
+                self._emit_pending(out, self._slot_of(timestamp))
+            self._pending_frame = (frame, timestamp)
+    
+    def _finish_timeline(self, out, end_timestamp):
+        """
+        Escreve o último frame pendente até o instante em que a gravação parou.
+        
+        Args:
+            out (cv2.VideoWriter): Writer aberto
+            end_timestamp (float): Instante do fim da gravação
+        """
+        if self._pending_frame is not None:
+            self._emit_pending(out, max(self._slot_of(end_timestamp), self._timeline_slot + 1))
+            self._pending_frame = None
+    
+    def _emit_pending(self, out, until_slot):
+        """
+        Escreve o frame pendente nos frames do vídeo até until_slot (exclusivo).
+        O overlay é aplicado uma vez no próprio frame e a região original é restaurada ao final,
+        então repetições e frames compartilhados (screencast, buffer circular) continuam intactos.
+        O cv2.VideoWriter só grava taxa constante: o encoder recebe o frame uma vez por slot.
+        
+        Args:
+            out (cv2.VideoWriter): Writer aberto
+            until_slot (int): Primeiro frame do vídeo que não pertence ao frame pendente
+        """
+        count = until_slot - self._timeline_slot
+        if count <= 0:
+            return
+        
+        frame, timestamp = self._pending_frame
+        (left, top), (right, bottom) = self.OVERLAY_RECT
+        original_region = frame[top:bottom + 1, left:right + 1].copy()
+        try:
+            overlay_start = time.perf_counter()
+            self._apply_overlay(frame, original_region, timestamp)
+            encode_start = time.perf_counter()
+            self.overlay_seconds += encode_start - overlay_start
+            self.overlay_count += 1
+            for _ in range(count):
+                out.write(frame)
+            self.encode_seconds += time.perf_counter() - encode_start
+        finally:
+            frame[top:bottom + 1, left:right + 1] = original_region
+        
+        self._timeline_slot = until_slot
+        self.frames_written += count
+    
+    def _store_frame(self, frame, timestamp):
+        """
+        Entrega o frame ao destino do modo de gravação.
+        No modo streaming, espera vaga na fila (limita a memória) enquanto a gravação estiver ativa.
+        
+        Args:
+            frame: Frame BGR sem overlay (bytes no modo comprimido), ou None se repete o frame anterior
+            timestamp (float): Instante da captura (epoch em segundos)
+        """
+        if self.mode in ('memoria', 'comprimido'):
+            if frame is None and self.frames:
+                self.frames[-1][1].append(timestamp)
+            elif frame is not None:
+                self.frames.append((frame, [timestamp]))
+                self.buffer_bytes += len(frame) if self.mode == 'comprimido' else frame.nbytes
+                self.peak_buffer_bytes = max(self.peak_buffer_bytes, self.buffer_bytes)
+            return
+        
+        if self.mode == 'caixa_preta':
+            self._store_ring_frame(frame, timestamp)
+            self.peak_buffer_bytes = self.ring_buffer.nbytes if self.ring_buffer is not None else 0
+            return
+        
+        while self.recording:
+            try:
+                self.frame_queue.put((frame, timestamp), timeout=0.1)
+                if frame is not None:
+                    # Frames na fila + o frame que a thread de escrita mantém
+                    queued_bytes = (self.frame_queue.qsize() + 1) * frame.nbytes
+                    self.peak_buffer_bytes = max(self.peak_buffer_bytes, queued_bytes)
+                return
+            except queue.Full:
+                continue
+    
+    def _store_ring_frame(self, frame, timestamp):
+        """
+        Copia o frame para a próxima posição do buffer circular (sobrescreve o mais antigo).
+        Repetições só acrescentam o instante à posição do último frame.
+        O buffer é alocado no primeiro frame, com a resolução dele.
+        
+        Args:
+            frame (np.ndarray): Frame BGR sem overlay, ou None se repete o frame anterior
+            timestamp (float): Instante da captura (epoch em segundos)
+        """
+        if frame is None:
+            if self.ring_count:
+                self.ring_timestamps[(self.ring_next - 1) % len(self.ring_buffer)].append(timestamp)
+            return
+        
+        if self.ring_buffer is None:
+            height, width = frame.shape[:2]
+            capacity = max(1, int(self.buffer_seconds * self.fps))
+            self.ring_buffer = self._acquire_ring_buffer((capacity, height, width, 3))
+            self.ring_timestamps = [[] for _ in range(capacity)]
+        
+        slot = self.ring_buffer[self.ring_next]
+        if frame.shape != slot.shape:
+            # Janela redimensionada durante o cenário: mantém a resolução do buffer
+            frame = cv2.resize(frame, (slot.shape[1], slot.shape[0]))
+        np.copyto(slot, frame)
+        self.ring_timestamps[self.ring_next] = [timestamp]
+        
+        self.ring_next = (self.ring_next + 1) % len(self.ring_buffer)
+        self.ring_count = min(self.ring_count + 1, len(self.ring_buffer))
+    
+    def _ring_entries(self):
+        """
+        Lista os frames do buffer circular do mais antigo ao mais recente, limitados aos últimos N segundos.
+        
+        Returns:
+            list: Tuplas (frame, instantes)
+        """
+        capacity = len(self.ring_buffer)
+        first = (self.ring_next - self.ring_count) % capacity
+        slots = [(first + offset) % capacity for offset in range(self.ring_count)]
+        
+        # Com repetições o buffer cobre mais que N segundos: corta pelo instante do último frame
+        limit = self.ring_timestamps[slots[-1]][-1] - self.buffer_seconds
+        entries = []
+        for slot in slots:
+            timestamps = [timestamp for timestamp in self.ring_timestamps[slot] if timestamp >= limit]
+            if timestamps:
+                entries.append((self.ring_buffer[slot], timestamps))
+        return entries
+    
+    @classmethod
+    def _acquire_ring_buffer(cls, shape):
+        """
+        Obtém o buffer circular, reaproveitando o da gravação anterior se tiver o mesmo formato.
+        
+        Args:
+            shape (tuple): (capacidade, altura, largura, 3)
+            
+        Returns:
+            np.ndarray pré-alocado
+        """
+        ring_buffer, cls._ring_buffer_livre = cls._ring_buffer_livre, None
+        if ring_buffer is None or ring_buffer.shape != shape:
+            ring_buffer = np.empty(shape, dtype=np.uint8)
+            print(f"[VIDEO] Caixa-preta: buffer de {shape[0]} frames ({ring_buffer.nbytes / (1024**2):.0f} MB)")
+        return ring_buffer
+    
+    def _release_ring_buffer(self):
+        """Devolve o buffer circular para ser reaproveitado pela próxima gravação"""
+        if self.ring_buffer is not None:
+            VideoRecorder._ring_buffer_livre = self.ring_buffer
+            self.ring_buffer = None
+    
+    def _writer_loop(self):
+        """Thread de escrita do modo streaming: abre o VideoWriter no primeiro frame e grava os demais"""
+        out = None
+        last_frame = None
+        self._begin_timeline()
+        
+        while True:
+            item = self.frame_queue.get()
+            if item is None:
+                if out is not None and not (self.discard or self.writer_error):
+                    self._finish_timeline(out, self.stopped_clock)
+                break
+            if self.discard or self.writer_error:
+                continue
+            
+            frame, timestamp = item
+            last_frame = frame if frame is not None else last_frame
+            if last_frame is None:
+                continue
+            
+            try:
+                if out is None:
+                    height, width = last_frame.shape[:2]
+                    out = self._open_writer(width, height)
+                self._write_entry(out, last_frame, [timestamp])
+            except Exception as e:
+                self.writer_error = e
+                print(f"[VIDEO] ERRO na escrita do vídeo: {e}")
+        
+        if out is not None:
+            out.release()
                 
-    def stop_recording(self, save=True):
+    def stop_recording(self, save=True, defer_encode=False):
         """
         Para a gravação e opcionalmente salva o vídeo.
         
         Args:
             save (bool): Se True, salva o vídeo. Se False, descarta.
+            defer_encode (bool): Nos modos memoria, comprimido e caixa_preta, grava os frames em um
+                arquivo temporário e deixa a codificação para encode_spilled_video (self.encode_job)
             
         Returns:
-            bool: True se vídeo foi salvo, False caso contrário
+            bool: True se vídeo foi salvo (ou enviado para codificação), False caso contrário
         """
+        self.encode_job = None
         self.recording = False
+        self.activity_event.set()
+        if self.adaptive and self.driver:
+            remover_ouvinte_atividade(self.driver, self.notify_activity)
         
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=3)
+        
+        self.stopped_at = time.perf_counter()
+        self.stopped_clock = self._clock()
+        if self.capture_backend:
+            self.capture_backend.stop()
+            stats = self.get_stats()
+            print(
+                f"[VIDEO] Captura ({stats['backend']}): {stats['fps_obtido']:.1f}/{stats['fps_alvo']} FPS, "
+                f"{stats['cpu_ms_por_frame']:.1f} ms de CPU por frame, "
+                f"{stats['frames_duplicados']} de {stats['frames_capturados']} frames repetidos"
+            )
+        
+        if self.mode == 'streaming':
+            saved = self._finish_streaming(save)
+        elif defer_encode and save:
+            saved = self._finish_deferred()
+        elif self.mode == 'caixa_preta':
+            saved = self._finish_ring(save)
+        else:
+            saved = self._finish_memory(save)
+        
+        if self.overlay_count:
+            print(
+                f"[VIDEO] Overlay: {self.overlay_seconds * 1000 / self.overlay_count:.3f} ms por aplicação, "
+                f"{self.overlay_count} aplicações em {self.frames_written} frames"
+            )
+        if saved and not self.encode_job:
+            stats = self.get_stats()
+            print(
+                f"[VIDEO] Qualidade {self.quality} ({stats['resolucao']}): {stats['arquivo_kb']:.0f} KB, "
+                f"codificação {stats['codificacao_s']:.2f}s"
+            )
+        return saved
+    
+    def _finish_deferred(self):
+        """
+        Grava os frames a codificar em um arquivo temporário ao lado do vídeo (spill) e monta o
+        encode_job para encode_spilled_video, liberando a memória do gravador na hora.
+        
+        Returns:
+            bool: True se os frames foram gravados no arquivo temporário
+        """
+        try:
+            if self.mode == 'caixa_preta':
+                entries = self._ring_entries() if self.ring_count else []
+            else:
+                entries = self.frames
+            if not entries:
+                print(f"[VIDEO] Gravação descartada ({self.frames_captured} frames capturados, nenhum codificado)")
+                return False
+            
+            spill_path = f"{self.output_path}.frames"
+            layout = []
+            offset = 0
+            with open(spill_path, 'wb') as spill:
+                for frame, timestamps in entries:
+                    data = memoryview(frame if isinstance(frame, bytes) else np.ascontiguousarray(frame))
+                    spill.write(data)
+                    shape = None if isinstance(frame, bytes) else frame.shape
+                    layout.append((offset, data.nbytes, shape, list(timestamps)))
+                    offset += data.nbytes
             
+            self.encode_job = {
+                'output_path': self.output_path,
+                'spill_path': spill_path,
+                'layout': layout,
+                'encoded': self.mode == 'comprimido',
+                'fps': self.fps,
+                'quality': self.quality,
+                'compression_quality': self.compression_quality,
+                'video_format': self.video_format,
+                'end_timestamp': self.stopped_clock,
+                'video_started_at': layout[0][3][0]
+            }
+            print(
+                f"[VIDEO] {len(layout)} frames distintos enviados para codificação em segundo plano "
+                f"({offset / (1024**2):.1f} MB): {Path(self.output_path).name}"
+            )
+            return True
+        except Exception as e:
+            print(f"[VIDEO] ERRO ao preparar codificação em segundo plano: {e}")
+            return False
+        finally:
+            self.frames = []
+            self._release_ring_buffer()
+    
+    def _finish_memory(self, save):
+        """
+        Grava os frames guardados em memória (modos 'memoria' e 'comprimido').
+        
+        Args:
+            save (bool): Se True, salva o vídeo. Se False, descarta.
+            
+        Returns:
+            bool: True se vídeo foi salvo, False caso contrário
+        """
         if save and self.frames:
             try:
                 self._save_video()
@@ -261,29 +1668,89 @@ class VideoRecorder:
                 print(f"[VIDEO] ERRO ao salvar vídeo: {e}")
                 return False
         else:
-            print(f"[VIDEO] Gravação descartada ({len(self.frames)} frames)")
+            print(f"[VIDEO] Gravação descartada ({self.get_frame_count()} frames)")
             return False
+    
+    def _finish_streaming(self, save):
+        """
+        Encerra a thread de escrita do modo streaming.
+        Ao descartar, a escrita dos frames pendentes é pulada e o arquivo parcial é removido.
+        
+        Args:
+            save (bool): Se True, grava os frames pendentes e mantém o arquivo
             
-    def _save_video(self):
-        """Salva os frames capturados como arquivo de vídeo MP4"""
-        if not self.frames:
-            print("[VIDEO] Nenhum frame para salvar")
-            return
+        Returns:
+            bool: True se vídeo foi salvo, False caso contrário
+        """
+        self.discard = not save
+        self.frame_queue.put(None)
+        self.writer_thread.join()
+        
+        if save and self.frames_written and not self.writer_error:
+            print(
+                f"[VIDEO] Vídeo salvo com sucesso: {Path(self.output_path).name} "
+                f"(codec: {self.codec_used} | Frames: {self.frames_written} | FPS: {self.fps})"
+            )
+            return True
+        
+        if Path(self.output_path).exists():
+            Path(self.output_path).unlink()
+        print(f"[VIDEO] Gravação descartada ({self.frames_written} frames)")
+        return False
+            
+    def _finish_ring(self, save):
+        """
+        Codifica os frames do buffer circular (do mais antigo ao mais recente) se o vídeo for mantido.
+        Ao descartar não há nenhuma codificação.
+        
+        Args:
+            save (bool): Se True, grava os últimos segundos capturados
+            
+        Returns:
+            bool: True se vídeo foi salvo, False caso contrário
+        """
+        try:
+            if not save or not self.ring_count:
+                print(f"[VIDEO] Gravação descartada ({self.frames_captured} frames capturados, nenhum codificado)")
+                return False
+            
+            try:
+                height, width = self.ring_buffer.shape[1:3]
+                out = self._open_writer(width, height)
+                self._begin_timeline()
+                for frame, timestamps in self._ring_entries():
+                    self._write_entry(out, frame, timestamps)
+                self._finish_timeline(out, self.stopped_clock)
+                out.release()
+            except Exception as e:
+                print(f"[VIDEO] ERRO ao salvar vídeo: {e}")
+                return False
+            
+            print(
+                f"[VIDEO] Vídeo salvo com sucesso: {Path(self.output_path).name} "
+                f"(últimos {self.frames_written / self.fps:.1f}s de {self.stopped_at - self.started_at:.1f}s | "
+                f"codec: {self.codec_used})"
+            )
+            return True
+        finally:
+            self._release_ring_buffer()
+            
+    def _open_writer(self, width, height):
+        """
+        Cria o cv2.VideoWriter testando os codecs disponíveis.
         
+        Args:
+            width (int): Largura dos frames
+            height (int): Altura dos frames
+            
+        Returns:
+            cv2.VideoWriter aberto
+        """
         # Garante que o diretório existe
         Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
         
-        # Obtém dimensões do primeiro frame
-        height, width, _ = self.frames[0].shape
-        
-        # Tenta usar codecs nativos e compatíveis com navegadores
-        # Forçar uso de codecs que funcionam bem em navegadores
-        fourcc_options = [
-            ('mp4v', '.mp4'),  # MPEG-4 - MUITO compatível com navegadores
-            ('MJPG', '.mp4'),  # Motion JPEG em MP4 - Funciona em navegadores
-            ('avc1', '.mp4'),  # H.264 (AVC1) - Melhor compatibilidade mas pode falhar
-            ('H264', '.mp4'),  # H.264 alternativo - Nativo no Windows
-        ]
+        # Encoders que funcionaram no teste do processo, na ordem do formato escolhido
+        fourcc_options = self.encoders
         
         # Usa context manager para suprimir stderr durante criação do VideoWriter
         # Isso evita mensagens assustadoras sobre codecs não disponíveis
@@ -324,15 +1791,74 @@ class VideoRecorder:
         if not out.isOpened():
             raise Exception("Não foi possível criar o arquivo de vídeo")
         
-        # Escreve todos os frames
-        for frame in self.frames:
-            out.write(frame)
+        self.codec_used = codec_usado
+        self.frame_size = (width, height)
+        return out
+            
+    def _save_video(self):
+        """Salva os frames capturados como arquivo de vídeo (formato de self.video_format)"""
+        if not self.frames:
+            print("[VIDEO] Nenhum frame para salvar")
+            return
+        
+        entries = self._decoded_entries() if self.mode == 'comprimido' else iter(self.frames)
+        
+        # Obtém dimensões do primeiro frame
+        first_frame, first_timestamps = next(entries)
+        height, width = first_frame.shape[:2]
+        out = self._open_writer(width, height)
+        
+        # Escreve todos os frames na linha do tempo (expandindo as repetições)
+        self._begin_timeline()
+        self._write_entry(out, first_frame, first_timestamps)
+        for frame, timestamps in entries:
+            if frame.shape[:2] != (height, width):
+                # Janela redimensionada durante o cenário: mantém a resolução do vídeo
+                frame = cv2.resize(frame, (width, height))
+            self._write_entry(out, frame, timestamps)
+        self._finish_timeline(out, self.stopped_clock)
             
         out.release()
         
         # Informa qual codec foi usado com sucesso
-        if codec_usado:
-            print(f"[VIDEO] Codec selecionado: {codec_usado} | Frames: {len(self.frames)} | FPS: {self.fps}")
+        if self.codec_used:
+            detalhe = f" | Memória: {self.compressed_bytes / (1024**2):.1f} MB comprimidos" if self.mode == 'comprimido' else ""
+            print(f"[VIDEO] Codec selecionado: {self.codec_used} | Frames: {self.frames_written} | FPS: {self.fps}{detalhe}")
+    
+    def _decoded_entries(self):
+        """
+        Decodifica os frames do modo comprimido em um pool de threads, na ordem de gravação.
+        Mantém no máximo 2 frames decodificados por thread à frente da escrita.
+        
+        Yields:
+            tuple: (np.ndarray BGR, instantes da captura)
+        """
+        with ThreadPoolExecutor(max_workers=self.DECODER_THREADS, thread_name_prefix='video-decoder') as pool:
+            pending = deque()
+            for data, timestamps in self.frames:
+                pending.append((pool.submit(self._decode_frame, data), timestamps))
+                if len(pending) >= self.DECODER_THREADS * 2:
+                    future, pending_timestamps = pending.popleft()
+                    yield future.result(), pending_timestamps
+            while pending:
+                future, pending_timestamps = pending.popleft()
+                yield future.result(), pending_timestamps
+    
+    def _recompress_on_capture(self):
+        """Se o modo comprimido recomprime os frames (já na resolução final) ao capturar"""
+        return bool(self.compression_quality) or self.quality_settings['scale'] < 1
+    
+    def _decode_frame(self, data):
+        """Decodifica bytes PNG/JPEG em um frame BGR na resolução do nível de qualidade"""
+        decode_start = time.perf_counter()
+        frame = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        with self._decode_lock:
+            self.decode_seconds += time.perf_counter() - decode_start
+            self.frames_decoded += 1
+        if self._recompress_on_capture():
+            return frame
+        # Bytes guardados como o navegador entregou: aplica o tamanho máximo do nível
+        return self._scale_frame(frame)
         
     def delete_video(self):
         """
@@ -354,16 +1880,132 @@ class VideoRecorder:
             print(f"[VIDEO] Erro ao deletar vídeo: {e}")
             return False
             
+    def get_timestamp(self):
+        """
+        Retorna o instante atual no relógio da gravação (mesma base dos instantes dos frames).
+        Usado para marcar eventos do cenário (ex: passos) na linha do tempo do vídeo.
+        
+        Returns:
+            float: Instante atual (epoch em segundos)
+        """
+        return self._clock()
+    
+    def get_video_start(self):
+        """
+        Retorna o instante do frame 0 do vídeo (também quando a codificação foi deixada para depois).
+        Na caixa-preta o vídeo começa nos últimos segundos, não no início do cenário.
+        
+        Returns:
+            float: Instante (epoch em segundos) ou None se nenhum frame foi escrito
+        """
+        if self.encode_job:
+            return self.encode_job['video_started_at']
+        return self.video_started_at
+    
     def get_duration(self):
         """
         Retorna a duração do vídeo em segundos.
         
+        Antes da escrita, é o tempo real entre o início e o fim da gravação.
+        
         Returns:
             float: Duração em segundos
         """
-        if self.frames:
-            return len(self.frames) / self.fps
-        return 0.0
+        if self.frames_written:
+            return self.frames_written / self.fps
+        if self.started_at is None:
+            return 0.0
+        return (self.stopped_at or time.perf_counter()) - self.started_at
+        
+    def get_stats(self):
+        """
+        Retorna as estatísticas e a saúde do gravador (para comparar backends e dimensionar agentes).
+        
+        Returns:
+            dict: backend, FPS alvo/obtido, frames capturados/repetidos/pulados, CPU por frame,
+                latência de captura (percentis e histograma), tempos de decodificação, overlay e escrita
+                por frame, erros de captura, pico de memória dos frames e resultado da codificação
+        """
+        elapsed = ((self.stopped_at or time.perf_counter()) - self.started_at) if self.started_at else 0.0
+        backend_cpu = self.capture_backend.cpu_seconds if self.capture_backend else 0.0
+        cpu_total = self.capture_cpu_seconds + backend_cpu
+        decode_seconds = self.decode_seconds + getattr(self.capture_backend, 'decode_seconds', 0.0)
+        frames_decoded = self.frames_decoded + getattr(self.capture_backend, 'frames_decoded', 0)
+        latencies = list(self.capture_latencies)
+        return {
+            'backend': self.capture_backend.name if self.capture_backend else None,
+            'canal': self.capture_backend.channel_name if self.capture_backend else None,
+            'captura_adaptativa': self._adaptive_stats(elapsed),
+            'modo': self.mode,
+            'fps_alvo': self.fps,
+            'fps_obtido': round(self.frames_captured / elapsed, 2) if elapsed else 0.0,
+            'frames_capturados': self.frames_captured,
+            'frames_recebidos': getattr(self.capture_backend, 'frames_received', self.frames_captured),
+            'frames_duplicados': self.frames_deduplicated,
+            'frames_pulados': self.frames_skipped,
+            'erros_captura': self.capture_errors,
+            'cpu_ms_por_frame': round(cpu_total * 1000 / self.frames_captured, 2) if self.frames_captured else 0.0,
+            'latencia_captura_ms': {
+                'p50': round(calcular_percentil(latencies, 50), 1),
+                'p95': round(calcular_percentil(latencies, 95), 1),
+                'max': round(max(latencies), 1) if latencies else 0.0
+            },
+            'histograma_latencia_ms': self._latency_histogram(latencies),
+            'decodificacao_ms_por_frame': round(decode_seconds * 1000 / frames_decoded, 2) if frames_decoded else 0.0,
+            'overlays_aplicados': self.overlay_count,
+            'overlay_ms_por_frame': round(self.overlay_seconds * 1000 / self.overlay_count, 3) if self.overlay_count else 0.0,
+            # Taxa constante: repetições também passam pelo encoder (entram em escrita_ms_por_frame)
+            'frames_escritos': self.frames_written,
+            'frames_escritos_repetidos': self.frames_written - self.overlay_count,
+            'escrita_ms_por_frame': round(self.encode_seconds * 1000 / self.frames_written, 2) if self.frames_written else 0.0,
+            'pico_buffer_mb': round(self.peak_buffer_bytes / (1024**2), 2),
+            'qualidade': self.quality,
+            'resolucao': f"{self.frame_size[0]}x{self.frame_size[1]}" if self.frame_size else None,
+            'codificacao_s': round(self.encode_seconds, 3),
+            'arquivo_kb': round(Path(self.output_path).stat().st_size / 1024, 1) if Path(self.output_path).exists() else 0.0
+        }
+    
+    def _adaptive_stats(self, elapsed):
+        """
+        Resumo da captura adaptativa.
+        
+        Args:
+            elapsed (float): Duração da gravação em segundos
+            
+        Returns:
+            dict: FPS mínimo/máximo, segundos no FPS máximo e avisos por origem (None fora do modo adaptativo)
+        """
+        if not self.adaptive:
+            return None
+        # O último período de atividade pode ter sido cortado pelo fim da gravação
+        if self.recording or self.stopped_clock is None:
+            stopped = time.monotonic()
+        else:
+            stopped = self.clock_origin[1] + (self.stopped_clock - self.clock_origin[0])
+        active = self.active_seconds - max(0.0, self.activity_until - stopped)
+        return {
+            'fps_minimo': self.idle_fps,
+            'fps_maximo': self.fps,
+            'segundos_ativos': round(min(max(active, 0.0), elapsed), 2),
+            'avisos': dict(self.activity_counts)
+        }
+    
+    def _latency_histogram(self, latencies):
+        """
+        Conta as capturas por faixa de latência.
+        
+        Args:
+            latencies (list): Latências em ms
+            
+        Returns:
+            dict: rótulo da faixa ('<=10', ..., '>1000') -> quantidade
+        """
+        histogram = {f"<={limit}": 0 for limit in self.LATENCY_BUCKETS_MS}
+        histogram[f">{self.LATENCY_BUCKETS_MS[-1]}"] = 0
+        for latency in latencies:
+            limit = next((limit for limit in self.LATENCY_BUCKETS_MS if latency <= limit), None)
+            histogram[f"<={limit}" if limit is not None else f">{self.LATENCY_BUCKETS_MS[-1]}"] += 1
+        return histogram
         
     def get_frame_count(self):
         """
@@ -372,5 +2014,53 @@ class VideoRecorder:
         Returns:
             int: Número de frames
         """
-        return len(self.frames)
+        if self.mode == 'streaming':
+            return self.frames_written
+        if self.mode == 'caixa_preta':
+            return sum(len(timestamps) for timestamps in self.ring_timestamps[:self.ring_count])
+        return sum(len(timestamps) for _, timestamps in self.frames)
 
+
+def encode_spilled_video(job):
+    """
+    Codifica um vídeo a partir do arquivo temporário gerado por stop_recording(defer_encode=True).
+    Função de módulo para rodar em um processo do pool de codificação; o arquivo temporário é
+    removido ao final, com ou sem sucesso.
+    
+    Args:
+        job (dict): VideoRecorder.encode_job
+        
+    Returns:
+        dict: output_path, frames, codec, codificacao_s e arquivo_kb
+    """
+    recorder = VideoRecorder(
+        job['output_path'],
+        fps=job['fps'],
+        mode='comprimido' if job['encoded'] else 'memoria',
+        compression_quality=job['compression_quality'],
+        quality=job['quality'],
+        video_format=job['video_format']
+    )
+    # Cópia na escrita: o overlay é aplicado no próprio frame sem alterar o arquivo
+    spill = np.memmap(job['spill_path'], dtype=np.uint8, mode='c')
+    try:
+        for offset, size, shape, timestamps in job['layout']:
+            data = spill[offset:offset + size]
+            recorder.frames.append((data if shape is None else data.reshape(shape), timestamps))
+        recorder.stopped_clock = job['end_timestamp']
+        
+        start = time.perf_counter()
+        recorder._save_video()
+        elapsed = time.perf_counter() - start
+    finally:
+        recorder.frames = []
+        del spill
+        Path(job['spill_path']).unlink(missing_ok=True)
+    
+    return {
+        'output_path': recorder.output_path,
+        'frames': recorder.frames_written,
+        'codec': recorder.codec_used,
+        'codificacao_s': round(elapsed, 3),
+        'arquivo_kb': round(Path(recorder.output_path).stat().st_size / 1024, 1)
+    }
@@ -0,0 +1,102 @@
+import math
+import time
+from contextlib import contextmanager
+
+
+def calcular_percentil(valores, percentil):
+    """
+    Calcula o percentil pelo método nearest-rank
+
+    Args:
+        valores: Lista de números
+        percentil: Percentil desejado (0-100)
+
+    Returns:
+        Valor do percentil, ou 0.0 se a lista estiver vazia
+    """
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    posicao = max(math.ceil(percentil / 100 * len(ordenados)), 1)
+    return ordenados[posicao - 1]
+
+
+class PerfiladorDeFases:
+    """
+    Mede o tempo de cada fase dos hooks do Behave por cenário (abertura do navegador,
+    início/fim do vídeo, screenshots, fechamento...) com relógio monotônico.
+    Mostra onde está o custo do framework em cada cenário, além dos passos em si.
+    """
+
+    def __init__(self):
+        """Inicializa o perfilador sem cenário em andamento"""
+        self.fases_cenario = {}
+        self.historico = []
+        self.inicio_passos = None
+
+    def iniciar_cenario(self):
+        """Descarta as medições anteriores e começa um novo cenário"""
+        self.fases_cenario = {}
+        self.inicio_passos = None
+
+    @contextmanager
+    def medir(self, fase):
+        """
+        Mede o bloco e soma o tempo na fase (uma fase pode ser medida várias vezes por cenário)
+
+        Args:
+            fase: Nome da fase (ex: 'abertura_navegador')
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.fases_cenario[fase] = self.fases_cenario.get(fase, 0.0) + time.perf_counter() - inicio
+
+    def marcar_inicio_passos(self):
+        """Marca o fim do before_scenario (início da execução dos passos)"""
+        self.inicio_passos = time.perf_counter()
+
+    def marcar_fim_passos(self):
+        """
+        Marca o início do after_scenario.
+        O tempo dos passos desconta o que foi gasto nos after_step (screenshots).
+        """
+        if self.inicio_passos is None:
+            return
+        decorrido = time.perf_counter() - self.inicio_passos
+        self.fases_cenario['passos'] = max(decorrido - self.fases_cenario.get('screenshots', 0.0), 0.0)
+        self.inicio_passos = None
+
+    def finalizar_cenario(self):
+        """
+        Encerra as medições do cenário
+
+        Returns:
+            Dict fase -> segundos do cenário
+        """
+        fases = {fase: round(segundos, 4) for fase, segundos in self.fases_cenario.items()}
+        self.historico.append(fases)
+        self.fases_cenario = {}
+        return fases
+
+    def obter_resumo(self):
+        """
+        Calcula p50/p95 e total de cada fase na execução
+
+        Returns:
+            Dict fase -> {'p50_segundos', 'p95_segundos', 'total_segundos'}
+        """
+        amostras_por_fase = {}
+        for fases in self.historico:
+            for fase, segundos in fases.items():
+                amostras_por_fase.setdefault(fase, []).append(segundos)
+
+        return {
+            fase: {
+                'p50_segundos': round(calcular_percentil(amostras, 50), 3),
+                'p95_segundos': round(calcular_percentil(amostras, 95), 3),
+                'total_segundos': round(sum(amostras), 3)
+            }
+            for fase, amostras in amostras_por_fase.items()
+        }
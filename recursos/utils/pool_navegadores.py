@@ -0,0 +1,120 @@
+import time
+
+from recursos.utils.gerenciador_navegador import GerenciadorDeNavegador
+
+
+class PoolDeNavegadores:
+    """
+    Mantém sessões do navegador aquecidas para reaproveitamento entre cenários.
+    Evita o custo de abrir o navegador e negociar o driver a cada cenário,
+    resetando o estado da sessão (cookies, storage, janelas) entre um uso e outro.
+    """
+
+    def __init__(self, configuracao):
+        """
+        Inicializa o pool de navegadores
+
+        Args:
+            configuracao: Instância de GerenciadorDeConfiguracao
+        """
+        self.configuracao = configuracao
+        self.sessoes_livres = []
+        self.tempos_inicializacao = []
+        self.tempos_reset = []
+        self.sessoes_criadas = 0
+        self.sessoes_reutilizadas = 0
+        self.sessoes_recicladas = 0
+
+    def obter_navegador(self):
+        """
+        Entrega um navegador pronto para o cenário.
+        Reaproveita uma sessão livre quando possível, senão abre uma nova.
+
+        Returns:
+            GerenciadorDeNavegador com driver inicializado
+        """
+        while self.sessoes_livres:
+            gerenciador = self.sessoes_livres.pop()
+
+            inicio = time.perf_counter()
+            if gerenciador.resetar_estado():
+                self.tempos_reset.append(time.perf_counter() - inicio)
+                self.sessoes_reutilizadas += 1
+                print(
+                    f"[POOL] Sessão reaproveitada "
+                    f"({gerenciador.cenarios_executados}/{self.configuracao.navegador_pool_max_cenarios} cenários)"
+                )
+                return gerenciador
+
+            self._reciclar(gerenciador, "falha ao resetar a sessão")
+
+        gerenciador = GerenciadorDeNavegador(self.configuracao)
+        gerenciador.inicializar_navegador()
+        self.tempos_inicializacao.append(gerenciador.tempo_inicializacao)
+        self.sessoes_criadas += 1
+        return gerenciador
+
+    def devolver_navegador(self, gerenciador):
+        """
+        Devolve o navegador ao pool após o cenário.
+        A sessão é reciclada se travou ou atingiu o limite de cenários.
+
+        Args:
+            gerenciador: GerenciadorDeNavegador obtido com obter_navegador()
+        """
+        if gerenciador is None:
+            return
+
+        gerenciador.cenarios_executados += 1
+
+        if not gerenciador.sessao_ativa():
+            self._reciclar(gerenciador, "sessão não responde")
+        elif gerenciador.cenarios_executados >= self.configuracao.navegador_pool_max_cenarios:
+            self._reciclar(gerenciador, "limite de cenários atingido")
+        else:
+            self.sessoes_livres.append(gerenciador)
+
+    def _reciclar(self, gerenciador, motivo):
+        """
+        Fecha uma sessão que não deve mais ser reaproveitada
+
+        Args:
+            gerenciador: GerenciadorDeNavegador a ser descartado
+            motivo: Motivo da reciclagem (para log)
+        """
+        print(f"[POOL] Reciclando sessão: {motivo}")
+        gerenciador.fechar_navegador()
+        self.sessoes_recicladas += 1
+
+    def encerrar(self):
+        """Fecha todas as sessões livres do pool"""
+        while self.sessoes_livres:
+            self.sessoes_livres.pop().fechar_navegador()
+        print("[POOL] Pool de navegadores encerrado")
+
+    def obter_estatisticas(self):
+        """
+        Calcula as estatísticas do pool, incluindo o tempo economizado.
+        A economia é estimada pela média de inicialização menos o custo de cada reset.
+
+        Returns:
+            Dict com as estatísticas do pool
+        """
+        media_inicializacao = (
+            sum(self.tempos_inicializacao) / len(self.tempos_inicializacao)
+            if self.tempos_inicializacao else 0.0
+        )
+        tempo_economizado = sum(
+            max(media_inicializacao - tempo_reset, 0.0) for tempo_reset in self.tempos_reset
+        )
+
+        return {
+            'sessoes_criadas': self.sessoes_criadas,
+            'sessoes_reutilizadas': self.sessoes_reutilizadas,
+            'sessoes_recicladas': self.sessoes_recicladas,
+            'media_inicializacao_segundos': round(media_inicializacao, 3),
+            'media_reset_segundos': round(
+                sum(self.tempos_reset) / len(self.tempos_reset), 3
+            ) if self.tempos_reset else 0.0,
+            'tempo_economizado_segundos': round(tempo_economizado, 3)
+        }
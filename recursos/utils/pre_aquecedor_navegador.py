@@ -0,0 +1,129 @@
+import atexit
+import threading
+import time
+
+from recursos.utils.gerenciador_navegador import GerenciadorDeNavegador
+
+
+class PreAquecedorDeNavegador:
+    """
+    Abre o navegador do próximo cenário em segundo plano enquanto o cenário atual executa.
+    O before_scenario recebe um navegador já pronto em vez de esperar a inicialização,
+    escondendo a latência de abertura atrás da execução e do teardown do cenário anterior.
+    """
+
+    def __init__(self, configuracao):
+        """
+        Inicializa o pré-aquecedor de navegador
+
+        Args:
+            configuracao: Instância de GerenciadorDeConfiguracao
+        """
+        self.configuracao = configuracao
+        self.thread = None
+        self.gerenciador_preparado = None
+        self.erro_preparo = None
+        self.trava = threading.Lock()
+        self.lancamentos_antecipados = 0
+        self.lancamentos_sincronos = 0
+        self.lancamentos_descartados = 0
+        self.tempo_oculto = 0.0
+        self.tempo_espera = 0.0
+
+        # Garante que um navegador aberto em segundo plano não fique órfão se a execução abortar
+        atexit.register(self.encerrar)
+
+    def preparar_proximo(self):
+        """Inicia a abertura do navegador do próximo cenário em uma thread separada"""
+        if self.thread and self.thread.is_alive():
+            return
+
+        with self.trava:
+            self.gerenciador_preparado = None
+            self.erro_preparo = None
+
+        self.thread = threading.Thread(
+            target=self._abrir_em_segundo_plano,
+            name='pre-aquecimento-navegador',
+            daemon=True
+        )
+        self.thread.start()
+
+    def _abrir_em_segundo_plano(self):
+        """Abre o navegador na thread de pré-aquecimento"""
+        gerenciador = GerenciadorDeNavegador(self.configuracao)
+        try:
+            gerenciador.inicializar_navegador()
+            with self.trava:
+                self.gerenciador_preparado = gerenciador
+        except Exception as erro:
+            gerenciador.fechar_navegador()
+            with self.trava:
+                self.erro_preparo = erro
+
+    def obter_navegador(self):
+        """
+        Entrega o navegador pré-aquecido, aguardando se ainda estiver abrindo.
+        Se não houver navegador preparado (primeiro cenário ou falha), abre um na hora.
+
+        Returns:
+            GerenciadorDeNavegador com driver inicializado
+        """
+        gerenciador = None
+
+        if self.thread:
+            inicio = time.perf_counter()
+            self.thread.join()
+            espera = time.perf_counter() - inicio
+            self.thread = None
+
+            with self.trava:
+                gerenciador, self.gerenciador_preparado = self.gerenciador_preparado, None
+                erro = self.erro_preparo
+
+            if gerenciador:
+                self.lancamentos_antecipados += 1
+                self.tempo_espera += espera
+                self.tempo_oculto += max(gerenciador.tempo_inicializacao - espera, 0.0)
+                print(
+                    f"[PRE-AQUECIMENTO] Navegador pronto entregue "
+                    f"(espera {espera:.2f}s de {gerenciador.tempo_inicializacao:.2f}s de abertura)"
+                )
+            else:
+                print(f"[PRE-AQUECIMENTO] Falha ao abrir em segundo plano: {erro}")
+
+        if gerenciador is None:
+            gerenciador = GerenciadorDeNavegador(self.configuracao)
+            gerenciador.inicializar_navegador()
+            self.lancamentos_sincronos += 1
+
+        return gerenciador
+
+    def encerrar(self):
+        """Fecha o navegador pré-aquecido que não chegou a ser usado"""
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=self.configuracao.timeout_carregamento_pagina)
+        self.thread = None
+
+        with self.trava:
+            gerenciador, self.gerenciador_preparado = self.gerenciador_preparado, None
+
+        if gerenciador:
+            gerenciador.fechar_navegador()
+            self.lancamentos_descartados += 1
+            print("[PRE-AQUECIMENTO] Navegador pré-aquecido não utilizado foi fechado")
+
+    def obter_estatisticas(self):
+        """
+        Retorna as estatísticas do pré-aquecimento
+
+        Returns:
+            Dict com quantidade de aberturas e a latência de abertura escondida
+        """
+        return {
+            'lancamentos_antecipados': self.lancamentos_antecipados,
+            'lancamentos_sincronos': self.lancamentos_sincronos,
+            'lancamentos_descartados': self.lancamentos_descartados,
+            'tempo_espera_segundos': round(self.tempo_espera, 3),
+            'tempo_oculto_segundos': round(self.tempo_oculto, 3)
+        }
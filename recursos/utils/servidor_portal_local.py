@@ -0,0 +1,231 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Usuários aceitos pelo Portal local (mesmos dados de features/portal/autenticacao.feature)
+USUARIOS_PORTAL_LOCAL = {
+    'maria': {'senha': '123456', 'nome': 'Maria', 'perfil': 'Colaborador'},
+    'joao': {'senha': '123456', 'nome': 'João', 'perfil': 'Gestor RH'},
+    'admin': {'senha': 'admin123', 'nome': 'Administrador', 'perfil': 'Admin'}
+}
+
+# Página de login com os mesmos seletores usados por PaginaLoginPortal
+PAGINA_LOGIN = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="utf-8">
+    <title>Portal de Colaboradores - Login</title>
+</head>
+<body>
+    <main>
+        <h2 class="text-2xl font-bold">Portal de Colaboradores</h2>
+        <form id="formulario-login">
+            <input type="text" name="usuario" placeholder="Digite seu usuário ou e-mail">
+            <input type="password" name="senha" placeholder="Digite sua senha">
+            <button type="submit">Entrar</button>
+        </form>
+        <p id="mensagem-erro" role="alert" hidden></p>
+    </main>
+    <script>
+        document.getElementById('formulario-login').addEventListener('submit', function (evento) {
+            evento.preventDefault();
+            var formulario = evento.target;
+            fetch('/api/login', {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({usuario: formulario.usuario.value, senha: formulario.senha.value})
+            }).then(function (resposta) {
+                return resposta.json().then(function (dados) {
+                    if (!resposta.ok) { throw new Error(dados.mensagem); }
+                    sessionStorage.setItem('usuarioPortal', JSON.stringify(dados));
+                    window.location.href = '/home';
+                });
+            }).catch(function (erro) {
+                var mensagem = document.getElementById('mensagem-erro');
+                mensagem.textContent = erro.message;
+                mensagem.hidden = false;
+            });
+        });
+    </script>
+    <!-- {preenchimento} -->
+</body>
+</html>
+"""
+
+# Página inicial da área logada (mensagem de boas-vindas usada por MENSAGEM_BEM_VINDO)
+PAGINA_HOME = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="utf-8">
+    <title>Portal de Colaboradores - Início</title>
+</head>
+<body>
+    <main>
+        <h1 id="boas-vindas"></h1>
+        <p id="perfil"></p>
+        <ul id="resumo"></ul>
+    </main>
+    <script>
+        var usuario = JSON.parse(sessionStorage.getItem('usuarioPortal') || 'null');
+        if (!usuario) {
+            window.location.href = '/login';
+        } else {
+            document.getElementById('boas-vindas').textContent = 'Olá, ' + usuario.nome;
+            document.getElementById('perfil').textContent = usuario.perfil;
+            fetch('/api/resumo').then(function (resposta) { return resposta.json(); }).then(function (dados) {
+                dados.avisos.forEach(function (aviso) {
+                    var item = document.createElement('li');
+                    item.textContent = aviso;
+                    document.getElementById('resumo').appendChild(item);
+                });
+            });
+        }
+    </script>
+    <!-- {preenchimento} -->
+</body>
+</html>
+"""
+
+
+class _ManipuladorPortalLocal(BaseHTTPRequestHandler):
+    """Atende as rotas do Portal local (páginas e API)"""
+
+    def do_GET(self):
+        """Serve páginas e o resumo da área logada"""
+        self._aplicar_latencia()
+        rota = self.path.split('?', 1)[0]
+
+        if rota in ('/', '/login'):
+            self._responder(200, 'text/html; charset=utf-8', self._montar_pagina(PAGINA_LOGIN))
+        elif rota == '/home':
+            self._responder(200, 'text/html; charset=utf-8', self._montar_pagina(PAGINA_HOME))
+        elif rota == '/api/resumo':
+            self._responder_json(200, {
+                'avisos': ['Nenhuma pendência', 'Folha de pagamento disponível']
+            })
+        else:
+            self._responder_json(404, {'mensagem': 'Página não encontrada'})
+
+    def do_POST(self):
+        """Valida usuário e senha do formulário de login"""
+        self._aplicar_latencia()
+        if self.path != '/api/login':
+            self._responder_json(404, {'mensagem': 'Página não encontrada'})
+            return
+
+        tamanho = int(self.headers.get('Content-Length', 0))
+        try:
+            credenciais = json.loads(self.rfile.read(tamanho) or b'{}')
+        except ValueError:
+            credenciais = {}
+
+        usuario = USUARIOS_PORTAL_LOCAL.get(credenciais.get('usuario', ''))
+        if usuario and usuario['senha'] == credenciais.get('senha'):
+            self._responder_json(200, {'nome': usuario['nome'], 'perfil': usuario['perfil']})
+        else:
+            self._responder_json(401, {'mensagem': 'Usuário ou senha inválidos'})
+
+    def _aplicar_latencia(self):
+        """Simula o tempo de resposta do servidor remoto"""
+        if self.server.latencia_segundos:
+            time.sleep(self.server.latencia_segundos)
+
+    def _montar_pagina(self, modelo):
+        """Insere o preenchimento configurado (tamanho da resposta) na página"""
+        return modelo.replace('{preenchimento}', self.server.preenchimento).encode('utf-8')
+
+    def _responder_json(self, status, dados):
+        """
+        Envia uma resposta JSON com o preenchimento configurado.
+        O preenchimento vai como espaços após o JSON (válidos na sintaxe): o tamanho da resposta
+        cresce sem mudar os dados que a página lê (o login é guardado no sessionStorage).
+        """
+        corpo = json.dumps(dados, ensure_ascii=False).encode('utf-8')
+        corpo += b' ' * len(self.server.preenchimento)
+        self._responder(status, 'application/json; charset=utf-8', corpo)
+
+    def _responder(self, status, tipo_conteudo, corpo):
+        """Envia a resposta HTTP"""
+        self.send_response(status)
+        self.send_header('Content-Type', tipo_conteudo)
+        self.send_header('Content-Length', str(len(corpo)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *argumentos):
+        """Silencia o log de cada requisição para não poluir a saída dos testes"""
+
+
+class ServidorPortalLocal:
+    """
+    Servidor HTTP local que imita o Portal de Colaboradores (login e /home).
+    Permite medir o custo do próprio framework sem rede e sem a variação do ambiente
+    de homologação, com latência e tamanho de resposta controlados pela configuração.
+    """
+
+    def __init__(self, configuracao):
+        """
+        Inicializa o servidor do Portal local
+
+        Args:
+            configuracao: Instância de GerenciadorDeConfiguracao
+        """
+        self.configuracao = configuracao
+        self.servidor = None
+        self.thread = None
+
+    @property
+    def url(self):
+        """URL base do Portal local"""
+        return f"http://127.0.0.1:{self.configuracao.portal_local_porta}"
+
+    def iniciar(self):
+        """
+        Sobe o servidor em uma thread de segundo plano
+
+        Returns:
+            URL base do Portal local
+        """
+        self.servidor = ThreadingHTTPServer(
+            ('127.0.0.1', self.configuracao.portal_local_porta),
+            _ManipuladorPortalLocal
+        )
+        self.servidor.daemon_threads = True
+        self.servidor.latencia_segundos = self.configuracao.portal_local_latencia_ms / 1000
+        self.servidor.preenchimento = 'x' * (self.configuracao.portal_local_tamanho_kb * 1024)
+
+        self.thread = threading.Thread(
+            target=self.servidor.serve_forever,
+            name='portal-local',
+            daemon=True
+        )
+        self.thread.start()
+
+        print(
+            f"[PORTAL LOCAL] Servindo em {self.url} "
+            f"(latência {self.configuracao.portal_local_latencia_ms}ms, "
+            f"+{self.configuracao.portal_local_tamanho_kb}KB por resposta)"
+        )
+        return self.url
+
+    def encerrar(self):
+        """Para o servidor"""
+        if self.servidor:
+            self.servidor.shutdown()
+            self.servidor.server_close()
+            self.servidor = None
+            print("[PORTAL LOCAL] Servidor encerrado")
+
+
+if __name__ == '__main__':
+    from recursos.utils.gerenciador_configuracao import GerenciadorDeConfiguracao
+
+    servidor_portal = ServidorPortalLocal(GerenciadorDeConfiguracao())
+    servidor_portal.iniciar()
+    try:
+        servidor_portal.thread.join()
+    except KeyboardInterrupt:
+        servidor_portal.encerrar()
@@ -15,7 +15,11 @@ import cv2
 from pathlib import Path
 
 # Desabilita logs do OpenCV
-cv2.setLogLevel(0)
+# (OpenCV 5 moveu setLogLevel para cv2.utils.logging)
+if hasattr(cv2, 'setLogLevel'):
+    cv2.setLogLevel(0)
+else:
+    cv2.utils.logging.setLogLevel(cv2.utils.logging.LOG_LEVEL_SILENT)
 
 
 def convert_to_webm(input_path, output_path=None):
@@ -164,10 +168,10 @@ def ensure_web_compatible_video(video_path):
         print(f"[CONVERTER] Vídeo atual usa codec: {fourcc_str}")
         
         # Codecs nativos e compatíveis com navegadores (não precisam conversão)
-        compatible_codecs = ['avc1', 'AVC1', 'h264', 'H264', 'MJPG', 'mjpg']
+        compatible_codecs = ['avc1', 'AVC1', 'h264', 'H264', 'VP80', 'VP90']
         
-        # Codecs problemáticos que precisam conversão
-        problematic_codecs = ['mp4v', 'MP4V', 'FMP4']
+        # Codecs problemáticos que precisam conversão (os navegadores não tocam Motion JPEG)
+        problematic_codecs = ['mp4v', 'MP4V', 'FMP4', 'MJPG', 'mjpg']
         
         # Verifica se é compatível
         if fourcc_str in compatible_codecs:
@@ -0,0 +1,527 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Executor paralelo dos testes Behave.
+Distribui features/cenários entre N processos worker (cada um com seu próprio
+navegador e diretórios de evidências) e mescla os resultados em
+reports/results.json + reports/metadata_temp.json para o generate_report.py.
+
+Uso:
+    python run_parallel.py
+    python run_parallel.py --workers 4 --granularidade feature --tags @portal
+    python run_parallel.py features/portal -- --junit --junit-directory reports
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from behave.parser import parse_file
+from behave.tag_expression import make_tag_expression
+
+from recursos.utils.executor_behave import montar_comando_behave
+from recursos.utils.gerenciador_configuracao import GerenciadorDeConfiguracao
+from recursos.utils.gerenciador_evidencias import GerenciadorDeEvidencias
+from recursos.utils.servidor_portal_local import ServidorPortalLocal
+
+
+def descobrir_unidades(caminhos, granularidade, tags=None):
+    """
+    Lista as unidades de execução (features ou cenários) nos caminhos informados
+
+    Args:
+        caminhos: Lista de arquivos .feature ou diretórios
+        granularidade: 'feature' ou 'cenario'
+        tags: Expressão de tags do Behave para filtrar cenários (opcional)
+
+    Returns:
+        Lista de locations no formato aceito pelo Behave (arquivo ou arquivo:linha)
+    """
+    expressao_tags = make_tag_expression(tags) if tags else None
+    unidades = []
+
+    for caminho in caminhos:
+        caminho = Path(caminho)
+        arquivos = sorted(caminho.rglob('*.feature')) if caminho.is_dir() else [caminho]
+
+        for arquivo in arquivos:
+            feature = parse_file(str(arquivo))
+            if feature is None:
+                continue
+
+            # walk_scenarios() expande cada linha de Exemplos do Esquema do Cenário
+            cenarios = [
+                cenario for cenario in feature.walk_scenarios()
+                if expressao_tags is None or cenario.should_run_with_tags(expressao_tags)
+            ]
+            if not cenarios:
+                continue
+
+            if granularidade == 'feature':
+                unidades.append(arquivo.as_posix())
+            else:
+                unidades.extend(
+                    f"{arquivo.as_posix()}:{cenario.location.line}" for cenario in cenarios
+                )
+
+    return unidades
+
+
+def distribuir_unidades(unidades, total_workers):
+    """
+    Distribui as unidades entre os workers (round-robin, mantendo a ordem original)
+
+    Args:
+        unidades: Lista de locations
+        total_workers: Quantidade de workers
+
+    Returns:
+        Lista de listas de locations (uma por worker, sem listas vazias)
+    """
+    lotes = [[] for _ in range(total_workers)]
+    for indice, unidade in enumerate(unidades):
+        lotes[indice % total_workers].append(unidade)
+    return [lote for lote in lotes if lote]
+
+
+def iniciar_worker(indice, unidades, diretorio_worker, argumentos_behave, modo_logs):
+    """
+    Inicia um processo worker do Behave com diretórios de evidências próprios
+
+    Args:
+        indice: Número do worker
+        unidades: Locations a executar neste worker
+        diretorio_worker: Path do diretório exclusivo do worker
+        argumentos_behave: Argumentos extras repassados ao Behave
+        modo_logs: 'arquivo' ou 'console'
+
+    Returns:
+        Tupla (processo, arquivo_log) - arquivo_log é None no modo console
+    """
+    diretorio_worker.mkdir(parents=True, exist_ok=True)
+
+    ambiente = os.environ.copy()
+    ambiente['DIRETORIO_SCREENSHOTS'] = str(diretorio_worker / 'screenshots')
+    ambiente['DIRETORIO_VIDEOS'] = str(diretorio_worker / 'videos')
+    ambiente['DIRETORIO_METADADOS'] = str(diretorio_worker)
+    ambiente['PARALELO_WORKER_ID'] = str(indice)
+    ambiente['PYTHONIOENCODING'] = 'utf-8'
+
+    # Sem os formatadores do behave.ini (pretty em ./stdout e JSON no reports/results.json compartilhado)
+    comando = montar_comando_behave([
+        '-f', 'json.pretty', '-o', str(diretorio_worker / 'results.json'),
+        '-f', 'plain',
+        *argumentos_behave,
+        *unidades
+    ])
+
+    arquivo_log = None
+    saida = None
+    if modo_logs == 'arquivo':
+        arquivo_log = open(diretorio_worker / 'behave.log', 'w', encoding='utf-8')
+        saida = arquivo_log
+
+    processo = subprocess.Popen(comando, env=ambiente, stdout=saida, stderr=subprocess.STDOUT if saida else None)
+    print(f"[PARALELO] Worker {indice} iniciado (PID {processo.pid}) com {len(unidades)} unidade(s)")
+    return processo, arquivo_log
+
+
+def _linha_do_location(location):
+    """Extrai o número da linha de um location 'arquivo:linha'"""
+    try:
+        return int(str(location).rsplit(':', 1)[1])
+    except (IndexError, ValueError):
+        return 0
+
+
+def _prioridade_status(cenario):
+    """
+    Define qual versão de um cenário vale no merge: cada worker também lista
+    como 'skipped' os cenários da feature que foram executados por outro worker
+    """
+    status = cenario.get('status')
+    if status in (None, 'skipped'):
+        return 0
+    if status == 'untested':
+        return 1
+    return 2
+
+
+def _agrupar_elementos(elementos):
+    """
+    Agrupa cada cenário com o background que o precede no JSON do Behave
+
+    Returns:
+        Lista de tuplas (background ou None, cenário)
+    """
+    grupos = []
+    background_pendente = None
+    for elemento in elementos:
+        if elemento.get('type') == 'background':
+            background_pendente = elemento
+        else:
+            grupos.append((background_pendente, elemento))
+            background_pendente = None
+    return grupos
+
+
+def mesclar_resultados(arquivos_resultados):
+    """
+    Mescla os results.json dos workers em uma única lista de features.
+    Cada cenário aparece uma vez (a versão executada tem prioridade sobre a pulada)
+    e a ordem segue a posição no arquivo .feature.
+
+    Args:
+        arquivos_resultados: Lista de Paths para os results.json dos workers
+
+    Returns:
+        Lista de features no formato do formatter JSON do Behave
+    """
+    features = {}
+
+    for arquivo in arquivos_resultados:
+        if not arquivo.exists():
+            print(f"[PARALELO] Resultado não encontrado: {arquivo}")
+            continue
+
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+
+        for feature in dados:
+            chave_feature = feature.get('location', feature.get('name'))
+            destino = features.setdefault(chave_feature, {'feature': feature, 'cenarios': {}})
+
+            for background, cenario in _agrupar_elementos(feature.get('elements', [])):
+                chave_cenario = cenario.get('location')
+                existente = destino['cenarios'].get(chave_cenario)
+                if existente is None or _prioridade_status(cenario) > _prioridade_status(existente[1]):
+                    destino['cenarios'][chave_cenario] = (background, cenario)
+
+    resultado = []
+    for item in features.values():
+        feature = dict(item['feature'])
+        elementos = []
+        status_cenarios = []
+
+        for chave in sorted(item['cenarios'], key=_linha_do_location):
+            background, cenario = item['cenarios'][chave]
+            if background:
+                elementos.append(background)
+            elementos.append(cenario)
+            status_cenarios.append(cenario.get('status'))
+
+        feature['elements'] = elementos
+        if 'failed' in status_cenarios:
+            feature['status'] = 'failed'
+        elif 'passed' in status_cenarios:
+            feature['status'] = 'passed'
+        else:
+            feature['status'] = 'skipped'
+        resultado.append(feature)
+
+    return resultado
+
+
+# Médias dos workers ponderadas pela quantidade de amostras de cada um (chave irmã no mesmo dicionário)
+PESOS_DAS_MEDIAS = {
+    'media_inicializacao_segundos': 'sessoes_criadas',
+    'media_reset_segundos': 'sessoes_reutilizadas'
+}
+
+# Valores "primeiro"/"pico" de cada worker: o consolidado é o maior deles (somar multiplicaria por N)
+PREFIXOS_MAXIMO = ('primeira_', 'pico_', 'maximo_')
+
+
+def _mesclar_desempenho(desempenhos):
+    """
+    Mescla as métricas de desempenho dos workers.
+    Contadores e tempos acumulados são somados; médias 'media_*' são recalculadas com o peso
+    de cada worker (PESOS_DAS_MEDIAS, ou peso igual sem contador); valores 'primeira_*'/'pico_*'
+    usam o maior; textos diferentes entre os workers são listados; dicionários são mesclados
+    recursivamente e listas são concatenadas.
+
+    Args:
+        desempenhos: Lista com a seção 'desempenho' de cada worker
+
+    Returns:
+        Dict consolidado
+    """
+    resultado = {}
+    chaves = []
+    for desempenho in desempenhos:
+        chaves.extend(chave for chave in desempenho if chave not in chaves)
+
+    for chave in chaves:
+        presentes = [desempenho for desempenho in desempenhos if chave in desempenho]
+        valores = [desempenho[chave] for desempenho in presentes]
+
+        if all(isinstance(valor, dict) for valor in valores):
+            resultado[chave] = _mesclar_desempenho(valores)
+        elif all(isinstance(valor, list) for valor in valores):
+            resultado[chave] = [item for valor in valores for item in valor]
+        elif all(isinstance(valor, (int, float)) and not isinstance(valor, bool) for valor in valores):
+            if chave.startswith('media_'):
+                chave_peso = PESOS_DAS_MEDIAS.get(chave)
+                pesos = [desempenho.get(chave_peso, 0) if chave_peso else 1 for desempenho in presentes]
+                if not sum(pesos):
+                    pesos = [1] * len(valores)
+                resultado[chave] = round(
+                    sum(valor * peso for valor, peso in zip(valores, pesos)) / sum(pesos), 3
+                )
+            elif chave.startswith(PREFIXOS_MAXIMO):
+                resultado[chave] = max(valores)
+            else:
+                total = sum(valores)
+                resultado[chave] = round(total, 4) if isinstance(total, float) else total
+        else:
+            distintos = []
+            for valor in valores:
+                if valor not in distintos:
+                    distintos.append(valor)
+            resultado[chave] = distintos[0] if len(distintos) == 1 else ', '.join(str(valor) for valor in distintos)
+
+    return resultado
+
+
+def mesclar_metadados(arquivos_metadados, inicio, fim, resumo_workers):
+    """
+    Mescla os metadata_temp.json dos workers
+
+    Args:
+        arquivos_metadados: Lista de Paths para os metadata_temp.json dos workers
+        inicio: datetime de início da execução paralela
+        fim: datetime de término da execução paralela
+        resumo_workers: Lista com informações de cada worker
+
+    Returns:
+        Dict de metadados no formato do GerenciadorDeRelatorio
+    """
+    metadados = {}
+    desempenhos = []
+    cenarios = {}
+
+    for arquivo in arquivos_metadados:
+        if not arquivo.exists():
+            continue
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+
+        for secao in ('sistema', 'navegador', 'ambiente_teste'):
+            if dados.get(secao) and not metadados.get(secao):
+                metadados[secao] = dados[secao]
+        desempenhos.append(dados.get('desempenho', {}))
+        cenarios.update(dados.get('cenarios', {}))
+
+    metadados['execucao'] = {
+        'horario_inicio': inicio.isoformat(),
+        'horario_fim': fim.isoformat(),
+        'duracao_segundos': (fim - inicio).total_seconds()
+    }
+    desempenho = _mesclar_desempenho(desempenhos)
+    desempenho['execucao_paralela'] = {'workers': resumo_workers}
+    metadados['desempenho'] = desempenho
+    metadados['cenarios'] = cenarios
+    return metadados
+
+
+def _mover_evidencias(diretorio_origem, diretorio_destino, indice_worker):
+    """
+    Move screenshots/vídeos de um worker para o diretório principal.
+    Os nomes só têm timestamp e cenário/passo: se já existir um arquivo com o mesmo nome (de outro
+    worker), os arquivos desse nome base (vídeo, capítulos .vtt) recebem o sufixo _w<worker>.
+
+    Args:
+        diretorio_origem: Diretório de evidências do worker
+        diretorio_destino: Diretório principal
+        indice_worker: Número do worker (sufixo em caso de colisão)
+
+    Returns:
+        Dict nome original -> nome novo dos arquivos renomeados
+    """
+    renomeados = {}
+    if not diretorio_origem.exists():
+        return renomeados
+
+    diretorio_destino.mkdir(parents=True, exist_ok=True)
+    arquivos = [arquivo for arquivo in diretorio_origem.iterdir() if arquivo.is_file()]
+
+    # Nome base = até o primeiro ponto (video_x.webm e video_x.vtt; replay_x.json.gz)
+    bases_em_colisao = {
+        arquivo.name.split('.', 1)[0] for arquivo in arquivos if (diretorio_destino / arquivo.name).exists()
+    }
+    for arquivo in arquivos:
+        base, _, extensao = arquivo.name.partition('.')
+        nome_destino = arquivo.name
+        if base in bases_em_colisao:
+            sufixo = f'_w{indice_worker}'
+            while (diretorio_destino / f'{base}{sufixo}.{extensao}').exists():
+                sufixo += f'_w{indice_worker}'
+            nome_destino = f'{base}{sufixo}.{extensao}'
+            renomeados[arquivo.name] = nome_destino
+        shutil.move(str(arquivo), str(diretorio_destino / nome_destino))
+
+    if renomeados:
+        print(f"[PARALELO] Worker {indice_worker}: {len(renomeados)} evidência(s) renomeada(s) por colisão de nome")
+    return renomeados
+
+
+def _atualizar_referencias_evidencias(arquivo_metadados, renomeados):
+    """
+    Atualiza nos metadados do worker os nomes de arquivo das evidências renomeadas
+    (ex: 'arquivo' das métricas replay_dom e video_codificacao)
+
+    Args:
+        arquivo_metadados: Path do metadata_temp.json do worker
+        renomeados: Dict nome original -> nome novo
+    """
+    if not renomeados or not arquivo_metadados.exists():
+        return
+    with open(arquivo_metadados, 'r', encoding='utf-8') as f:
+        dados = json.load(f)
+    for metricas in dados.get('cenarios', {}).values():
+        for valor in metricas.values():
+            if isinstance(valor, dict) and valor.get('arquivo') in renomeados:
+                valor['arquivo'] = renomeados[valor['arquivo']]
+    with open(arquivo_metadados, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, indent=2, ensure_ascii=False)
+
+
+def main():
+    configuracao = GerenciadorDeConfiguracao()
+
+    parser = argparse.ArgumentParser(description='Executa os testes Behave em paralelo')
+    parser.add_argument('caminhos', nargs='*', default=['features'],
+                        help='Arquivos .feature ou diretórios (padrão: features)')
+    parser.add_argument('--workers', type=int, default=configuracao.paralelo_workers,
+                        help='Quantidade de processos worker (PARALELO_WORKERS)')
+    parser.add_argument('--granularidade', choices=['cenario', 'feature'],
+                        default=configuracao.paralelo_granularidade,
+                        help='Unidade distribuída entre workers (PARALELO_GRANULARIDADE)')
+    parser.add_argument('--logs', choices=['arquivo', 'console'], default=configuracao.paralelo_logs,
+                        help='Destino da saída dos workers (PARALELO_LOGS)')
+    parser.add_argument('--tags', default=None, help='Expressão de tags do Behave (ex: @portal)')
+
+    # Tudo após '--' é repassado sem alteração para o Behave de cada worker
+    argv = sys.argv[1:]
+    argumentos_behave = []
+    if '--' in argv:
+        posicao = argv.index('--')
+        argv, argumentos_behave = argv[:posicao], argv[posicao + 1:]
+    argumentos = parser.parse_args(argv)
+    if argumentos.tags:
+        argumentos_behave = ['--tags', argumentos.tags, *argumentos_behave]
+
+    print("\n" + "="*60)
+    print("EXECUÇÃO PARALELA DOS TESTES")
+    print("="*60 + "\n")
+
+    unidades = descobrir_unidades(argumentos.caminhos, argumentos.granularidade, argumentos.tags)
+    if not unidades:
+        print("[PARALELO] Nenhum cenário encontrado para executar")
+        return 1
+
+    lotes = distribuir_unidades(unidades, max(1, argumentos.workers))
+    print(f"[PARALELO] {len(unidades)} unidade(s) ({argumentos.granularidade}) em {len(lotes)} worker(s)")
+
+    # Prepara os diretórios principais como o before_all faria em uma execução serial
+    GerenciadorDeEvidencias(configuracao).preparar_diretorios()
+    diretorio_workers = configuracao.diretorio_relatorios / 'workers'
+    if diretorio_workers.exists():
+        shutil.rmtree(diretorio_workers, ignore_errors=True)
+
+    # Um único Portal local atende todos os workers (cada um subiria o seu na mesma porta)
+    servidor_portal_local = None
+    if configuracao.portal_local_ativo:
+        servidor_portal_local = ServidorPortalLocal(configuracao)
+        servidor_portal_local.iniciar()
+
+    inicio = datetime.now()
+    inicio_monotonico = time.monotonic()
+    workers = []
+    for indice, lote in enumerate(lotes, start=1):
+        diretorio_worker = diretorio_workers / f'worker_{indice}'
+        processo, arquivo_log = iniciar_worker(
+            indice, lote, diretorio_worker, argumentos_behave, argumentos.logs
+        )
+        workers.append({
+            'indice': indice,
+            'lote': lote,
+            'diretorio': diretorio_worker,
+            'processo': processo,
+            'arquivo_log': arquivo_log
+        })
+
+    resumo_workers = []
+    codigo_saida = 0
+    pendentes = list(workers)
+    while pendentes:
+        for worker in list(pendentes):
+            codigo = worker['processo'].poll()
+            if codigo is None:
+                continue
+
+            pendentes.remove(worker)
+            duracao = time.monotonic() - inicio_monotonico
+            if worker['arquivo_log']:
+                worker['arquivo_log'].close()
+            codigo_saida = codigo_saida or codigo
+
+            print(f"[PARALELO] Worker {worker['indice']} finalizado (código {codigo}) em {duracao:.1f}s")
+            resumo_workers.append({
+                'worker': worker['indice'],
+                'unidades': len(worker['lote']),
+                'codigo_saida': codigo,
+                'duracao_segundos': round(duracao, 3),
+                'log': str(worker['diretorio'] / 'behave.log') if worker['arquivo_log'] else None
+            })
+        if pendentes:
+            time.sleep(0.2)
+    resumo_workers.sort(key=lambda item: item['worker'])
+    fim = datetime.now()
+
+    if servidor_portal_local:
+        servidor_portal_local.encerrar()
+
+    # Mescla resultados e metadados no formato consumido pelo generate_report.py
+    features = mesclar_resultados([worker['diretorio'] / 'results.json' for worker in workers])
+    arquivo_resultados = configuracao.diretorio_relatorios / 'results.json'
+    with open(arquivo_resultados, 'w', encoding='utf-8') as f:
+        json.dump(features, f, indent=2, ensure_ascii=False)
+
+    # Evidências antes dos metadados: nomes renomeados por colisão são corrigidos nos metadados do worker
+    for worker in workers:
+        renomeados = _mover_evidencias(
+            worker['diretorio'] / 'screenshots', configuracao.diretorio_screenshots, worker['indice']
+        )
+        renomeados.update(_mover_evidencias(
+            worker['diretorio'] / 'videos', configuracao.diretorio_videos, worker['indice']
+        ))
+        _atualizar_referencias_evidencias(worker['diretorio'] / 'metadata_temp.json', renomeados)
+
+    metadados = mesclar_metadados(
+        [worker['diretorio'] / 'metadata_temp.json' for worker in workers],
+        inicio, fim, resumo_workers
+    )
+    arquivo_metadados = configuracao.diretorio_metadados / 'metadata_temp.json'
+    with open(arquivo_metadados, 'w', encoding='utf-8') as f:
+        json.dump(metadados, f, indent=2, ensure_ascii=False)
+
+    print("\n" + "="*60)
+    print("RESUMO DA EXECUÇÃO PARALELA")
+    print("="*60)
+    print(f"Workers:    {len(workers)}")
+    print(f"Duração:    {(fim - inicio).total_seconds():.1f}s")
+    print(f"Resultados: {arquivo_resultados}")
+    print(f"Metadados:  {arquivo_metadados}")
+    print("="*60 + "\n")
+
+    return codigo_saida
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Divide os cenários entre K nós de CI equilibrando o tempo de cada nó.
+Lê a duração histórica de cada cenário nos reports/**/results_*.json gerados pelo
+generate_report.py e distribui com LPT (maior duração primeiro, sempre para o nó
+menos carregado). Cenários sem histórico usam PARALELO_DURACAO_PADRAO.
+
+Uso:
+    python shard_scenarios.py --nos 3
+    python shard_scenarios.py features/portal --nos 3 --tags @portal
+    behave $(python shard_scenarios.py --nos 3 --no 2)
+"""
+import argparse
+import heapq
+import json
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from recursos.utils.gerenciador_configuracao import GerenciadorDeConfiguracao
+from run_parallel import descobrir_unidades
+
+
+STATUS_EXECUTADOS = ('passed', 'failed', 'error')
+
+
+def normalizar_location(location):
+    """
+    Normaliza um location 'arquivo:linha' para a forma usada pelo descobrir_unidades
+    (caminho relativo ao diretório atual, com '/', sem './'). O JSON do Behave grava o caminho
+    como foi passado na linha de comando (relativo, absoluto ou com '\\' no Windows).
+
+    Args:
+        location: Location do cenário ou caminho da feature
+
+    Returns:
+        Location normalizado
+    """
+    caminho, separador, linha = str(location).replace('\\', '/').rpartition(':')
+    if not separador or not linha.isdigit():
+        caminho, linha = str(location).replace('\\', '/'), ''
+
+    caminho = Path(caminho)
+    if caminho.is_absolute():
+        try:
+            caminho = caminho.resolve().relative_to(Path.cwd().resolve())
+        except ValueError:
+            pass
+    caminho = caminho.as_posix()
+    return f"{caminho}:{linha}" if linha else caminho
+
+
+def carregar_duracoes_historicas(diretorio_relatorios, execucoes_consideradas=5):
+    """
+    Lê a duração de cada cenário nos relatórios anteriores
+
+    Args:
+        diretorio_relatorios: Path do diretório de relatórios (busca recursiva por results_*.json)
+        execucoes_consideradas: Quantidade de execuções mais recentes usadas na média
+
+    Returns:
+        Dict location -> duração média em segundos
+    """
+    arquivos = sorted(
+        Path(diretorio_relatorios).rglob('results_*.json'),
+        key=lambda arquivo: arquivo.stat().st_mtime,
+        reverse=True
+    )
+
+    amostras = {}
+    for arquivo in arquivos:
+        try:
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                features = json.load(f)
+        except (OSError, ValueError) as erro:
+            print(f"[SHARD] Ignorando {arquivo}: {erro}", file=sys.stderr)
+            continue
+
+        for feature in features:
+            for cenario in feature.get('elements', []):
+                if cenario.get('type') == 'background' or cenario.get('status') not in STATUS_EXECUTADOS:
+                    continue
+
+                duracoes = amostras.setdefault(normalizar_location(cenario.get('location', '')), [])
+                if len(duracoes) < execucoes_consideradas:
+                    duracoes.append(sum(
+                        passo.get('result', {}).get('duration', 0) for passo in cenario.get('steps', [])
+                    ))
+
+    return {location: sum(duracoes) / len(duracoes) for location, duracoes in amostras.items()}
+
+
+def estimar_duracao(cenarios, duracoes_historicas, duracao_padrao):
+    """
+    Estima a duração de uma unidade somando os cenários que ela realmente executa
+    (um cenário, ou os cenários da feature que passam no filtro de tags)
+
+    Args:
+        cenarios: Locations 'arquivo:linha' dos cenários da unidade
+        duracoes_historicas: Dict location normalizado -> duração média
+        duracao_padrao: Estimativa para cenários sem histórico
+
+    Returns:
+        Tupla (duração estimada em segundos, quantidade de cenários sem histórico)
+    """
+    duracao = 0.0
+    sem_historico = 0
+    for cenario in cenarios:
+        location = normalizar_location(cenario)
+        if location in duracoes_historicas:
+            duracao += duracoes_historicas[location]
+        else:
+            duracao += duracao_padrao
+            sem_historico += 1
+    return duracao, sem_historico
+
+
+def distribuir_por_duracao(duracoes_unidades, total_nos):
+    """
+    Distribui as unidades entre os nós com LPT (longest processing time first)
+
+    Args:
+        duracoes_unidades: Dict location -> duração estimada
+        total_nos: Quantidade de nós
+
+    Returns:
+        Lista de dicts {'unidades': [...], 'duracao_estimada': segundos}, um por nó
+    """
+    nos = [{'unidades': [], 'duracao_estimada': 0.0} for _ in range(total_nos)]
+    carga_nos = [(0.0, indice) for indice in range(total_nos)]
+    heapq.heapify(carga_nos)
+
+    for unidade, duracao in sorted(duracoes_unidades.items(), key=lambda item: (-item[1], item[0])):
+        carga, indice = heapq.heappop(carga_nos)
+        nos[indice]['unidades'].append(unidade)
+        nos[indice]['duracao_estimada'] += duracao
+        heapq.heappush(carga_nos, (carga + duracao, indice))
+
+    return nos
+
+
+def main():
+    # O stdout fica reservado para a lista de cenários (behave $(...)); logs do config vão para o stderr
+    with redirect_stdout(sys.stderr):
+        configuracao = GerenciadorDeConfiguracao()
+
+    parser = argparse.ArgumentParser(description='Divide os cenários entre nós de CI por duração histórica')
+    parser.add_argument('caminhos', nargs='*', default=['features'],
+                        help='Arquivos .feature ou diretórios (padrão: features)')
+    parser.add_argument('--nos', type=int, required=True, help='Quantidade de nós de CI')
+    parser.add_argument('--no', type=int, default=None,
+                        help='Imprime apenas a lista do nó N (1..K), pronta para o Behave')
+    parser.add_argument('--granularidade', choices=['cenario', 'feature'],
+                        default=configuracao.paralelo_granularidade,
+                        help='Unidade distribuída entre nós (PARALELO_GRANULARIDADE)')
+    parser.add_argument('--tags', default=None, help='Expressão de tags do Behave (ex: @portal)')
+    parser.add_argument('--duracao-padrao', type=float, default=configuracao.paralelo_duracao_padrao,
+                        help='Segundos estimados para cenários sem histórico (PARALELO_DURACAO_PADRAO)')
+    parser.add_argument('--relatorios', default=str(configuracao.diretorio_relatorios),
+                        help='Diretório com os results_*.json anteriores (DIRETORIO_RELATORIOS)')
+    argumentos = parser.parse_args()
+
+    if argumentos.nos < 1 or (argumentos.no is not None and not 1 <= argumentos.no <= argumentos.nos):
+        parser.error('--nos deve ser >= 1 e --no deve estar entre 1 e --nos')
+
+    # As estimativas somam só os cenários que passam no filtro de tags, mesmo com granularidade feature
+    cenarios = descobrir_unidades(argumentos.caminhos, 'cenario', argumentos.tags)
+    cenarios_por_unidade = {}
+    for cenario in cenarios:
+        unidade = cenario if argumentos.granularidade == 'cenario' else cenario.rsplit(':', 1)[0]
+        cenarios_por_unidade.setdefault(unidade, []).append(cenario)
+    unidades = list(cenarios_por_unidade)
+    duracoes_historicas = carregar_duracoes_historicas(argumentos.relatorios)
+
+    duracoes_unidades = {}
+    sem_historico = 0
+    for unidade, cenarios_unidade in cenarios_por_unidade.items():
+        duracao, cenarios_sem_historico = estimar_duracao(
+            cenarios_unidade, duracoes_historicas, argumentos.duracao_padrao
+        )
+        duracoes_unidades[unidade] = duracao
+        sem_historico += cenarios_sem_historico
+
+    nos = distribuir_por_duracao(duracoes_unidades, argumentos.nos)
+
+    # Saída para CI: só os locations do nó, separados por espaço (behave $(...))
+    if argumentos.no is not None:
+        unidades_no = nos[argumentos.no - 1]['unidades']
+        if not unidades_no:
+            # Sem argumentos o Behave rodaria a suíte inteira; uma tag inexistente não seleciona nada
+            print(f"[SHARD] Nó {argumentos.no} sem unidades", file=sys.stderr)
+            unidades_no = ['--tags=@shard_vazio']
+        print(' '.join(unidades_no))
+        return 0
+
+    print(f"[SHARD] {len(unidades)} unidade(s) em {argumentos.nos} nó(s) "
+          f"({sem_historico} cenário(s) sem histórico, estimados em {argumentos.duracao_padrao:.0f}s cada)")
+    for indice, no in enumerate(nos, start=1):
+        print(f"\n# Nó {indice}: ~{no['duracao_estimada']:.1f}s, {len(no['unidades'])} unidade(s)")
+        print(f"behave {' '.join(no['unidades'])}" if no['unidades'] else "# (sem unidades)")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())